@@ -4,6 +4,7 @@ import sentry_sdk
 from flask import Flask, request, g
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from sentry_sdk.integrations.flask import FlaskIntegration
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from config import config_by_name
 from app.utils.logging import configure_logging
@@ -27,6 +28,11 @@ def create_app(config_name):
 
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
+    if app.config['TRUSTED_PROXY_HOPS']:
+        # Otherwise remote_addr is the proxy's, and every anonymous client
+        # shares one IP for view dedupe, unique counts and rate limits
+        hops = app.config['TRUSTED_PROXY_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops)
 
     db.init_app(app)
     migrate.init_app(app, db)
@@ -72,7 +78,13 @@ def create_app(config_name):
 
     
 
-    celery.conf.update(app.config)
+    # Celery ignores Flask-style upper-case keys, so map the ones it needs
+    celery.conf.update(
+        broker_url=app.config['CELERY_BROKER_URL'],
+        result_backend=app.config['CELERY_RESULT_BACKEND'],
+        beat_schedule=app.config['CELERY_BEAT_SCHEDULE'],
+    )
+    celery.flask_app = app
 
     log = structlog.get_logger()
     app.logger.addHandler(log)
@@ -4,7 +4,8 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_talisman import Talisman
 from flask_caching import Cache
-from celery import Celery
+from celery import Celery, Task
+from flask import has_app_context
 from flask_mail import Mail
 from prometheus_flask_exporter import PrometheusMetrics
 import os
@@ -19,5 +20,13 @@ talisman = Talisman()
 cache = Cache()
 mail = Mail()
 metrics = PrometheusMetrics.for_app_factory()
-celery = Celery(__name__)
+class FlaskTask(Task):
+    """Run tasks inside the app context of the Flask app bound by create_app."""
+    def __call__(self, *args, **kwargs):
+        if has_app_context() or getattr(self.app, 'flask_app', None) is None:
+            return self.run(*args, **kwargs)
+        with self.app.flask_app.app_context():
+            return self.run(*args, **kwargs)
+
+celery = Celery(__name__, task_cls=FlaskTask)
 bcrypt = Bcrypt()
\ No newline at end of file
@@ -10,4 +10,28 @@ rate_limit_counter = Counter(
     'flask_rate_limit_total',
     'Total number of times the rate limit was reached',
     ['endpoint']
-)
\ No newline at end of file
+)
+# Namespaced cache layer (app.utils.cache)
+cache_hit_counter = Counter(
+    'app_cache_hits_total',
+    'Total number of cache hits',
+    ['namespace']
+)
+
+cache_miss_counter = Counter(
+    'app_cache_misses_total',
+    'Total number of cache misses',
+    ['namespace']
+)
+
+cache_invalidation_counter = Counter(
+    'app_cache_invalidations_total',
+    'Total number of namespace invalidations',
+    ['namespace']
+)
+
+job_view_suppressed_counter = Counter(
+    'app_job_views_suppressed_total',
+    'Total number of job views dropped before counting',
+    ['reason']
+)
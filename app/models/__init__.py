@@ -1,7 +1,12 @@
 from app.models.user import User
 from app.models.job import JobPosting
 from app.models.application import Application
+from app.models.application_event import ApplicationEvent
 from app.models.faq import FAQ
 from app.models.feedback import Feedback
 from app.models.message import Message
-from app.models.job_view import JobView
+from app.models.job_view import JobView, JobViewMonthly, JobViewFlush
+from app.models.job_archive import (
+    ArchivedJobPosting, ArchivedJobView, ArchivedApplication, ArchivedFeedback, ArchivedApplicationEvent
+)
+from app.models.job_conversion import JobConversionDaily
@@ -1,17 +1,73 @@
 from datetime import datetime
 from app.extensions import db
+from sqlalchemy import DDL, event
 from sqlalchemy_serializer import SerializerMixin
 
+# Keeps job_postings.applications_count and last_applied_at current with one
+# UPDATE per statement, however many applications it touched
+COUNT_APPLICATIONS_TRIGGERS = """
+CREATE OR REPLACE FUNCTION job_postings_count_applications() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE job_postings
+        SET applications_count = applications_count + changed.n,
+            last_applied_at = GREATEST(job_postings.last_applied_at, changed.latest)
+        FROM (SELECT job_posting_id, count(*) AS n, max(applied_at) AS latest
+              FROM new_rows GROUP BY job_posting_id) AS changed
+        WHERE job_postings.id = changed.job_posting_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE job_postings
+        SET applications_count = applications_count - changed.n,
+            last_applied_at = (SELECT max(applied_at) FROM applications WHERE job_posting_id = job_postings.id)
+        FROM (SELECT job_posting_id, count(*) AS n FROM old_rows GROUP BY job_posting_id) AS changed
+        WHERE job_postings.id = changed.job_posting_id;
+    ELSE
+        -- Only applications moved to another job change the counters
+        UPDATE job_postings
+        SET applications_count = applications_count + changed.n,
+            last_applied_at = (SELECT max(applied_at) FROM applications WHERE job_posting_id = job_postings.id)
+        FROM (SELECT job_posting_id, sum(n) AS n FROM (
+                  SELECT new_rows.job_posting_id, 1 AS n
+                  FROM new_rows JOIN old_rows USING (id) WHERE new_rows.job_posting_id <> old_rows.job_posting_id
+                  UNION ALL
+                  SELECT old_rows.job_posting_id, -1
+                  FROM new_rows JOIN old_rows USING (id) WHERE new_rows.job_posting_id <> old_rows.job_posting_id
+              ) AS moves GROUP BY job_posting_id) AS changed
+        WHERE job_postings.id = changed.job_posting_id;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE TRIGGER applications_count_insert AFTER INSERT ON applications
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_applications();
+CREATE TRIGGER applications_count_update AFTER UPDATE ON applications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_applications();
+CREATE TRIGGER applications_count_delete AFTER DELETE ON applications
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_applications();
+"""
+
 class Application(db.Model, SerializerMixin):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'job_posting_id', name='uq_applications_user_id_job_posting_id'),
+        db.Index('ix_applications_applied_at_id', 'applied_at', 'id'),
+        db.Index('ix_applications_job_posting_id_status_applied_at_id', 'job_posting_id', 'status', 'applied_at', 'id'),
+        db.Index('ix_applications_user_id_applied_at_id', 'user_id', 'applied_at', 'id'),
+    )
 
     serialize_rules = ('-user.applications', '-job_posting.applications', '-feedback.application')
 
     id = db.Column(db.Integer, primary_key=True)
-    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     status = db.Column(db.String(32), nullable=False, default='submitted') # Enum: submitted, viewed, rejected, accepted
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     job_posting_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), nullable=False)
+    # Bumped on every UPDATE; a write based on an older version fails with StaleDataError
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     user = db.relationship('User', backref=db.backref('applications', cascade='all, delete-orphan'))
     job_posting = db.relationship('JobPosting', backref=db.backref('applications', cascade='all, delete-orphan'))
+
+
+event.listen(Application.__table__, 'after_create', DDL(COUNT_APPLICATIONS_TRIGGERS))
@@ -0,0 +1,54 @@
+from datetime import datetime
+from sqlalchemy import DDL, event
+from sqlalchemy_serializer import SerializerMixin
+from app.extensions import db
+
+# Appends one event per application created and per status actually changed,
+# with one INSERT per statement, so single, ORM and bulk writes are all
+# recorded in the transaction that made the change
+RECORD_APPLICATION_EVENTS_TRIGGERS = """
+CREATE OR REPLACE FUNCTION applications_record_events() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO application_events (application_id, job_posting_id, from_status, to_status, occurred_at)
+        SELECT id, job_posting_id, NULL, status, applied_at FROM new_rows;
+    ELSE
+        INSERT INTO application_events (application_id, job_posting_id, from_status, to_status, occurred_at)
+        SELECT new_rows.id, new_rows.job_posting_id, old_rows.status, new_rows.status,
+               statement_timestamp() AT TIME ZONE 'utc'
+        FROM new_rows JOIN old_rows USING (id)
+        WHERE new_rows.status IS DISTINCT FROM old_rows.status;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE TRIGGER applications_record_events_insert AFTER INSERT ON applications
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION applications_record_events();
+CREATE TRIGGER applications_record_events_update AFTER UPDATE ON applications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION applications_record_events();
+"""
+
+class ApplicationEvent(db.Model, SerializerMixin):
+    """
+    Append-only status history of applications: a row with no from_status
+    when the application is created, then one per status change. Rows are
+    written by triggers on applications, never by the application code.
+    """
+    __tablename__ = 'application_events'
+    __table_args__ = (
+        db.Index('ix_application_events_application_id_occurred_at', 'application_id', 'occurred_at'),
+        db.Index('ix_application_events_job_posting_id_occurred_at', 'job_posting_id', 'occurred_at'),
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), nullable=False)
+    # Copied from the application so job-wide reports don't need to join applications
+    job_posting_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False)
+    from_status = db.Column(db.String(32))
+    to_status = db.Column(db.String(32), nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ApplicationEvent {self.application_id}: {self.from_status} -> {self.to_status}>"
+
+
+event.listen(ApplicationEvent.__table__, 'after_create', DDL(RECORD_APPLICATION_EVENTS_TRIGGERS))
@@ -10,3 +10,4 @@ class FAQ(db.Model, SerializerMixin):
     answer = db.Column(db.Text, nullable=False)
     category = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,11 +1,19 @@
 from datetime import datetime
 from app.extensions import db
 from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(requirements, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+)
 
 class JobPosting(db.Model, SerializerMixin):
     __tablename__ = 'job_postings'
 
-    serialize_rules = ('-admin.job_postings', '-applications.job_posting')
+    serialize_rules = ('-admin.job_postings', '-applications.job_posting', '-search_vector')
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -13,7 +21,22 @@ class JobPosting(db.Model, SerializerMixin):
     location = db.Column(db.String(255))
     requirements = db.Column(db.Text)
     deadline = db.Column(db.DateTime)
-    posted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    posted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     admin_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # Maintained by triggers on applications and job_views (see those models)
+    # and repaired by JobService.reconcile_job_counters
+    applications_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    views_total = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    last_applied_at = db.Column(db.DateTime)
+    search_vector = db.deferred(db.Column(TSVECTOR, db.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
 
     admin = db.relationship('User', backref='job_postings')
+
+    __table_args__ = (
+        db.Index('ix_job_postings_posted_at_id', 'posted_at', 'id'),
+        db.Index('ix_job_postings_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_job_postings_location_posted_at_id', 'location', 'posted_at', 'id'),
+        db.Index('ix_job_postings_admin_id_posted_at_id', 'admin_id', 'posted_at', 'id'),
+        db.Index('ix_job_postings_deadline_id', 'deadline', 'id', postgresql_where=db.text('deadline IS NOT NULL')),
+    )
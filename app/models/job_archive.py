@@ -0,0 +1,103 @@
+from app.extensions import db
+from sqlalchemy_serializer import SerializerMixin
+
+class ArchivedJobPosting(db.Model, SerializerMixin):
+    """
+    Cold copy of a job posting moved out of job_postings by the archival task.
+    Rows keep their original id so links to /jobs/<id> still resolve with
+    include_archived. No search_vector or listing indexes: archived postings
+    are only read by id.
+    """
+    __tablename__ = 'job_postings_archive'
+
+    serialize_rules = ('-views.job', '-applications.job_posting')
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(255), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    location = db.Column(db.String(255))
+    requirements = db.Column(db.Text)
+    deadline = db.Column(db.DateTime)
+    posted_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    admin_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    applications_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    views_total = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    last_applied_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, server_default=db.text("(now() AT TIME ZONE 'utc')"))
+
+    def __repr__(self):
+        return f"<ArchivedJobPosting {self.id}>"
+
+class ArchivedJobView(db.Model, SerializerMixin):
+    __tablename__ = 'job_views_archive'
+
+    serialize_rules = ('-job.views',)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings_archive.id'), nullable=False, index=True)
+    view_date = db.Column(db.Date, nullable=False)
+    view_count = db.Column(db.Integer, default=0)
+
+    job = db.relationship('ArchivedJobPosting', backref=db.backref('views', lazy=True))
+
+    def __repr__(self):
+        return f"<ArchivedJobView {self.job_id} on {self.view_date}: {self.view_count} views>"
+
+class ArchivedApplication(db.Model, SerializerMixin):
+    """
+    Cold copy of an application, archived together with its posting. The
+    (user_id, job_posting_id) uniqueness was enforced in the hot table.
+    """
+    __tablename__ = 'applications_archive'
+
+    serialize_rules = ('-job_posting.applications', '-feedback.job_application', '-events.application')
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    applied_at = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String(32), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    job_posting_id = db.Column(db.Integer, db.ForeignKey('job_postings_archive.id'), nullable=False, index=True)
+    version = db.Column(db.Integer, nullable=False)
+
+    job_posting = db.relationship('ArchivedJobPosting', backref=db.backref('applications', lazy=True))
+
+    def __repr__(self):
+        return f"<ArchivedApplication {self.id}>"
+
+class ArchivedFeedback(db.Model, SerializerMixin):
+    __tablename__ = 'feedback_archive'
+
+    serialize_rules = ('-job_application.feedback',)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    job_application_id = db.Column(db.Integer, db.ForeignKey('applications_archive.id'), nullable=False, index=True)
+    rating = db.Column(db.Integer, nullable=False)
+    comment = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+
+    job_application = db.relationship('ArchivedApplication', backref=db.backref('feedback', lazy=True))
+
+    def __repr__(self):
+        return f"<ArchivedFeedback {self.id}>"
+
+class ArchivedApplicationEvent(db.Model, SerializerMixin):
+    __tablename__ = 'application_events_archive'
+    __table_args__ = (
+        db.Index('ix_application_events_archive_application_id_occurred_at', 'application_id', 'occurred_at'),
+    )
+
+    serialize_rules = ('-application.events',)
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications_archive.id'), nullable=False)
+    job_posting_id = db.Column(db.Integer, db.ForeignKey('job_postings_archive.id'), nullable=False, index=True)
+    from_status = db.Column(db.String(32))
+    to_status = db.Column(db.String(32), nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False)
+
+    application = db.relationship('ArchivedApplication', backref=db.backref('events', lazy=True))
+
+    def __repr__(self):
+        return f"<ArchivedApplicationEvent {self.application_id}: {self.from_status} -> {self.to_status}>"
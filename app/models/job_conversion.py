@@ -0,0 +1,42 @@
+from sqlalchemy import DDL, event
+from app.extensions import db
+
+# Views and applications per job per day. The unique index is what allows
+# REFRESH MATERIALIZED VIEW CONCURRENTLY.
+CREATE_JOB_CONVERSION_DAILY = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS job_conversion_daily AS
+SELECT job_id,
+       day,
+       sum(views)::integer AS views,
+       sum(applications)::integer AS applications,
+       round(sum(applications)::numeric / nullif(sum(views), 0), 4) AS conversion_rate
+FROM (
+    SELECT job_id, view_date AS day, view_count AS views, 0 AS applications FROM job_views
+    UNION ALL
+    SELECT job_posting_id, applied_at::date, 0, 1 FROM applications
+) AS events
+GROUP BY job_id, day;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_job_conversion_daily_job_id_day ON job_conversion_daily (job_id, day);
+CREATE INDEX IF NOT EXISTS ix_job_conversion_daily_day_job_id ON job_conversion_daily (day, job_id);
+"""
+
+class JobConversionDaily(db.Model):
+    """
+    Read-only mapping of the job_conversion_daily materialized view. Its table
+    lives outside db.metadata so create_all/drop_all don't treat it as a
+    table; the DDL hooks below manage the view instead.
+    """
+    __table__ = db.Table(
+        'job_conversion_daily', db.MetaData(),
+        db.Column('job_id', db.Integer, primary_key=True),
+        db.Column('day', db.Date, primary_key=True),
+        db.Column('views', db.Integer),
+        db.Column('applications', db.Integer),
+        db.Column('conversion_rate', db.Numeric(10, 4)),
+    )
+
+    def __repr__(self):
+        return f"<JobConversionDaily {self.job_id} on {self.day}: {self.applications}/{self.views}>"
+
+event.listen(db.metadata, 'after_create', DDL(CREATE_JOB_CONVERSION_DAILY))
+event.listen(db.metadata, 'before_drop', DDL("DROP MATERIALIZED VIEW IF EXISTS job_conversion_daily"))
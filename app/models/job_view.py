@@ -1,20 +1,92 @@
 from app.extensions import db
-from datetime import date
+from datetime import date, datetime
+from sqlalchemy import DDL, event
 from sqlalchemy_serializer import SerializerMixin
 
+# Keeps job_postings.views_total current with one UPDATE per statement. The
+# batched upsert fires both the INSERT and the UPDATE trigger. Statements run
+# directly against a partition (moving rows out of the default partition,
+# pruning it) don't fire them, and dropping a partition leaves the total alone.
+COUNT_VIEWS_TRIGGERS = """
+CREATE OR REPLACE FUNCTION job_postings_count_views() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE job_postings SET views_total = views_total + changed.n
+        FROM (SELECT job_id, sum(coalesce(view_count, 0)) AS n FROM new_rows GROUP BY job_id) AS changed
+        WHERE job_postings.id = changed.job_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE job_postings SET views_total = views_total - changed.n
+        FROM (SELECT job_id, sum(coalesce(view_count, 0)) AS n FROM old_rows GROUP BY job_id) AS changed
+        WHERE job_postings.id = changed.job_id;
+    ELSE
+        UPDATE job_postings SET views_total = views_total + changed.n
+        FROM (SELECT new_rows.job_id, sum(coalesce(new_rows.view_count, 0) - coalesce(old_rows.view_count, 0)) AS n
+              FROM new_rows JOIN old_rows USING (id, view_date) GROUP BY new_rows.job_id) AS changed
+        WHERE job_postings.id = changed.job_id AND changed.n <> 0;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE TRIGGER job_views_count_insert AFTER INSERT ON job_views
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_views();
+CREATE TRIGGER job_views_count_update AFTER UPDATE ON job_views
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_views();
+CREATE TRIGGER job_views_count_delete AFTER DELETE ON job_views
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_views();
+"""
+
 class JobView(db.Model, SerializerMixin):
+    """
+    Daily view count per job. The table is range-partitioned by view_date into
+    monthly partitions (see JobViewPartitionService), so the primary key and
+    every unique constraint include view_date. Rows outside any monthly
+    partition land in job_views_default.
+    """
     __tablename__ = 'job_views'
 
     serialize_rules = ('-job.views',)
 
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), nullable=False)
-    view_date = db.Column(db.Date, nullable=False, default=date.today)
+    view_date = db.Column(db.Date, primary_key=True, default=date.today)
     view_count = db.Column(db.Integer, default=0)
 
     job = db.relationship('JobPosting', backref=db.backref('views', lazy=True))
 
-    __table_args__ = (db.UniqueConstraint('job_id', 'view_date', name='_job_view_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'view_date', name='_job_view_uc'),
+        # Covers date-range aggregates with an index-only scan
+        db.Index('ix_job_views_view_date_job_id', 'view_date', 'job_id', postgresql_include=['view_count']),
+        {'postgresql_partition_by': 'RANGE (view_date)'},
+    )
 
     def __repr__(self):
         return f"<JobView {self.job_id} on {self.view_date}: {self.view_count} views>"
+
+
+event.listen(JobView.__table__, 'after_create', DDL("CREATE TABLE job_views_default PARTITION OF job_views DEFAULT"))
+event.listen(JobView.__table__, 'after_create', DDL(COUNT_VIEWS_TRIGGERS))
+
+class JobViewMonthly(db.Model, SerializerMixin):
+    """
+    Per-job view totals for closed calendar months, rolled up from job_views.
+    job_id has no foreign key so totals outlive archived or deleted postings.
+    """
+    __tablename__ = 'job_views_monthly'
+
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    view_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<JobViewMonthly {self.job_id} in {self.month:%Y-%m}: {self.view_count} views>"
+
+class JobViewFlush(db.Model):
+    """
+    Ids of the buffered-view batches already written to job_views, recorded
+    in the upsert's transaction so that re-running a batch whose Redis copy
+    outlived its flush is a no-op instead of a double count.
+    """
+    __tablename__ = 'job_view_flushes'
+
+    batch_id = db.Column(db.String(32), primary_key=True)
+    flushed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
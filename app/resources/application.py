@@ -1,15 +1,20 @@
-from flask import Blueprint, request
+from flask import Blueprint, abort, g, make_response, request
 from app.schemas.application import ApplicationSchema
-from app.services.application_service import ApplicationService
-from app.utils.helpers import api_response
-from werkzeug.exceptions import NotFound
-from app.models.user import User
-from app.models.job import JobPosting
-from app.extensions import db
+from app.services.application_event_service import ApplicationEventService
+from app.services.application_service import ApplicationService, APPLICATION_INCLUDES
+from app.utils.decorators import admin_required
+from app.utils.helpers import api_response, parse_datetime_arg
+from app.utils.pagination import parse_page_size
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import Conflict, NotFound
+from werkzeug.http import parse_etags
 
 application_bp = Blueprint('application', __name__, url_prefix='/applications')
-application_schema = ApplicationSchema()
-applications_schema = ApplicationSchema(many=True)
+application_schema = ApplicationSchema(exclude=APPLICATION_INCLUDES)
+
+def _applications_schema(include):
+    """A listing schema that embeds exactly the included relationships."""
+    return ApplicationSchema(many=True, exclude=[name for name in APPLICATION_INCLUDES if name not in include])
 
 @application_bp.route('/', methods=['POST'])
 def create_application():
@@ -18,28 +23,115 @@ def create_application():
     if errors:
         return api_response(400, "Invalid data", errors)
 
-    user = db.session.get(User, data['user_id'])
-    job_posting = db.session.get(JobPosting, data['job_posting_id'])
-
-    if not user:
+    try:
+        application = ApplicationService.create_application(data['user_id'], data['job_posting_id'])
+    except IntegrityError:
+        # The only foreign key the insert can still violate is user_id's
         return api_response(400, "Invalid data", {'user_id': ['User not found']})
-    if not job_posting:
+    except NotFound:
         return api_response(400, "Invalid data", {'job_posting_id': ['Job posting not found']})
+    except ValueError as e:
+        return api_response(400, str(e))
+    if application is None:
+        return api_response(400, "Invalid data", {'user_id': ['Application already exists for this user and job']})
+    return api_response(201, "Application created successfully", application_schema.dump(application))
+
+def _with_version(rv, application):
+    """Expose the application's version as its ETag, to be sent back in If-Match."""
+    response = make_response(rv)
+    response.set_etag(str(application.version))
+    return response
+
+def parse_if_match(headers):
+    """
+    The version a write is conditional on, from If-Match, or None without
+    the header or with If-Match: *.
+
+    Raises:
+        ValueError: If the header is not a single strong ETag holding a version
+    """
+    if 'If-Match' not in headers:
+        return None
+    if_match = parse_etags(headers['If-Match'])
+    if if_match.star_tag:
+        return None
+    etags = if_match.as_set()
+    if len(etags) != 1 or not next(iter(etags)).isdigit():
+        raise ValueError("If-Match must be a single ETag from this application")
+    return int(next(iter(etags)))
+
+@application_bp.route('/batch', methods=['POST'])
+def create_applications_batch():
+    data = request.get_json(silent=True) or {}
+    user_id, job_posting_ids = data.get('user_id'), data.get('job_posting_ids')
+    if not isinstance(user_id, int):
+        return api_response(400, "Invalid data", {'user_id': ['Missing data for required field.']})
+    if not isinstance(job_posting_ids, list) or not all(isinstance(job_id, int) for job_id in job_posting_ids):
+        return api_response(400, "Invalid data", {'job_posting_ids': ['Must be a list of job posting ids.']})
 
     try:
-        application = ApplicationService.create_application(data['user_id'], data['job_posting_id'])
-        if application is None:
-            return api_response(400, "Invalid data", {'user_id': ['Application already exists for this user and job']})
-        return api_response(201, "Application created successfully", application_schema.dump(application))
+        results = ApplicationService.create_applications(user_id, job_posting_ids)
+    except (IntegrityError, NotFound):
+        return api_response(400, "Invalid data", {'user_id': ['User not found']})
     except ValueError as e:
         return api_response(400, str(e))
 
+    result = [{
+        'job_posting_id': job_posting_id,
+        'outcome': outcome,
+        'application': application_schema.dump(application) if application else None,
+    } for job_posting_id, (outcome, application) in results.items()]
+    counts = {outcome: 0 for outcome in ('created', 'duplicate', 'expired', 'not_found')}
+    for outcome, _ in results.values():
+        counts[outcome] += 1
+    return api_response(200, "Applications processed", result, meta=counts)
+
 @application_bp.route('/<int:application_id>', methods=['GET'])
 def get_application(application_id):
     application = ApplicationService.get_application_by_id(application_id)
     if not application:
         raise NotFound("Application not found")
-    return api_response(200, "Application found", application_schema.dump(application))
+    return _with_version(api_response(200, "Application found", application_schema.dump(application)), application)
+
+@application_bp.route('/<int:application_id>/events', methods=['GET'])
+def get_application_timeline(application_id):
+    timeline = ApplicationEventService.get_timeline(application_id)
+    result = [{
+        'id': entry['event'].id,
+        'from_status': entry['event'].from_status,
+        'to_status': entry['event'].to_status,
+        'occurred_at': entry['event'].occurred_at.isoformat(),
+        'left_at': entry['left_at'].isoformat() if entry['left_at'] else None,
+        'seconds_in_stage': entry['seconds_in_stage'],
+    } for entry in timeline]
+    return api_response(200, "Application timeline retrieved", result)
+
+@application_bp.route('/bulk', methods=['PATCH'])
+@admin_required
+def bulk_update_application_status():
+    data = request.get_json(silent=True) or {}
+    updates = data.get('updates')
+    if not isinstance(updates, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('id'), int) and item.get('status') for item in updates):
+        return api_response(400, "updates must be a list of {id, status} objects")
+    statuses = {item['id']: item['status'] for item in updates}
+    if len(statuses) != len(updates):
+        return api_response(400, "Each application may appear only once")
+    retries = data.get('retries', 0)
+    if not isinstance(retries, int) or retries < 0:
+        return api_response(400, "retries must be a non-negative integer")
+
+    try:
+        outcomes = ApplicationService.bulk_update_status(statuses, retries=retries)
+    except ValueError as e:
+        return api_response(400, str(e))
+
+    result = [{'id': application_id, 'status': status, 'outcome': outcomes[application_id]}
+              for application_id, status in statuses.items()]
+    counts = {outcome: 0 for outcome in ('updated', 'locked', 'not_found')}
+    for outcome in outcomes.values():
+        counts[outcome] += 1
+    return api_response(200, "Application statuses updated", result, meta=counts)
 
 @application_bp.route('/<int:application_id>', methods=['PATCH'])
 def update_application_status(application_id):
@@ -48,12 +140,18 @@ def update_application_status(application_id):
     if not status:
         return api_response(400, "Status is required")
     try:
-        application = ApplicationService.update_application_status(application_id, status)
+        expected_version = parse_if_match(request.headers)
+        application = ApplicationService.update_application_status(
+            application_id, status, expected_version=expected_version
+        )
     except ValueError as e:
         return api_response(400, str(e))
+    except Conflict as e:
+        return api_response(409, e.description)
     if not application:
         raise NotFound("Application not found")
-    return api_response(200, "Application status updated", application_schema.dump(application))
+    return _with_version(api_response(200, "Application status updated", application_schema.dump(application)),
+                         application)
 
 @application_bp.route('/<int:application_id>', methods=['DELETE'])
 def delete_application(application_id):
@@ -62,14 +160,34 @@ def delete_application(application_id):
         raise NotFound("Application not found")
     return api_response(204, "Application deleted")
 
+def parse_application_filters(args):
+    filters = {}
+    for name in ('user_id', 'job_posting_id'):
+        if name in args:
+            value = args.get(name, type=int)
+            if value is None:
+                raise ValueError(f"{name} must be an integer")
+            filters[name] = value
+    if args.get('status'):
+        filters['status'] = args['status']
+    if args.get('applied_after'):
+        filters['applied_after'] = parse_datetime_arg(args, 'applied_after')
+    return filters
+
 @application_bp.route('/', methods=['GET'])
 def list_applications():
-    user_id = request.args.get('user_id', type=int)
-    job_posting_id = request.args.get('job_posting_id', type=int)
-    if user_id:
-        applications = ApplicationService.get_applications_for_user(user_id)
-    elif job_posting_id:
-        applications = ApplicationService.get_applications_for_job(job_posting_id)
-    else:
-        applications = ApplicationService.get_all_applications()
-    return api_response(200, "Applications retrieved", applications_schema.dump(applications))
+    include = [name for name in request.args.get('include', '').split(',') if name]
+    # Applicants' contact details are only for admins, as in the job pipeline
+    user = g.get('current_user')
+    if 'user' in include and (not user or user.role != 'admin'):
+        abort(403, description="Admin access required to include user")
+    try:
+        limit = parse_page_size(request.args.get('limit', type=int))
+        filters = parse_application_filters(request.args)
+        applications, next_cursor = ApplicationService.get_applications_page(
+            limit, request.args.get('cursor'), filters=filters, include=include
+        )
+    except ValueError as e:
+        return api_response(400, str(e))
+    return api_response(200, "Applications retrieved", _applications_schema(include).dump(applications),
+                        meta={'limit': limit, 'next_cursor': next_cursor})
@@ -2,6 +2,8 @@ from flask import Blueprint, request
 from app.schemas.faq import FAQSchema
 from app.services.faq_service import FAQService
 from app.utils.helpers import api_response
+from app.utils.cache import cached_view, get_generation, invalidate
+from app.utils.decorators import conditional_get
 
 faq_bp = Blueprint('faq', __name__, url_prefix='/faqs')
 faq_schema = FAQSchema()
@@ -14,6 +16,7 @@ def create_faq():
     if errors:
         return api_response(400, "Invalid data", errors)
     faq = FAQService.create_faq(data['question'], data['answer'], data.get('category'))
+    invalidate('faqs')
     return api_response(201, "FAQ created successfully", faq_schema.dump(faq))
 
 @faq_bp.route('/<int:faq_id>', methods=['GET'])
@@ -24,6 +27,8 @@ def get_faq(faq_id):
     return api_response(200, "FAQ found", faq_schema.dump(faq))
 
 @faq_bp.route('/', methods=['GET'])
+@conditional_get(lambda: get_generation('faqs'))
+@cached_view('faqs', timeout=300, stale_ttl=60, jitter=0.1, refresh_ahead=10)
 def get_all_faqs():
     faqs = FAQService.get_all_faqs()
     return api_response(200, "FAQs retrieved", faqs_schema.dump(faqs))
@@ -37,6 +42,7 @@ def update_faq(faq_id):
     faq = FAQService.update_faq(faq_id, data.get('question'), data.get('answer'), data.get('category'))
     if not faq:
         return api_response(404, "FAQ not found")
+    invalidate('faqs', faq_id)
     return api_response(200, "FAQ updated successfully", faq_schema.dump(faq))
 
 @faq_bp.route('/<int:faq_id>', methods=['DELETE'])
@@ -44,4 +50,5 @@ def delete_faq(faq_id):
     result = FAQService.delete_faq(faq_id)
     if not result:
         return api_response(404, "FAQ not found")
+    invalidate('faqs', faq_id)
     return api_response(204, "FAQ deleted")
@@ -1,16 +1,28 @@
-from flask import Blueprint, request
-from app.schemas.job import JobSchema
+import time
+from flask import Blueprint, current_app, g, request
+from app.schemas.application import ApplicationSchema
+from app.schemas.job import JobSchema, JobSummarySchema, JobSearchResultSchema
+from app.services.application_event_service import ApplicationEventService
+from app.services.application_service import ApplicationService, APPLICATION_INCLUDES
 from app.services.job_service import JobService
-from app.extensions import db, cache
-from app.metrics import metrics
-from app.utils.helpers import api_response
+from app.extensions import db
+from app.metrics import metrics, job_view_suppressed_counter
+from app.utils.helpers import api_response, parse_datetime_arg
+from app.utils.pagination import parse_page_size
+from app.utils.cache import cached_view, get_object, get_generation, invalidate, prerender, serve
+from app.utils.decorators import admin_required, conditional_get
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.services.job_view_service import JobViewService
+from app.services.job_archive_service import JobArchiveService
+from werkzeug.exceptions import NotFound
 
 job_bp = Blueprint('job', __name__, url_prefix='/jobs')
 job_schema = JobSchema()
 jobs_schema = JobSchema(many=True)
+job_summaries_schema = JobSummarySchema(many=True)
+search_results_schema = JobSearchResultSchema(many=True)
+JOBS_LISTING_TTL = 60
 
 @job_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -38,25 +50,141 @@ def create_job_posting():
     
     try:
         job = JobService.create_job(data)
-        cache.clear() # Invalidate cache for all jobs
+        invalidate('jobs')
         return api_response(201, "Job created successfully", job_schema.dump(job))
     except Exception as e:
         print(f"Error creating job: {str(e)}")
         return api_response(500, "Error creating job", str(e))
 
+def parse_job_filters(args):
+    filters = {}
+    if args.get('location'):
+        filters['location'] = args['location']
+    if 'admin_id' in args:
+        admin_id = args.get('admin_id', type=int)
+        if admin_id is None:
+            raise ValueError("admin_id must be an integer")
+        filters['admin_id'] = admin_id
+    for name in ('posted_after', 'posted_before'):
+        if args.get(name):
+            filters[name] = parse_datetime_arg(args, name)
+    if args.get('deadline_open', '').lower() == 'true':
+        filters['deadline_open'] = True
+    return filters
+
+def _listing_version():
+    """
+    The listing's version stamp: the jobs generation plus the current
+    JOBS_LISTING_TTL window. The listing changes without writes, as deadlines
+    pass and view flushes move views_total (they only drop the per-job
+    entries), so a conditional response is at most one TTL old.
+    """
+    generation = get_generation('jobs')
+    if generation is None:
+        return None
+    return f"{generation}:{int(time.time()) // JOBS_LISTING_TTL}"
+
 @job_bp.route('/', methods=['GET'])
-@cache.cached(timeout=60)
+@conditional_get(_listing_version)
+@cached_view('jobs', timeout=JOBS_LISTING_TTL, stale_ttl=30, jitter=0.1, refresh_ahead=5)
 def get_jobs():
-    jobs = JobService.get_all_jobs()
-    return api_response(200, "Jobs retrieved", jobs_schema.dump(jobs))
+    try:
+        limit = parse_page_size(request.args.get('limit', type=int))
+        filters = parse_job_filters(request.args)
+        view = request.args.get('view', 'summary')
+        jobs, next_cursor = JobService.get_jobs_page(
+            limit, request.args.get('cursor'), filters=filters, sort=request.args.get('sort', 'posted_at'), view=view
+        )
+    except ValueError as e:
+        return api_response(400, str(e))
+    schema = job_summaries_schema if view == 'summary' else jobs_schema
+    return api_response(200, "Jobs retrieved", schema.dump(jobs),
+                        meta={'limit': limit, 'next_cursor': next_cursor})
+
+@job_bp.route('/search', methods=['GET'])
+def search_jobs():
+    text = request.args.get('q', '').strip()
+    if not text:
+        return api_response(400, "Query parameter 'q' is required")
+    try:
+        limit = parse_page_size(request.args.get('limit', type=int))
+        results, next_cursor = JobService.search_jobs(text, limit, request.args.get('cursor'))
+    except ValueError as e:
+        return api_response(400, str(e))
+    return api_response(200, "Jobs retrieved", search_results_schema.dump(results),
+                        meta={'limit': limit, 'next_cursor': next_cursor})
+
+def _visitor_token():
+    """Identify a viewer for unique counts: the signed-in user, else the client IP."""
+    user = g.get('current_user')
+    return f"user:{user.id}" if user else f"ip:{request.remote_addr}"
+
+def _is_crawler():
+    """True if the user agent matches VIEW_BOT_USER_AGENTS; their views are not counted."""
+    user_agent = request.headers.get('User-Agent', '').lower()
+    return any(token in user_agent for token in current_app.config['VIEW_BOT_USER_AGENTS'])
 
 @job_bp.route('/<int:job_id>', methods=['GET'])
+@conditional_get(lambda job_id: JobService.get_job_version(job_id))
 def get_job(job_id):
-    job = JobService.get_job_by_id(job_id)
-    if not job:
-        return api_response(404, "Job not found")
-    JobViewService.record_view(job_id)
-    return api_response(200, "Job found", job_schema.dump(job))
+    def load():
+        job = JobService.get_job_by_id(job_id)
+        return prerender(api_response(200, "Job found", job_schema.dump(job))) if job else None
+
+    include_archived = request.args.get('include_archived', '').lower() == 'true'
+    try:
+        entry = get_object('jobs', job_id, load, timeout=60)
+    except NotFound:
+        if not include_archived:
+            raise
+        entry = None
+    if not entry:
+        archived = JobArchiveService.get_archived_job(job_id) if include_archived else None
+        if archived is None:
+            return api_response(404, "Job not found")
+        return api_response(200, "Job found", job_schema.dump(archived), meta={'archived': True})
+    if _is_crawler():
+        job_view_suppressed_counter.labels(reason='crawler').inc()
+    else:
+        JobViewService.buffer_view(job_id, visitor=_visitor_token())
+    return serve(entry)
+
+@job_bp.route('/<int:job_id>/pipeline', methods=['GET'])
+@admin_required
+def get_job_pipeline(job_id):
+    include = [name for name in request.args.get('include', '').split(',') if name]
+    try:
+        limit = parse_page_size(request.args.get('limit', type=int))
+        counts, columns = ApplicationService.get_pipeline(
+            job_id, limit, status=request.args.get('status') or None, cursor=request.args.get('cursor'), include=include
+        )
+    except ValueError as e:
+        return api_response(400, str(e))
+    schema = ApplicationSchema(many=True, exclude=[name for name in APPLICATION_INCLUDES if name not in include])
+    data = {
+        'counts': counts,
+        'total': sum(counts.values()),
+        'columns': {
+            status: {'applications': schema.dump(applications), 'next_cursor': next_cursor}
+            for status, (applications, next_cursor) in columns.items()
+        },
+    }
+    return api_response(200, "Pipeline retrieved", data, meta={'limit': limit})
+
+@job_bp.route('/<int:job_id>/stage_durations', methods=['GET'])
+@admin_required
+def get_job_stage_durations(job_id):
+    rows = ApplicationEventService.get_stage_durations(job_id)
+    result = [{
+        'status': row.status,
+        'entered': row.entered,
+        'current': row.current,
+        'avg_seconds': float(row.avg_seconds) if row.avg_seconds is not None else None,
+        'median_seconds': row.median_seconds,
+        'p90_seconds': row.p90_seconds,
+        'median_seconds_to_reach': row.median_seconds_to_reach,
+    } for row in rows]
+    return api_response(200, "Stage durations retrieved", result)
 
 @job_bp.route('/<int:job_id>', methods=['PATCH'])
 def update_job(job_id):
@@ -67,7 +195,7 @@ def update_job(job_id):
     job = JobService.update_job(job_id, data)
     if not job:
         return api_response(404, "Job not found")
-    cache.clear() # Invalidate cache for all jobs
+    invalidate('jobs', job_id)
     return api_response(200, "Job updated successfully", job_schema.dump(job))
 
 @job_bp.route('/<int:job_id>', methods=['DELETE'])
@@ -75,4 +203,5 @@ def delete_job(job_id):
     result = JobService.delete_job(job_id)
     if not result:
         return api_response(404, "Job not found")
+    invalidate('jobs', job_id)
     return api_response(204, "Job deleted")
\ No newline at end of file
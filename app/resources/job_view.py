@@ -1,7 +1,9 @@
+from datetime import date, timedelta
 from flask import Blueprint, jsonify, request
 from app.services.job_view_service import JobViewService
 from app.utils.decorators import admin_required
 from app.utils.helpers import api_response
+from app.utils.pagination import parse_page_size
 
 job_view_bp = Blueprint('job_views', __name__, url_prefix='/job_views')
 
@@ -16,8 +18,70 @@ def get_monthly_job_views():
 
     monthly_views = JobViewService.get_monthly_views(year, month)
     
+    unique_viewers = JobViewService.get_monthly_unique_viewers(year, month, [job_id for job_id, _ in monthly_views])
+
     result = []
     for job_id, total_views in monthly_views:
-        result.append({'job_id': job_id, 'total_views': total_views})
+        result.append({'job_id': job_id, 'total_views': total_views, 'unique_viewers': unique_viewers.get(job_id)})
 
     return api_response(200, "Monthly job views retrieved successfully", result)
+
+
+def _parse_date_range(args):
+    """from/to as inclusive ISO dates; defaults to the last 30 days."""
+    try:
+        end = date.fromisoformat(args['to']) if args.get('to') else date.today()
+        start = date.fromisoformat(args['from']) if args.get('from') else end - timedelta(days=29)
+    except ValueError:
+        raise ValueError("from and to must be ISO 8601 dates (YYYY-MM-DD)")
+    return start, end
+
+@job_view_bp.route('/series', methods=['GET'])
+@admin_required
+def get_job_view_series():
+    job_id = request.args.get('job_id', type=int)
+    bucket = request.args.get('bucket', 'day')
+    try:
+        start, end = _parse_date_range(request.args)
+        series = JobViewService.get_view_series(start, end, bucket, job_id)
+    except ValueError as e:
+        return api_response(400, str(e))
+
+    result = [{'bucket': bucket_start.isoformat(), 'views': views} for bucket_start, views in series]
+    return api_response(200, "Job view series retrieved successfully", result,
+                        meta={'job_id': job_id, 'from': start.isoformat(), 'to': end.isoformat(), 'bucket': bucket})
+
+@job_view_bp.route('/top', methods=['GET'])
+@admin_required
+def get_top_viewed_jobs():
+    try:
+        start, end = _parse_date_range(request.args)
+        limit = parse_page_size(request.args.get('limit', type=int))
+        top = JobViewService.get_top_jobs(start, end, limit)
+    except ValueError as e:
+        return api_response(400, str(e))
+
+    result = [{'job_id': job_id, 'total_views': total_views} for job_id, total_views in top]
+    return api_response(200, "Top viewed jobs retrieved successfully", result,
+                        meta={'from': start.isoformat(), 'to': end.isoformat(), 'limit': limit})
+
+@job_view_bp.route('/conversion', methods=['GET'])
+@admin_required
+def get_job_conversion():
+    job_id = request.args.get('job_id', type=int)
+    try:
+        start, end = _parse_date_range(request.args)
+        limit = parse_page_size(request.args.get('limit', type=int))
+        rows, next_cursor = JobViewService.get_conversion_funnel(start, end, limit, request.args.get('cursor'), job_id)
+    except ValueError as e:
+        return api_response(400, str(e))
+
+    result = [{
+        'job_id': row.job_id,
+        'day': row.day.isoformat(),
+        'views': row.views,
+        'applications': row.applications,
+        'conversion_rate': float(row.conversion_rate) if row.conversion_rate is not None else None,
+    } for row in rows]
+    return api_response(200, "Job conversion funnel retrieved successfully", result,
+                        meta={'from': start.isoformat(), 'to': end.isoformat(), 'limit': limit, 'next_cursor': next_cursor})
@@ -1,5 +1,5 @@
 from .user import UserSchema, UserRegisterSchema, UserLoginSchema
-from .job import JobSchema
+from .job import JobSchema, JobSummarySchema, JobSearchResultSchema
 from .application import ApplicationSchema
 from .message import MessageSchema
 from .feedback import FeedbackSchema
@@ -1,4 +1,6 @@
 from marshmallow import Schema, fields, validate
+from .job import JobSummarySchema
+from .user import UserSchema
 
 class ApplicationSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -6,3 +8,7 @@ class ApplicationSchema(Schema):
     status = fields.Str(validate=validate.OneOf(['submitted', 'viewed', 'rejected', 'accepted']))
     user_id = fields.Int(required=True)
     job_posting_id = fields.Int(required=True)
+    version = fields.Int(dump_only=True)
+    # Only dumped when the listing is asked to include them
+    user = fields.Nested(UserSchema, dump_only=True)
+    job_posting = fields.Nested(JobSummarySchema, dump_only=True)
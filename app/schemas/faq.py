@@ -6,3 +6,4 @@ class FAQSchema(Schema):
     answer = fields.Str(required=True)
     category = fields.Str()
     created_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
@@ -8,4 +8,26 @@ class JobSchema(Schema):
     requirements = fields.Str()
     deadline = fields.DateTime(format='iso')
     posted_at = fields.DateTime(dump_only=True)
-    admin_id = fields.Int(required=True)
\ No newline at end of file
+    updated_at = fields.DateTime(dump_only=True)
+    admin_id = fields.Int(required=True)
+    applications_count = fields.Int(dump_only=True)
+    views_total = fields.Int(dump_only=True)
+    last_applied_at = fields.DateTime(dump_only=True)
+
+class JobSummarySchema(Schema):
+    """Listing row: everything except the unbounded description and requirements."""
+    id = fields.Int(dump_only=True)
+    title = fields.Str()
+    location = fields.Str()
+    deadline = fields.DateTime(format='iso')
+    posted_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+    admin_id = fields.Int()
+    applications_count = fields.Int(dump_only=True)
+    views_total = fields.Int(dump_only=True)
+    last_applied_at = fields.DateTime(dump_only=True)
+
+class JobSearchResultSchema(Schema):
+    job = fields.Nested(JobSchema)
+    rank = fields.Float()
+    snippet = fields.Str()
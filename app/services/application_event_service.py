@@ -0,0 +1,88 @@
+from sqlalchemy import exists, func, select, text
+from werkzeug.exceptions import NotFound
+from app.extensions import db
+from app.models.application import Application
+from app.models.application_event import ApplicationEvent
+from app.models.job import JobPosting
+
+# Each stage visit ends when the application's next event starts it on the
+# next one; visits without a next event are still in progress. Served by the
+# (job_posting_id, occurred_at) index.
+STAGE_DURATIONS = text("""
+    WITH visits AS (
+        SELECT to_status AS status,
+               occurred_at,
+               lead(occurred_at) OVER w AS left_at,
+               first_value(occurred_at) OVER w AS applied_at
+        FROM application_events
+        WHERE job_posting_id = :job_posting_id
+        WINDOW w AS (PARTITION BY application_id ORDER BY occurred_at, id)
+    ), measured AS (
+        SELECT status, left_at,
+               extract(epoch FROM left_at - occurred_at) AS seconds_in_stage,
+               extract(epoch FROM occurred_at - applied_at) AS seconds_to_reach
+        FROM visits
+    )
+    SELECT status,
+           count(*) AS entered,
+           count(*) FILTER (WHERE left_at IS NULL) AS current,
+           avg(seconds_in_stage) AS avg_seconds,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds_in_stage) AS median_seconds,
+           percentile_cont(0.9) WITHIN GROUP (ORDER BY seconds_in_stage) AS p90_seconds,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds_to_reach) AS median_seconds_to_reach
+    FROM measured
+    GROUP BY status
+    ORDER BY status
+""")
+
+class ApplicationEventService:
+    """
+    Reads the status history that triggers on applications append to
+    application_events (see the model).
+    """
+
+    @staticmethod
+    def get_timeline(application_id):
+        """
+        An application's events, oldest first, each with when the
+        application left that status (None for the current one) and the
+        seconds it spent there.
+
+        Raises:
+            NotFound: If the application does not exist
+        """
+        window = {'partition_by': ApplicationEvent.application_id,
+                  'order_by': (ApplicationEvent.occurred_at, ApplicationEvent.id)}
+        left_at = func.lead(ApplicationEvent.occurred_at).over(**window).label('left_at')
+        rows = db.session.execute(
+            select(ApplicationEvent, left_at)
+            .where(ApplicationEvent.application_id == application_id)
+            .order_by(ApplicationEvent.occurred_at, ApplicationEvent.id)
+        ).all()
+        if not rows and not db.session.scalar(select(exists().where(Application.id == application_id))):
+            raise NotFound(f"Application with ID {application_id} not found")
+        return [
+            {
+                'event': event,
+                'left_at': left_at,
+                'seconds_in_stage': (left_at - event.occurred_at).total_seconds() if left_at else None,
+            }
+            for event, left_at in rows
+        ]
+
+    @staticmethod
+    def get_stage_durations(job_posting_id):
+        """
+        Per status, across a job's applications: how many times it was
+        entered, how many applications are in it now, and the average,
+        median and 90th percentile seconds of the completed visits, plus the
+        median seconds from applying to reaching it (time-to-hire for
+        'accepted'). Computed in SQL with window functions over the events.
+
+        Raises:
+            NotFound: If the job posting does not exist
+        """
+        rows = db.session.execute(STAGE_DURATIONS, {'job_posting_id': job_posting_id}).all()
+        if not rows and not db.session.scalar(select(exists().where(JobPosting.id == job_posting_id))):
+            raise NotFound(f"Job with ID {job_posting_id} not found")
+        return rows
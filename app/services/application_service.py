@@ -1,43 +1,191 @@
+import time
+from datetime import datetime
 from app.models.application import Application
+from app.models.job import JobPosting
+from app.models.user import User
 from app.extensions import db
-from werkzeug.exceptions import NotFound
-from app.services.job_service import JobService
+from sqlalchemy import any_, cast, func, literal, or_, select, text, tuple_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm import aliased, joinedload, make_transient_to_detached, selectinload
+from werkzeug.exceptions import Conflict, NotFound
+from app.utils.cache import invalidate
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursor
+from app.tasks.email_tasks import send_email_task
+
+APPLICATION_STATUSES = ('submitted', 'under_review', 'accepted', 'rejected', 'withdrawn')
+APPLICATION_INCLUDES = ('user', 'job_posting')
+BULK_STATUS_MAX_UPDATES = 1000
+BULK_STATUS_MAX_RETRIES = 5
+BATCH_APPLY_MAX_JOBS = 100
+
+# One round trip per attempt: lock what isn't already locked, update it from
+# the requested (id, status) pairs and report which ids exist at all
+BULK_STATUS_UPDATE = text("""
+    WITH requested AS (
+        SELECT * FROM unnest(CAST(:ids AS int[]), CAST(:statuses AS text[])) AS r(id, status)
+    ), locked AS (
+        SELECT id FROM applications WHERE id = ANY(CAST(:ids AS int[])) FOR UPDATE SKIP LOCKED
+    ), updated AS (
+        UPDATE applications SET status = requested.status, version = applications.version + 1
+        FROM requested JOIN locked USING (id)
+        WHERE applications.id = requested.id
+        RETURNING applications.id
+    )
+    SELECT requested.id, updated.id IS NOT NULL AS updated,
+           EXISTS (SELECT 1 FROM applications WHERE applications.id = requested.id) AS found
+    FROM requested LEFT JOIN updated USING (id)
+""")
 
 class ApplicationService:
     @staticmethod
     def create_application(user_id, job_posting_id):
-        # Validate input parameters
+        """
+        Apply a user to a job posting in a single statement. A CTE looks up
+        the job and its deadline and feeds an INSERT ... ON CONFLICT DO
+        NOTHING against the (user_id, job_posting_id) unique constraint, so
+        concurrent duplicate applies can't both succeed; the user is validated
+        by the same insert through its foreign key.
+
+        Returns:
+            The new application, or None if the user already applied
+
+        Raises:
+            ValueError: If an ID is missing or the job posting has expired
+            NotFound: If the job posting does not exist
+            IntegrityError: If the user does not exist
+        """
         if user_id is None:
             raise ValueError("User ID cannot be None")
         if job_posting_id is None:
             raise ValueError("Job posting ID cannot be None")
-            
-        # Check for existing application
-        existing_application = Application.query.filter_by(user_id=user_id, job_posting_id=job_posting_id).first()
-        if existing_application:
-            return None
 
-        # Check if the job exists and is not expired
+        now = datetime.utcnow()
+        jobs, applications = JobPosting.__table__, Application.__table__
+        requested = select(literal(user_id).label('user_id'), literal(job_posting_id).label('job_posting_id')).subquery()
+        target = (
+            select(requested.c.user_id, jobs.c.id.label('job_posting_id'), jobs.c.deadline)
+            .select_from(requested.outerjoin(jobs, jobs.c.id == requested.c.job_posting_id))
+            .cte('target')
+        )
+        inserted = (
+            insert(applications)
+            .from_select(
+                ['user_id', 'job_posting_id', 'status', 'applied_at'],
+                select(target.c.user_id, target.c.job_posting_id, literal('submitted'), literal(now))
+                .where(target.c.job_posting_id.is_not(None))
+                .where(or_(target.c.deadline.is_(None), target.c.deadline >= now))
+            )
+            .on_conflict_do_nothing(index_elements=['user_id', 'job_posting_id'])
+            .returning(*applications.c)
+            .cte('inserted')
+        )
         try:
-            job = JobService.get_job_by_id(job_posting_id)
-            
-            # Check if job has expired
-            from datetime import datetime
-            if job.deadline and job.deadline < datetime.utcnow():
-                raise ValueError("Cannot apply to an expired job posting")
-            
-            # If we get here, the job exists and is not expired
-            application = Application(user_id=user_id, job_posting_id=job_posting_id)
-            db.session.add(application)
+            row = db.session.execute(
+                select(target.c.job_posting_id.label('found_job_posting_id'), target.c.deadline, *inserted.c)
+                .select_from(target.outerjoin(inserted, literal(True)))
+            ).one()
             db.session.commit()
-            return application
-            
-        except ValueError as e:
-            # Re-raise validation errors
-            raise ValueError(str(e))
-        except NotFound as e:
-            # Re-raise with a more specific message
-            raise NotFound(f"Cannot create application: {str(e)}")
+        except IntegrityError:
+            db.session.rollback()
+            raise
+
+        if row.found_job_posting_id is None:
+            raise NotFound(f"Cannot create application: Job with ID {job_posting_id} not found")
+        if row.id is None:
+            if row.deadline is not None and row.deadline < now:
+                raise ValueError("Cannot apply to an expired job posting")
+            return None
+
+        # The triggers changed the posting's counters, which its cached views serve
+        invalidate('jobs', job_posting_id)
+        return ApplicationService._attach(row)
+
+    @staticmethod
+    def _attach(row):
+        """Build an Application from a RETURNING row and attach it to the session without reloading it."""
+        application = Application(**{column.key: getattr(row, column.key) for column in Application.__table__.c})
+        make_transient_to_detached(application)
+        db.session.add(application)
+        return application
+
+    @staticmethod
+    def create_applications(user_id, job_posting_ids):
+        """
+        Apply one user to many job postings in two statements: one query
+        loads the user together with every requested job (id = ANY(...)),
+        then one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING
+        creates the applications to open jobs. The user gets a single
+        confirmation email listing them, sent by one Celery task.
+
+        Returns:
+            {job_posting_id: (outcome, application)} in request order, outcome
+            being 'created', 'duplicate' (already applied), 'expired' or
+            'not_found'; application is set only when created
+
+        Raises:
+            ValueError: If there are no job ids or too many
+            NotFound: If the user does not exist
+        """
+        job_posting_ids = list(dict.fromkeys(job_posting_ids))
+        if not job_posting_ids:
+            raise ValueError("No job postings given")
+        if len(job_posting_ids) > BATCH_APPLY_MAX_JOBS:
+            raise ValueError(f"At most {BATCH_APPLY_MAX_JOBS} job postings are allowed per request")
+
+        now = datetime.utcnow()
+        users, jobs = User.__table__, JobPosting.__table__
+        rows = db.session.execute(
+            select(users.c.email, users.c.first_name, jobs.c.id, jobs.c.title, jobs.c.deadline)
+            .select_from(users.outerjoin(jobs, jobs.c.id == any_(cast(job_posting_ids, ARRAY(Integer)))))
+            .where(users.c.id == user_id)
+        ).all()
+        if not rows:
+            raise NotFound(f"User with ID {user_id} not found")
+        found = {row.id: row for row in rows if row.id is not None}
+
+        results = {}
+        open_ids = []
+        for job_posting_id in job_posting_ids:
+            job = found.get(job_posting_id)
+            if job is None:
+                results[job_posting_id] = ('not_found', None)
+            elif job.deadline is not None and job.deadline < now:
+                results[job_posting_id] = ('expired', None)
+            else:
+                results[job_posting_id] = ('duplicate', None)
+                open_ids.append(job_posting_id)
+
+        if open_ids:
+            try:
+                inserted = db.session.execute(
+                    insert(Application.__table__)
+                    .values([{'user_id': user_id, 'job_posting_id': job_posting_id, 'status': 'submitted',
+                              'applied_at': now} for job_posting_id in open_ids])
+                    .on_conflict_do_nothing(index_elements=['user_id', 'job_posting_id'])
+                    .returning(*Application.__table__.c)
+                ).all()
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                raise
+            for row in inserted:
+                results[row.job_posting_id] = ('created', ApplicationService._attach(row))
+            if inserted:
+                invalidate('jobs', *[row.job_posting_id for row in inserted])
+
+        created = [found[job_posting_id].title for job_posting_id, (outcome, _) in results.items()
+                   if outcome == 'created']
+        if created:
+            send_email_task.delay(
+                subject="Your RecruitConnect applications",
+                recipients=[rows[0].email],
+                body=f"Dear {rows[0].first_name},\n\nWe received your applications for:\n"
+                     + "\n".join(f"- {title}" for title in created)
+            )
+        return results
 
     @staticmethod
     def get_application_by_id(application_id):
@@ -47,55 +195,105 @@ class ApplicationService:
         return application
 
     @staticmethod
-    def update_application_status(application_id, status, simulate_delay=False):
+    def update_application_status(application_id, status, simulate_delay=False, expected_version=None):
         """
-        Update the status of an application.
-        
+        Update the status of an application without holding a row lock while
+        working on it. The UPDATE is conditional on the version that was read
+        (version_id_col), so a concurrent write that commits first makes this
+        one fail instead of being silently overwritten.
+
         Args:
             application_id: The ID of the application to update
             status: The new status
             simulate_delay: If True, adds a small delay to help simulate race conditions in tests
-            
+            expected_version: The version the caller last saw (If-Match), or
+                None to accept whatever version is current
+
         Returns:
             The updated application
-            
+
         Raises:
             ValueError: If the status is invalid
             NotFound: If the application is not found
+            Conflict: If the application has changed since expected_version,
+                or another write committed between our read and our update
         """
-        valid_statuses = ['submitted', 'under_review', 'accepted', 'rejected', 'withdrawn']
-        if status not in valid_statuses:
-            raise ValueError(f"Invalid status: {status}. Valid statuses are: {valid_statuses}")
+        if status not in APPLICATION_STATUSES:
+            raise ValueError(f"Invalid status: {status}. Valid statuses are: {list(APPLICATION_STATUSES)}")
 
         try:
-            # Get the application with a row-level lock
-            application = (
-                db.session.query(Application)
-                .filter(Application.id == application_id)
-                .with_for_update()
-                .first()
-            )
-            
+            # populate_existing so a copy already in the session doesn't hide a newer version
+            application = db.session.get(Application, application_id, populate_existing=True)
             if application is None:
                 raise NotFound(f"Application with ID {application_id} not found")
-            
+            if expected_version is not None and application.version != expected_version:
+                raise Conflict(f"Application {application_id} is at version {application.version}, "
+                               f"not {expected_version}")
+
             # Add a small delay to help simulate race conditions in tests
             if simulate_delay:
-                import time
                 time.sleep(0.5)
-            
-            # Update the status
+
             application.status = status
-            
-            # Always commit the transaction
             db.session.commit()
-            
             return application
-            
+
+        except StaleDataError:
+            db.session.rollback()
+            raise Conflict(f"Application {application_id} was modified by another request")
         except Exception as e:
             db.session.rollback()
             raise e
 
+    @staticmethod
+    def bulk_update_status(updates, retries=0, retry_delay=0.1):
+        """
+        Apply many status changes in one set-based UPDATE. Rows another
+        transaction holds locked are skipped rather than waited on; with
+        retries, the skipped ones are attempted again that many times,
+        retry_delay seconds apart.
+
+        Args:
+            updates: Dict of {application_id: status}
+
+        Returns:
+            Dict of {application_id: outcome}, outcome being 'updated',
+            'locked' or 'not_found'
+
+        Raises:
+            ValueError: If there are no updates or too many, or a status is invalid
+        """
+        if not updates:
+            raise ValueError("No updates given")
+        if len(updates) > BULK_STATUS_MAX_UPDATES:
+            raise ValueError(f"At most {BULK_STATUS_MAX_UPDATES} updates are allowed per request")
+        invalid = sorted({status for status in updates.values() if status not in APPLICATION_STATUSES}, key=str)
+        if invalid:
+            raise ValueError(f"Invalid status: {', '.join(map(str, invalid))}. "
+                             f"Valid statuses are: {list(APPLICATION_STATUSES)}")
+        retries = max(0, min(retries, BULK_STATUS_MAX_RETRIES))
+
+        outcomes = {}
+        pending = dict(updates)
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(retry_delay)
+            try:
+                rows = db.session.execute(BULK_STATUS_UPDATE, {
+                    'ids': list(pending), 'statuses': list(pending.values())
+                }).all()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            for application_id, updated, found in rows:
+                outcomes[application_id] = 'updated' if updated else 'locked' if found else 'not_found'
+            pending = {application_id: status for application_id, status in pending.items()
+                       if outcomes[application_id] == 'locked'}
+            if not pending:
+                break
+        return outcomes
+
     @staticmethod
     def delete_application(application_id):
         application = db.session.get(Application, application_id)
@@ -103,8 +301,155 @@ class ApplicationService:
             raise NotFound(f"Application with ID {application_id} not found")
         db.session.delete(application)
         db.session.commit()
+        invalidate('jobs', application.job_posting_id)
         return application
 
+    @staticmethod
+    def build_applications_query(filters=None, cursor=None):
+        """
+        Build the filtered listing query, newest first, with the keyset cut for
+        the given cursor applied. Filters combine; per job they are served by
+        (job_posting_id, status, applied_at, id) and per user by
+        (user_id, applied_at, id).
+
+        Args:
+            filters: Dict with any of user_id, job_posting_id, status and applied_after
+            cursor: Opaque token from a previous page
+
+        Raises:
+            ValueError: If status is not a valid application status
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        filters = filters or {}
+        query = Application.query
+        if filters.get('user_id') is not None:
+            query = query.filter(Application.user_id == filters['user_id'])
+        if filters.get('job_posting_id') is not None:
+            query = query.filter(Application.job_posting_id == filters['job_posting_id'])
+        if filters.get('status'):
+            if filters['status'] not in APPLICATION_STATUSES:
+                raise ValueError(f"Invalid status: {filters['status']}. Valid statuses are: {list(APPLICATION_STATUSES)}")
+            query = query.filter(Application.status == filters['status'])
+        if filters.get('applied_after'):
+            query = query.filter(Application.applied_at >= filters['applied_after'])
+
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                last_applied_at, last_id = datetime.fromisoformat(values[0]), int(values[1])
+            except (IndexError, TypeError, ValueError):
+                raise InvalidCursor("Invalid cursor")
+            query = query.filter(tuple_(Application.applied_at, Application.id) < (last_applied_at, last_id))
+        return query.order_by(Application.applied_at.desc(), Application.id.desc())
+
+    @staticmethod
+    def get_applications_page(limit, cursor=None, filters=None, include=()):
+        """
+        Return one page of applications using keyset pagination on
+        (applied_at, id). See build_applications_query for filters.
+
+        Args:
+            limit: Maximum number of applications to return
+            cursor: Opaque token from a previous page, or None for the first page
+            include: Relationships from APPLICATION_INCLUDES to load with the
+                page, so embedding them doesn't lazy-load one row at a time
+
+        Returns:
+            An (applications, next_cursor) tuple; next_cursor is None on the last page
+
+        Raises:
+            ValueError: If a filter or include is not supported
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        options = ApplicationService._include_options(Application, include)
+        query = ApplicationService.build_applications_query(filters, cursor).options(*options)
+        applications = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(applications) > limit:
+            applications = applications[:limit]
+            last = applications[-1]
+            next_cursor = encode_cursor(last.applied_at, last.id)
+        return applications, next_cursor
+
+    @staticmethod
+    def _include_options(entity, include):
+        unknown = set(include) - set(APPLICATION_INCLUDES)
+        if unknown:
+            raise ValueError(f"Invalid include: {', '.join(sorted(unknown))}. Valid includes are: {list(APPLICATION_INCLUDES)}")
+        options = []
+        if 'user' in include:
+            # Each application has its own user row, so join it into the page query
+            options.append(joinedload(entity.user, innerjoin=True))
+        if 'job_posting' in include:
+            # Many applications share a job; load each distinct job once with IN
+            options.append(selectinload(entity.job_posting))
+        return options
+
+    @staticmethod
+    def get_pipeline(job_posting_id, limit, status=None, cursor=None, include=()):
+        """
+        A job's applications as a board with one column per status. Counts
+        come from a single GROUP BY; the first page of every column comes from
+        one query ranking applications with ROW_NUMBER() OVER (PARTITION BY
+        status), newest first. Each column gets its own cursor, and passing it
+        back with that status pages just that column (the cursor also works on
+        the applications listing filtered by job and status).
+
+        Returns:
+            A (counts, columns) tuple: {status: count} and
+            {status: (applications, next_cursor)}, every valid status present
+
+        Raises:
+            NotFound: If the job posting does not exist
+            ValueError: If the status or an include is not supported
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        jobs = JobPosting.__table__
+        # Outer join so a job without applications still yields a row, and a missing job none
+        rows = db.session.execute(
+            select(Application.status, func.count(Application.id))
+            .select_from(jobs.outerjoin(Application, Application.job_posting_id == jobs.c.id))
+            .where(jobs.c.id == job_posting_id)
+            .group_by(Application.status)
+        ).all()
+        if not rows:
+            raise NotFound(f"Job with ID {job_posting_id} not found")
+        counts = {name: 0 for name in APPLICATION_STATUSES}
+        counts.update({name: count for name, count in rows if name is not None})
+
+        if status is not None:
+            applications, next_cursor = ApplicationService.get_applications_page(
+                limit, cursor, filters={'job_posting_id': job_posting_id, 'status': status}, include=include
+            )
+            return counts, {status: (applications, next_cursor)}
+        if cursor:
+            raise ValueError("cursor requires a status")
+
+        position = func.row_number().over(
+            partition_by=Application.status,
+            order_by=(Application.applied_at.desc(), Application.id.desc())
+        ).label('position')
+        ranked = select(Application, position).where(Application.job_posting_id == job_posting_id).subquery()
+        ranked_application = aliased(Application, ranked)
+        query = (
+            select(ranked_application)
+            .where(ranked.c.position <= limit + 1)
+            .order_by(ranked.c.status, ranked.c.position)
+            .options(*ApplicationService._include_options(ranked_application, include))
+        )
+        pages = {name: [] for name in counts}
+        for application in db.session.execute(query).unique().scalars():
+            pages[application.status].append(application)
+
+        columns = {}
+        for name, applications in pages.items():
+            next_cursor = None
+            if len(applications) > limit:
+                applications = applications[:limit]
+                next_cursor = encode_cursor(applications[-1].applied_at, applications[-1].id)
+            columns[name] = (applications, next_cursor)
+        return counts, columns
+
     @staticmethod
     def get_all_applications():
         return db.session.query(Application).all()
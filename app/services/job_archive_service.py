@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, select
+from app.extensions import db
+from app.models.application import Application
+from app.models.application_event import ApplicationEvent
+from app.models.feedback import Feedback
+from app.models.job import JobPosting
+from app.models.job_archive import (
+    ArchivedJobPosting, ArchivedJobView, ArchivedApplication, ArchivedFeedback, ArchivedApplicationEvent
+)
+from app.models.job_view import JobView
+from app.utils.cache import invalidate
+
+ARCHIVED_JOB_COLUMNS = ('id', 'title', 'description', 'location', 'requirements', 'deadline', 'posted_at',
+                        'updated_at', 'admin_id', 'applications_count', 'views_total', 'last_applied_at')
+ARCHIVED_VIEW_COLUMNS = ('id', 'job_id', 'view_date', 'view_count')
+ARCHIVED_APPLICATION_COLUMNS = ('id', 'applied_at', 'status', 'user_id', 'job_posting_id', 'version')
+ARCHIVED_FEEDBACK_COLUMNS = ('id', 'user_id', 'job_application_id', 'rating', 'comment', 'created_at')
+ARCHIVED_EVENT_COLUMNS = ('id', 'application_id', 'job_posting_id', 'from_status', 'to_status', 'occurred_at')
+
+class JobArchiveService:
+    @staticmethod
+    def archive_expired_jobs(retention_days, batch_size=500, now=None):
+        """
+        Move postings whose deadline passed more than retention_days ago into
+        the archive tables, together with their job_views, applications, the
+        applications' feedback and their application_events.
+
+        Each batch is copied and deleted in its own transaction, so a long run
+        never holds locks on more than batch_size postings and their
+        applications. The applications are locked before they are copied, so
+        feedback or status changes racing the batch wait for it and then fail
+        instead of being deleted uncopied.
+
+        Returns:
+            The number of postings archived
+        """
+        cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+        jobs = JobPosting.__table__
+        applications = Application.__table__
+        archived = 0
+        while True:
+            batch = db.session.execute(
+                select(jobs.c.id)
+                .where(jobs.c.deadline < cutoff)
+                .order_by(jobs.c.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not batch:
+                break
+
+            application_ids = select(applications.c.id).where(applications.c.job_posting_id.in_(batch))
+            db.session.execute(application_ids.with_for_update())
+            # Parents are copied before children and deleted after them, for the foreign keys
+            moves = (
+                (ArchivedJobPosting, JobPosting, ARCHIVED_JOB_COLUMNS, jobs.c.id.in_(batch)),
+                (ArchivedApplication, Application, ARCHIVED_APPLICATION_COLUMNS,
+                 applications.c.job_posting_id.in_(batch)),
+                (ArchivedFeedback, Feedback, ARCHIVED_FEEDBACK_COLUMNS,
+                 Feedback.__table__.c.job_application_id.in_(application_ids)),
+                (ArchivedApplicationEvent, ApplicationEvent, ARCHIVED_EVENT_COLUMNS,
+                 ApplicationEvent.__table__.c.job_posting_id.in_(batch)),
+                (ArchivedJobView, JobView, ARCHIVED_VIEW_COLUMNS, JobView.__table__.c.job_id.in_(batch)),
+            )
+            for archive, model, columns, condition in moves:
+                table = model.__table__
+                db.session.execute(insert(archive.__table__).from_select(
+                    columns, select(*[table.c[name] for name in columns]).where(condition)
+                ))
+            for _, model, _, condition in reversed(moves):
+                db.session.execute(delete(model.__table__).where(condition))
+            db.session.commit()
+
+            invalidate('jobs', *batch)
+            archived += len(batch)
+            if len(batch) < batch_size:
+                break
+        return archived
+
+    @staticmethod
+    def get_archived_job(job_id):
+        return db.session.get(ArchivedJobPosting, job_id)
@@ -1,5 +1,44 @@
+from datetime import datetime
+from sqlalchemy import cast, func, or_, select, text, tuple_, REAL
+from sqlalchemy.orm import load_only
 from app.extensions import db
 from app.models.job import JobPosting
+from app.utils.cache import invalidate
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursor
+
+# Recompute the counters of one batch of (already locked) postings and write
+# only the ones that drifted. Views are raw job_views plus the monthly rollup
+# for months whose partitions have been dropped, matching what the triggers
+# keep: dropping a partition leaves views_total alone.
+RECONCILE_JOB_COUNTERS = text("""
+    UPDATE job_postings
+    SET applications_count = actual.applications_count,
+        last_applied_at = actual.last_applied_at,
+        views_total = actual.views_total
+    FROM (
+        SELECT j.id,
+               (SELECT count(*) FROM applications a WHERE a.job_posting_id = j.id) AS applications_count,
+               (SELECT max(applied_at) FROM applications a WHERE a.job_posting_id = j.id) AS last_applied_at,
+               coalesce((SELECT sum(view_count) FROM job_views v WHERE v.job_id = j.id), 0)
+               + coalesce((SELECT sum(view_count) FROM job_views_monthly m
+                           WHERE m.job_id = j.id
+                             AND m.month < coalesce(CAST(:raw_views_start AS date), 'infinity')), 0) AS views_total
+        FROM job_postings j WHERE j.id = ANY(CAST(:ids AS int[]))
+    ) AS actual
+    WHERE job_postings.id = actual.id
+      AND (job_postings.applications_count, job_postings.last_applied_at, job_postings.views_total)
+          IS DISTINCT FROM (actual.applications_count, actual.last_applied_at, actual.views_total)
+    RETURNING job_postings.id
+""")
+
+JOB_SORTS = ('posted_at', 'deadline')
+JOB_VIEWS = ('summary', 'full')
+# Columns behind JobSummarySchema; description and requirements stay on the server
+JOB_SUMMARY_COLUMNS = (
+    JobPosting.id, JobPosting.title, JobPosting.location, JobPosting.deadline,
+    JobPosting.posted_at, JobPosting.updated_at, JobPosting.admin_id,
+    JobPosting.applications_count, JobPosting.views_total, JobPosting.last_applied_at,
+)
 
 class JobService:
     @staticmethod
@@ -17,6 +56,146 @@ class JobService:
     def get_all_jobs():
         return JobPosting.query.all()
 
+    @staticmethod
+    def build_jobs_query(filters=None, sort='posted_at', cursor=None):
+        """
+        Build the filtered, ordered listing query with the keyset cut for the
+        given cursor applied. Every filter is a plain column predicate so it
+        can be served by the job_postings indexes.
+
+        Args:
+            filters: Dict with any of location, admin_id, posted_after,
+                posted_before and deadline_open
+            sort: 'posted_at' (newest first) or 'deadline' (soonest first;
+                jobs without a deadline are left out)
+            cursor: Opaque token from a previous page of the same sort
+
+        Raises:
+            ValueError: If sort is not supported
+            InvalidCursor: If the cursor cannot be decoded or belongs to another sort
+        """
+        filters = filters or {}
+        if sort not in JOB_SORTS:
+            raise ValueError(f"Invalid sort: {sort}. Valid sorts are: {list(JOB_SORTS)}")
+
+        query = JobPosting.query
+        if filters.get('location'):
+            query = query.filter(JobPosting.location == filters['location'])
+        if filters.get('admin_id') is not None:
+            query = query.filter(JobPosting.admin_id == filters['admin_id'])
+        if filters.get('posted_after'):
+            query = query.filter(JobPosting.posted_at >= filters['posted_after'])
+        if filters.get('posted_before'):
+            query = query.filter(JobPosting.posted_at < filters['posted_before'])
+        if filters.get('deadline_open'):
+            query = query.filter(or_(JobPosting.deadline.is_(None), JobPosting.deadline >= datetime.utcnow()))
+
+        if sort == 'posted_at':
+            key = JobPosting.posted_at
+            query = query.order_by(JobPosting.posted_at.desc(), JobPosting.id.desc())
+        else:
+            key = JobPosting.deadline
+            query = query.filter(JobPosting.deadline.isnot(None)).order_by(JobPosting.deadline.asc(), JobPosting.id.asc())
+
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                if values[0] != sort:
+                    raise ValueError
+                last_key, last_id = datetime.fromisoformat(values[1]), int(values[2])
+            except (IndexError, TypeError, ValueError):
+                raise InvalidCursor("Invalid cursor")
+            if sort == 'posted_at':
+                query = query.filter(tuple_(key, JobPosting.id) < (last_key, last_id))
+            else:
+                query = query.filter(tuple_(key, JobPosting.id) > (last_key, last_id))
+        return query
+
+    @staticmethod
+    def get_jobs_page(limit, cursor=None, filters=None, sort='posted_at', view='full'):
+        """
+        Return one page of job postings using keyset pagination on
+        (sort column, id). See build_jobs_query for filters and sorts.
+
+        Args:
+            limit: Maximum number of jobs to return
+            cursor: Opaque token from a previous page, or None for the first page
+            view: 'summary' loads only JOB_SUMMARY_COLUMNS; accessing description
+                or requirements on those jobs would issue one query per job
+
+        Returns:
+            A (jobs, next_cursor) tuple; next_cursor is None on the last page
+
+        Raises:
+            ValueError: If sort or view is not supported
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        if view not in JOB_VIEWS:
+            raise ValueError(f"Invalid view: {view}. Valid views are: {list(JOB_VIEWS)}")
+        query = JobService.build_jobs_query(filters, sort, cursor)
+        if view == 'summary':
+            query = query.options(load_only(*JOB_SUMMARY_COLUMNS))
+        jobs = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            last = jobs[-1]
+            next_cursor = encode_cursor(sort, getattr(last, sort), last.id)
+        return jobs, next_cursor
+
+    @staticmethod
+    def search_jobs(text, limit, cursor=None):
+        """
+        Full-text search over title, location, requirements and description,
+        ranked by ts_rank and paginated on (rank, id).
+
+        Ranking and the keyset cut run against the GIN-indexed search_vector
+        in an inner query; snippets are only highlighted for the returned page.
+
+        Returns:
+            A (results, next_cursor) tuple where each result is a dict with
+            'job', 'rank' and 'snippet' keys
+
+        Raises:
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        tsquery = func.websearch_to_tsquery('english', text)
+        rank = func.ts_rank(JobPosting.search_vector, tsquery)
+
+        ranked = (
+            db.session.query(JobPosting.id.label('id'), rank.label('rank'))
+            .filter(JobPosting.search_vector.op('@@')(tsquery))
+        )
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                last_rank, last_id = float(values[0]), int(values[1])
+            except (IndexError, TypeError, ValueError):
+                raise InvalidCursor("Invalid cursor")
+            # ts_rank is float4; compare in float4 so the cursor row itself is excluded
+            ranked = ranked.filter(tuple_(rank, JobPosting.id) < tuple_(cast(last_rank, REAL), last_id))
+        ranked = ranked.order_by(rank.desc(), JobPosting.id.desc()).limit(limit + 1).subquery()
+
+        snippet = func.ts_headline(
+            'english',
+            func.concat_ws(' ', JobPosting.description, JobPosting.requirements),
+            tsquery,
+            'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+        )
+        rows = (
+            db.session.query(JobPosting, ranked.c.rank, snippet)
+            .join(ranked, JobPosting.id == ranked.c.id)
+            .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id)
+        results = [{'job': job, 'rank': job_rank, 'snippet': job_snippet} for job, job_rank, job_snippet in rows]
+        return results, next_cursor
+
     @staticmethod
     def get_job_by_id(job_id):
         job = db.session.get(JobPosting, job_id)
@@ -25,6 +204,55 @@ class JobService:
             raise NotFound(f"Job with ID {job_id} not found")
         return job
 
+    @staticmethod
+    def reconcile_job_counters(batch_size=1000):
+        """
+        Repair drift in applications_count, last_applied_at and views_total,
+        walking job_postings in id order. Each batch locks its postings first,
+        so an apply or view flush racing the recount waits for it and then
+        adds its own delta on top instead of being overwritten.
+
+        Returns:
+            The number of postings whose counters were corrected
+        """
+        # Views older than the oldest raw month only survive in the rollup
+        raw_views_start = db.session.execute(
+            text("SELECT date_trunc('month', min(view_date))::date FROM job_views")
+        ).scalar()
+        db.session.commit()
+        repaired = 0
+        last_id = 0
+        while True:
+            ids = db.session.execute(
+                select(JobPosting.id).where(JobPosting.id > last_id)
+                .order_by(JobPosting.id).limit(batch_size).with_for_update()
+            ).scalars().all()
+            if not ids:
+                break
+            corrected = db.session.execute(
+                RECONCILE_JOB_COUNTERS, {'ids': ids, 'raw_views_start': raw_views_start}
+            ).scalars().all()
+            db.session.commit()
+            if corrected:
+                invalidate('jobs', *corrected)
+            repaired += len(corrected)
+            last_id = ids[-1]
+            if len(ids) < batch_size:
+                break
+        return repaired
+
+    @staticmethod
+    def get_job_version(job_id):
+        """
+        Return the job's version stamp without loading the row, or None if it
+        doesn't exist: its updated_at plus the trigger-maintained counters,
+        which change without touching updated_at.
+        """
+        return db.session.execute(
+            select(JobPosting.updated_at, JobPosting.applications_count, JobPosting.views_total)
+            .where(JobPosting.id == job_id)
+        ).one_or_none()
+
     @staticmethod
     def update_job(job_id, data):
         job = db.session.get(JobPosting, job_id)
@@ -0,0 +1,99 @@
+import re
+from datetime import date
+from sqlalchemy import text
+from app.extensions import db
+
+DEFAULT_PARTITION = 'job_views_default'
+PARTITION_BOUND = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+def _add_months(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month_start):
+    return f"job_views_p{month_start:%Y_%m}"
+
+class JobViewPartitionService:
+    """
+    Maintains the monthly range partitions of job_views: creates them ahead
+    of time and detaches and drops the ones past retention, which is a
+    catalog operation instead of a bulk DELETE.
+    """
+
+    @staticmethod
+    def list_partitions():
+        """Monthly partitions as (name, start, end) tuples, oldest first; the default partition is left out."""
+        rows = db.session.execute(text("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'job_views'::regclass
+        """)).all()
+        partitions = []
+        for name, bound in rows:
+            match = PARTITION_BOUND.search(bound)
+            if match:
+                partitions.append((name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @staticmethod
+    def create_partition(month_start):
+        """
+        Create the partition for one month. Rows for that month that already
+        landed in the default partition are moved into it first, since
+        Postgres refuses to attach a range the default partition holds rows for.
+        Returns False if the partition already exists.
+        """
+        name = partition_name(month_start)
+        if any(existing == name for existing, _, _ in JobViewPartitionService.list_partitions()):
+            return False
+        start, end = month_start.isoformat(), _add_months(month_start, 1).isoformat()
+        db.session.execute(text(f"CREATE TABLE {name} (LIKE job_views INCLUDING DEFAULTS)"))
+        db.session.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION} WHERE view_date >= :start AND view_date < :end
+                RETURNING id, job_id, view_date, view_count
+            )
+            INSERT INTO {name} (id, job_id, view_date, view_count) SELECT * FROM moved
+        """), {'start': start, 'end': end})
+        db.session.execute(text(f"ALTER TABLE job_views ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def ensure_partitions(months_ahead, today=None):
+        """Make sure the current month and the next months_ahead months have partitions. Returns the names created."""
+        current = (today or date.today()).replace(day=1)
+        created = []
+        for offset in range(months_ahead + 1):
+            month_start = _add_months(current, offset)
+            if JobViewPartitionService.create_partition(month_start):
+                created.append(partition_name(month_start))
+        return created
+
+    @staticmethod
+    def drop_expired_partitions(retention_months, today=None):
+        """
+        Detach and drop partitions that end before the retention cutoff, the
+        first day of the month retention_months before the current one, and
+        delete expired rows from the default partition. Monthly totals stay
+        in job_views_monthly.
+
+        Raises:
+            ValueError: If retention_months is below 2, which would drop the
+                previous month before the nightly rollup has finished with it
+
+        Returns:
+            The names of the dropped partitions
+        """
+        if retention_months < 2:
+            raise ValueError("retention_months must be at least 2")
+        cutoff = _add_months((today or date.today()).replace(day=1), -retention_months)
+        dropped = []
+        for name, _, end in JobViewPartitionService.list_partitions():
+            if end <= cutoff:
+                db.session.execute(text(f"ALTER TABLE job_views DETACH PARTITION {name}"))
+                db.session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        db.session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE view_date < :cutoff"), {'cutoff': cutoff})
+        db.session.commit()
+        return dropped
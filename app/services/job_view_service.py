@@ -1,28 +1,536 @@
-from app.extensions import db
-from app.models.job_view import JobView
-from datetime import date
-from sqlalchemy import func, extract
+import threading
+import uuid
+import structlog
+from flask import current_app
+from app.extensions import cache, db
+from app.models.job import JobPosting
+from app.models.job_conversion import JobConversionDaily
+from app.models.job_view import JobView, JobViewMonthly, JobViewFlush
+from app.utils.cache import acquire_lock, extend_lock, invalidate_objects, release_lock, redis_client, redis_key
+from app.utils.bloom import BloomFilter, bloom_parameters, bloom_positions
+from app.utils.hyperloglog import HyperLogLog
+from app.metrics import job_view_suppressed_counter
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursor
+from datetime import date, datetime, timedelta
+from redis.exceptions import ResponseError
+from sqlalchemy import and_, cast, delete, func, literal, not_, or_, select, text, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+log = structlog.get_logger()
+
+VIEW_BUFFER_KEY = 'job_views:buffer'
+VIEW_FLUSHING_KEY = 'job_views:flushing'
+VIEW_FLUSH_LOCK = 'job_views:flush'
+VIEW_FLUSH_LEASE = 60
+VIEW_FLUSH_CHUNK = 1000
+# Field of the parked hash holding its batch id; view fields are "job_id:date"
+VIEW_BATCH_FIELD = 'batch'
+# Batch ids only need to outlive a parked hash whose flush committed but whose
+# delete didn't happen; the next flush finishes that within seconds
+VIEW_FLUSH_BATCH_RETENTION = timedelta(days=7)
+# Drop the parked hash only if it is still the batch that was just written
+DELETE_FLUSHED_BATCH_SCRIPT = """
+if redis.call('hget', KEYS[1], ARGV[1]) == ARGV[2] then return redis.call('del', KEYS[1]) end
+return 0
+"""
+# Daily sketches are kept long enough for year-over-year monthly reports
+UNIQUE_VIEWERS_TTL = 400 * 24 * 3600
+# Per-day Bloom filters of (job, visitor) pairs already counted; kept a second
+# day for views buffered just before midnight
+SEEN_VIEWS_TTL = 2 * 24 * 3600
+VIEW_BUCKETS = ('day', 'week', 'month')
+MAX_SERIES_BUCKETS = 1000
+# A bucket is closed, and its total cached, once a full day has passed since
+# it ended, so views still sitting in the flush buffer have landed
+CLOSED_BUCKET_DELAY = timedelta(days=1)
+CLOSED_BUCKET_TTL = 30 * 24 * 3600
+
+def _month_bounds(year, month):
+    """First day of the month and first day of the next month."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+def _bucket_start(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())  # ISO weeks, as date_trunc('week')
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+def _bucket_end(start, bucket):
+    if bucket == 'week':
+        return start + timedelta(days=7)
+    if bucket == 'month':
+        return _month_bounds(start.year, start.month)[1]
+    return start + timedelta(days=1)
+
+def _is_closed(end):
+    return end + CLOSED_BUCKET_DELAY <= date.today()
+
+def _seen_views_key(view_date):
+    return f"job_views:seen:{view_date.isoformat()}"
+
+_local_seen_views_lock = threading.Lock()
+
+def _unique_viewers_key(job_id, view_date):
+    return f"job_viewers:{job_id}:{view_date.isoformat()}"
 
 class JobViewService:
     @staticmethod
-    def record_view(job_id):
-        today = date.today()
-        job_view = JobView.query.filter_by(job_id=job_id, view_date=today).first()
-        if job_view:
-            job_view.view_count += 1
-        else:
-            job_view = JobView(job_id=job_id, view_date=today, view_count=1)
-            db.session.add(job_view)
+    def record_view(job_id, view_date=None):
+        """
+        Count one view with a single INSERT ... ON CONFLICT DO UPDATE on
+        (job_id, view_date), so concurrent first views neither collide on
+        _job_view_uc nor lose increments.
+
+        Returns:
+            The new view_count for the job on that day
+        """
+        stmt = insert(JobView).values(job_id=job_id, view_date=view_date or date.today(), view_count=1)
+        stmt = stmt.on_conflict_do_update(
+            constraint='_job_view_uc',
+            set_={'view_count': JobView.view_count + stmt.excluded.view_count}
+        ).returning(JobView.view_count)
+        view_count = db.session.execute(stmt).scalar_one()
         db.session.commit()
-        return job_view
+        # views_total changed (see COUNT_VIEWS_TRIGGERS). Listings may lag by their TTL
+        invalidate_objects('jobs', job_id)
+        return view_count
 
     @staticmethod
-    def get_monthly_views(year, month):
-        monthly_views = db.session.query(
+    def record_views(counts, batch_id=None):
+        """
+        Batch variant of record_view: add {(job_id, view_date): increment} to
+        job_views in one upsert per VIEW_FLUSH_CHUNK rows. Jobs that no longer
+        exist are skipped.
+
+        With a batch_id, the id is recorded in job_view_flushes in the same
+        transaction, and a batch that was already recorded is not written again.
+
+        Returns:
+            {(job_id, view_date): new view_count} for the rows written, or
+            None if batch_id had already been written
+        """
+        if batch_id is not None:
+            # A concurrent writer of the same batch blocks here until it commits, then conflicts
+            recorded = db.session.execute(
+                insert(JobViewFlush).values(batch_id=batch_id, flushed_at=datetime.utcnow())
+                .on_conflict_do_nothing().returning(JobViewFlush.batch_id)
+            ).scalar()
+            if recorded is None:
+                db.session.rollback()
+                return None
+            db.session.execute(delete(JobViewFlush).where(
+                JobViewFlush.flushed_at < datetime.utcnow() - VIEW_FLUSH_BATCH_RETENTION
+            ))
+        job_ids = {job_id for job_id, _ in counts}
+        existing = set(db.session.scalars(select(JobPosting.id).where(JobPosting.id.in_(job_ids)))) if job_ids else set()
+        # Sorted so concurrent writers lock rows in the same order
+        rows = [
+            {'job_id': job_id, 'view_date': view_date, 'view_count': count}
+            for (job_id, view_date), count in sorted(counts.items())
+            if job_id in existing
+        ]
+        totals = {}
+        for start in range(0, len(rows), VIEW_FLUSH_CHUNK):
+            stmt = insert(JobView).values(rows[start:start + VIEW_FLUSH_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                constraint='_job_view_uc',
+                set_={'view_count': JobView.view_count + stmt.excluded.view_count}
+            ).returning(JobView.job_id, JobView.view_date, JobView.view_count)
+            for job_id, view_date, view_count in db.session.execute(stmt):
+                totals[(job_id, view_date)] = view_count
+        db.session.commit()
+        if totals:
+            invalidate_objects('jobs', *{job_id for job_id, _ in totals})
+        return totals
+
+    @staticmethod
+    def buffer_view(job_id, view_date=None, visitor=None):
+        """
+        Count a view without touching the database: increments the job/day
+        field of a Redis hash that flush_buffered_views writes to job_views,
+        and adds visitor (a user or IP token) to the job/day HyperLogLog of
+        unique viewers, in one round trip. Falls back to record_view and a
+        cached pure-Python sketch when Redis is unavailable.
+
+        A visitor's repeat views of the same job on the same day are dropped
+        (see is_first_view). Returns True if the view was counted.
+        """
+        view_date = view_date or date.today()
+        if visitor is not None and not JobViewService.is_first_view(job_id, view_date, visitor):
+            job_view_suppressed_counter.labels(reason='duplicate').inc()
+            return False
+        client = redis_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hincrby(redis_key(VIEW_BUFFER_KEY), f"{job_id}:{view_date.isoformat()}", 1)
+                if visitor is not None:
+                    key = redis_key(_unique_viewers_key(job_id, view_date))
+                    pipe.pfadd(key, visitor)
+                    pipe.expire(key, UNIQUE_VIEWERS_TTL)
+                pipe.execute()
+                return True
+            except Exception as e:
+                log.error("Cache backend error", error=str(e), job_id=job_id)
+        JobViewService.record_view(job_id, view_date)
+        if visitor is not None:
+            JobViewService._add_unique_viewer_locally(job_id, view_date, visitor)
+        return True
+
+    @staticmethod
+    def is_first_view(job_id, view_date, visitor):
+        """
+        Test-and-set visitor's view of a job on view_date against that day's
+        Bloom filter: a Redis bitmap set with one SETBIT per hash in a single
+        round trip, or an in-process filter when Redis is unavailable. Sized
+        by VIEW_DEDUPE_CAPACITY and VIEW_DEDUPE_ERROR_RATE; a false positive
+        drops a genuine first view, so there are no false negatives.
+        """
+        capacity = current_app.config['VIEW_DEDUPE_CAPACITY']
+        error_rate = current_app.config['VIEW_DEDUPE_ERROR_RATE']
+        member = f"{job_id}:{visitor}"
+        client = redis_client()
+        if client is not None:
+            try:
+                size, hashes = bloom_parameters(capacity, error_rate)
+                key = redis_key(_seen_views_key(view_date))
+                pipe = client.pipeline(transaction=False)
+                for position in bloom_positions(member, size, hashes):
+                    pipe.setbit(key, position, 1)
+                pipe.expire(key, SEEN_VIEWS_TTL)
+                previous = pipe.execute()[:-1]
+                return not all(previous)
+            except Exception as e:
+                log.error("Cache backend error", error=str(e), job_id=job_id)
+        with _local_seen_views_lock:
+            filters = current_app.extensions.setdefault('seen_job_views', {})
+            bloom = filters.get(view_date)
+            if bloom is None:
+                # Rotate: only the filters for this day and the one before are kept
+                for day in [day for day in filters if day < view_date - timedelta(days=1)]:
+                    del filters[day]
+                bloom = filters[view_date] = BloomFilter(capacity, error_rate)
+            return bloom.add(member)
+
+    @staticmethod
+    def _add_unique_viewer_locally(job_id, view_date, visitor):
+        key = _unique_viewers_key(job_id, view_date)
+        try:
+            data = cache.get(key)
+            sketch = HyperLogLog.from_bytes(data) if data else HyperLogLog()
+            if sketch.add(visitor):
+                cache.set(key, sketch.to_bytes(), timeout=UNIQUE_VIEWERS_TTL)
+        except Exception as e:
+            log.error("Cache backend error", error=str(e), job_id=job_id)
+
+    @staticmethod
+    def get_unique_viewers(job_ids, start, end):
+        """
+        Approximate unique viewers per job between start and end (inclusive),
+        merging the daily sketches. Returns {job_id: count}; empty if the
+        cache is unreachable.
+        """
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        job_ids = list(job_ids)
+        if not job_ids or not days:
+            return {}
+        client = redis_client()
+        try:
+            if client is not None:
+                pipe = client.pipeline(transaction=False)
+                for job_id in job_ids:
+                    # PFCOUNT over several keys counts their union
+                    pipe.pfcount(*[redis_key(_unique_viewers_key(job_id, day)) for day in days])
+                return dict(zip(job_ids, pipe.execute()))
+            uniques = {}
+            for job_id in job_ids:
+                sketch = HyperLogLog()
+                for data in cache.get_many(*[_unique_viewers_key(job_id, day) for day in days]):
+                    if data:
+                        sketch.merge(HyperLogLog.from_bytes(data))
+                uniques[job_id] = sketch.count()
+            return uniques
+        except Exception as e:
+            log.error("Cache backend error", error=str(e))
+            return {}
+
+    @staticmethod
+    def get_monthly_unique_viewers(year, month, job_ids):
+        start, end = _month_bounds(year, month)
+        return JobViewService.get_unique_viewers(job_ids, start, end - timedelta(days=1))
+
+    @staticmethod
+    def flush_buffered_views():
+        """
+        Write buffered view counts to job_views in one batched upsert.
+
+        The buffer hash is renamed aside before it is read, so views counted
+        during the flush land in a fresh buffer, and tagged with a batch id
+        that record_views stores with the upsert. The renamed hash is deleted
+        only after the upsert commits, and only if it still holds that batch;
+        if the flush fails, or the delete never happens, the next run picks it
+        up again and finds the batch already written instead of counting it
+        twice. Returns the number of views written.
+        """
+        client = redis_client()
+        token = acquire_lock(VIEW_FLUSH_LOCK, VIEW_FLUSH_LEASE) if client is not None else None
+        if not token:
+            return 0
+        flushing_key = redis_key(VIEW_FLUSHING_KEY)
+        try:
+            if not client.exists(flushing_key):
+                try:
+                    client.rename(redis_key(VIEW_BUFFER_KEY), flushing_key)
+                except ResponseError:
+                    return 0  # nothing buffered
+            # Set once per parked hash, so a retry of the same hash reuses the id
+            client.hsetnx(flushing_key, VIEW_BATCH_FIELD, uuid.uuid4().hex)
+            counts = {}
+            batch_id = None
+            for field, value in client.hgetall(flushing_key).items():
+                if field.decode() == VIEW_BATCH_FIELD:
+                    batch_id = value.decode()
+                    continue
+                job_id, view_date = field.decode().split(':')
+                counts[(int(job_id), date.fromisoformat(view_date))] = int(value)
+            written = JobViewService.record_views(counts, batch_id=batch_id)
+
+            if not extend_lock(VIEW_FLUSH_LOCK, token, VIEW_FLUSH_LEASE):
+                # Another worker took over after our lease ran out; the parked
+                # hash is its business now, and the batch id keeps it from
+                # being counted twice
+                log.warning("Lost the job view flush lock before cleanup", batch_id=batch_id)
+            else:
+                client.eval(DELETE_FLUSHED_BATCH_SCRIPT, 1, flushing_key, VIEW_BATCH_FIELD, batch_id)
+            if written is None:
+                log.warning("Skipped a job view batch that was already written", batch_id=batch_id)
+                return 0
+            return sum(counts[key] for key in written)
+        finally:
+            release_lock(VIEW_FLUSH_LOCK, token)
+
+    @staticmethod
+    def get_views_in_range(start, end):
+        """Total views per job for start <= view_date < end, as (job_id, total_views) rows."""
+        return db.session.query(
             JobView.job_id,
             func.sum(JobView.view_count).label('total_views')
         ).filter(
-            extract('year', JobView.view_date) == year,
-            extract('month', JobView.view_date) == month
+            JobView.view_date >= start,
+            JobView.view_date < end
         ).group_by(JobView.job_id).all()
-        return monthly_views
+
+    @staticmethod
+    def get_monthly_views(year, month):
+        """
+        Total views per job for a calendar month. Closed months are read from
+        the job_views_monthly rollup (one row per job); the current month, or a
+        closed month that has not been rolled up yet, is aggregated from
+        job_views over a half-open date range.
+        """
+        start, end = _month_bounds(year, month)
+        if end <= date.today():
+            rolled_up = db.session.query(
+                JobViewMonthly.job_id,
+                JobViewMonthly.view_count.label('total_views')
+            ).filter(JobViewMonthly.month == start).all()
+            if rolled_up:
+                return rolled_up
+        return JobViewService.get_views_in_range(start, end)
+
+    @staticmethod
+    def rollup_month(year, month):
+        """
+        Recompute the job_views_monthly rows for one month from job_views in a
+        single transaction. Idempotent. Returns the number of jobs rolled up.
+        """
+        start, end = _month_bounds(year, month)
+        totals = select(
+            JobView.job_id,
+            literal(start, type_=db.Date),
+            func.sum(JobView.view_count)
+        ).where(JobView.view_date >= start, JobView.view_date < end).group_by(JobView.job_id)
+        db.session.execute(delete(JobViewMonthly).where(JobViewMonthly.month == start))
+        result = db.session.execute(
+            insert(JobViewMonthly).from_select(['job_id', 'month', 'view_count'], totals)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _rolled_up_months(start, end):
+        """Months wholly inside [start, end) that have job_views_monthly rows."""
+        months = db.session.scalars(
+            select(JobViewMonthly.month).distinct()
+            .where(JobViewMonthly.month >= start, JobViewMonthly.month < end)
+        ).all()
+        return sorted(month for month in months if _month_bounds(month.year, month.month)[1] <= end)
+
+    @staticmethod
+    def _views_query(start, end, group, job_id=None):
+        """
+        Views over [start, end) grouped by 'job' or by a date_trunc bucket,
+        as (key, views) rows. For 'job' and 'month', rolled-up months are read
+        from job_views_monthly and only the remaining days from job_views.
+        """
+        def key(table, date_column):
+            if group == 'job':
+                return table.job_id.label('key')
+            return cast(func.date_trunc(group, date_column), db.Date).label('key')
+
+        # Monthly totals can't be split into days or weeks
+        months = JobViewService._rolled_up_months(start, end) if group in ('job', 'month') else []
+        raw = select(key(JobView, JobView.view_date), func.sum(JobView.view_count).label('views')).where(
+            JobView.view_date >= start, JobView.view_date < end
+        )
+        if months:
+            raw = raw.where(not_(or_(*[
+                and_(JobView.view_date >= month, JobView.view_date < _month_bounds(month.year, month.month)[1])
+                for month in months
+            ])))
+        if job_id is not None:
+            raw = raw.where(JobView.job_id == job_id)
+        parts = [raw.group_by('key')]
+        if months:
+            rolled = select(key(JobViewMonthly, JobViewMonthly.month), func.sum(JobViewMonthly.view_count).label('views')).where(
+                JobViewMonthly.month.in_(months)
+            )
+            if job_id is not None:
+                rolled = rolled.where(JobViewMonthly.job_id == job_id)
+            parts.append(rolled.group_by('key'))
+        combined = union_all(*parts).subquery()
+        return select(combined.c.key, func.sum(combined.c.views).label('views')).group_by(combined.c.key)
+
+    @staticmethod
+    def get_view_series(start, end, bucket='day', job_id=None):
+        """
+        Views per day, ISO week or month between start and end (inclusive),
+        for one job or all jobs, with empty buckets filled in as 0.
+
+        Totals of closed buckets lying wholly inside the range are cached and
+        never recomputed; only open and edge buckets reach the database, in a
+        single query.
+
+        Returns:
+            A list of (bucket_start, views) tuples
+
+        Raises:
+            ValueError: If bucket is unsupported, the range is reversed or it
+                spans more than MAX_SERIES_BUCKETS buckets
+        """
+        if bucket not in VIEW_BUCKETS:
+            raise ValueError(f"Invalid bucket: {bucket}. Valid buckets are: {list(VIEW_BUCKETS)}")
+        if start > end:
+            raise ValueError("from must not be after to")
+        stop = end + timedelta(days=1)
+        buckets = [_bucket_start(start, bucket)]
+        while _bucket_end(buckets[-1], bucket) < stop:
+            buckets.append(_bucket_end(buckets[-1], bucket))
+            if len(buckets) > MAX_SERIES_BUCKETS:
+                raise ValueError(f"Range spans more than {MAX_SERIES_BUCKETS} {bucket} buckets")
+
+        def cache_key(bucket_start):
+            return f"job_views:series:{job_id or 'all'}:{bucket}:{bucket_start.isoformat()}"
+
+        cacheable = [b for b in buckets if b >= start and _bucket_end(b, bucket) <= stop and _is_closed(_bucket_end(b, bucket))]
+        totals = {}
+        if cacheable:
+            try:
+                cached = cache.get_many(*[cache_key(b) for b in cacheable])
+                totals = {b: value for b, value in zip(cacheable, cached) if value is not None}
+            except Exception as e:
+                log.error("Cache backend error", error=str(e))
+
+        missing = [b for b in buckets if b not in totals]
+        if missing:
+            query = JobViewService._views_query(
+                max(start, missing[0]), min(stop, _bucket_end(missing[-1], bucket)), bucket, job_id
+            )
+            rows = dict(db.session.execute(query).all())
+            fresh = {b: int(rows.get(b, 0)) for b in missing}
+            totals.update(fresh)
+            closed = {cache_key(b): views for b, views in fresh.items() if b in cacheable}
+            if closed:
+                try:
+                    cache.set_many(closed, timeout=CLOSED_BUCKET_TTL)
+                except Exception as e:
+                    log.error("Cache backend error", error=str(e))
+        return [(b, totals[b]) for b in buckets]
+
+    @staticmethod
+    def get_top_jobs(start, end, limit):
+        """
+        The limit most viewed jobs between start and end (inclusive), as
+        (job_id, total_views) tuples, most viewed first. Results for ranges
+        that are entirely closed are cached.
+        """
+        if start > end:
+            raise ValueError("from must not be after to")
+        stop = end + timedelta(days=1)
+        key = f"job_views:top:{start.isoformat()}:{end.isoformat()}:{limit}"
+        closed = _is_closed(stop)
+        if closed:
+            try:
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                log.error("Cache backend error", error=str(e))
+
+        totals = JobViewService._views_query(start, stop, 'job').subquery()
+        rows = db.session.execute(
+            select(totals.c.key, totals.c.views).order_by(totals.c.views.desc(), totals.c.key).limit(limit)
+        ).all()
+        top = [(job_id, int(views)) for job_id, views in rows]
+        if closed:
+            try:
+                cache.set(key, top, timeout=CLOSED_BUCKET_TTL)
+            except Exception as e:
+                log.error("Cache backend error", error=str(e))
+        return top
+
+    @staticmethod
+    def refresh_conversion_funnel():
+        """
+        Recompute job_conversion_daily. CONCURRENTLY keeps the old contents
+        readable while the refresh runs, at the cost of a diff against them.
+        """
+        db.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY job_conversion_daily"))
+        db.session.commit()
+
+    @staticmethod
+    def get_conversion_funnel(start, end, limit, cursor=None, job_id=None):
+        """
+        Views, applications and conversion rate per job per day between start
+        and end (inclusive), newest day first, as of the last refresh.
+
+        Returns:
+            A (rows, next_cursor) tuple of JobConversionDaily rows; next_cursor
+            is None on the last page
+
+        Raises:
+            ValueError: If start is after end
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        if start > end:
+            raise ValueError("from must not be after to")
+        query = JobConversionDaily.query.filter(JobConversionDaily.day >= start, JobConversionDaily.day <= end)
+        if job_id is not None:
+            query = query.filter(JobConversionDaily.job_id == job_id)
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                day, last_job_id = date.fromisoformat(values[0]), int(values[1])
+            except (IndexError, TypeError, ValueError):
+                raise InvalidCursor("Invalid cursor")
+            query = query.filter(tuple_(JobConversionDaily.day, JobConversionDaily.job_id) < (day, last_job_id))
+        rows = query.order_by(JobConversionDaily.day.desc(), JobConversionDaily.job_id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].day.isoformat(), rows[-1].job_id)
+        return rows, next_cursor
@@ -0,0 +1,15 @@
+import structlog
+from flask import current_app
+from app.extensions import celery
+from app.services.job_archive_service import JobArchiveService
+
+log = structlog.get_logger()
+
+@celery.task
+def archive_expired_jobs_task():
+    archived = JobArchiveService.archive_expired_jobs(
+        current_app.config['JOB_ARCHIVE_RETENTION_DAYS'],
+        current_app.config['JOB_ARCHIVE_BATCH_SIZE']
+    )
+    log.info("Archived expired job postings", count=archived)
+    return archived
@@ -0,0 +1,12 @@
+import structlog
+from flask import current_app
+from app.extensions import celery
+from app.services.job_service import JobService
+
+log = structlog.get_logger()
+
+@celery.task
+def reconcile_job_counters_task():
+    repaired = JobService.reconcile_job_counters(current_app.config['JOB_COUNTER_RECONCILE_BATCH_SIZE'])
+    log.info("Reconciled job posting counters", repaired=repaired)
+    return repaired
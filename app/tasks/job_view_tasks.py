@@ -0,0 +1,47 @@
+import structlog
+from datetime import date, timedelta
+from celery.signals import worker_shutdown
+from flask import current_app
+from app.extensions import celery
+from app.services.job_view_service import JobViewService
+from app.services.job_view_partition_service import JobViewPartitionService
+
+log = structlog.get_logger()
+
+@celery.task
+def flush_job_views_task():
+    flushed = JobViewService.flush_buffered_views()
+    log.info("Flushed buffered job views", count=flushed)
+    return flushed
+
+@celery.task
+def rollup_job_views_task():
+    """
+    Roll up last month from job_views. Runs nightly, so views for the
+    previous month that are flushed late are folded in for a whole month.
+    """
+    last_month = date.today().replace(day=1) - timedelta(days=1)
+    jobs = JobViewService.rollup_month(last_month.year, last_month.month)
+    log.info("Rolled up monthly job views", month=f"{last_month:%Y-%m}", jobs=jobs)
+    return jobs
+
+@celery.task
+def maintain_job_view_partitions_task():
+    created = JobViewPartitionService.ensure_partitions(current_app.config['JOB_VIEWS_PARTITIONS_AHEAD'])
+    retention = current_app.config['JOB_VIEWS_RETENTION_MONTHS']
+    dropped = JobViewPartitionService.drop_expired_partitions(retention) if retention else []
+    log.info("Maintained job_views partitions", created=created, dropped=dropped)
+    return {'created': created, 'dropped': dropped}
+
+@celery.task
+def refresh_job_conversion_task():
+    JobViewService.refresh_conversion_funnel()
+    log.info("Refreshed job conversion funnel")
+
+@worker_shutdown.connect
+def drain_job_views(**kwargs):
+    """Flush whatever is still buffered so job_views is current while workers are down."""
+    try:
+        flush_job_views_task.apply()
+    except Exception as e:
+        log.error("Failed to drain buffered job views", error=str(e))
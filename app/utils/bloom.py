@@ -0,0 +1,51 @@
+import hashlib
+import math
+
+
+def bloom_parameters(capacity, error_rate):
+    """
+    Bit count and number of hash functions that keep the false-positive rate
+    at error_rate once capacity distinct values have been added.
+    """
+    if capacity < 1 or not 0 < error_rate < 1:
+        raise ValueError("capacity must be positive and error_rate between 0 and 1")
+    size = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    hashes = max(1, int(round(size / capacity * math.log(2))))
+    return size, hashes
+
+
+def bloom_positions(value, size, hashes):
+    """The bit offsets of value, by double hashing one blake2b digest."""
+    digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'big')
+    h2 = int.from_bytes(digest[8:], 'big') | 1
+    return [(h1 + i * h2) % size for i in range(hashes)]
+
+
+class BloomFilter:
+    """
+    Pure-Python Bloom filter, used to drop repeat views when the cache backend
+    is not Redis. Uses the same bit layout as the Redis bitmap filter in
+    JobViewService, so both answer identically for the same parameters.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size, self.hashes = bloom_parameters(capacity, error_rate)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, value):
+        """Add a value; returns True if it was not (probably) present before."""
+        added = False
+        for position in bloom_positions(value, self.size, self.hashes):
+            byte, mask = position >> 3, 0x80 >> (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        return added
+
+    def __contains__(self, value):
+        return all(self.bits[p >> 3] & (0x80 >> (p & 7)) for p in bloom_positions(value, self.size, self.hashes))
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
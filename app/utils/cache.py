@@ -0,0 +1,272 @@
+import gzip
+import hashlib
+import random
+import secrets
+import threading
+import time
+from functools import wraps
+import structlog
+from flask import Response, request, make_response, copy_current_request_context
+from app.extensions import cache
+from app.metrics import cache_hit_counter, cache_miss_counter, cache_invalidation_counter
+
+log = structlog.get_logger()
+
+
+def _generation_key(namespace):
+    return f"gen:{namespace}"
+
+
+def object_key(namespace, object_id):
+    return f"{namespace}:id:{object_id}"
+
+
+def get_generation(namespace):
+    """
+    Current generation of a namespace, or None if the cache is unreachable.
+
+    A missing counter is seeded from the clock in microseconds rather than 0,
+    so a flushed cache never hands out a generation that was used before.
+    """
+    key = _generation_key(namespace)
+    try:
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, int(time.time() * 1000000), timeout=0)
+            generation = cache.get(key)
+        return generation
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), namespace=namespace)
+        return None
+
+
+def namespaced_key(namespace, *parts):
+    """Build a key that is orphaned as soon as the namespace is invalidated."""
+    suffix = ':'.join(str(part) for part in parts)
+    return f"{namespace}:g{get_generation(namespace)}:{suffix}"
+
+
+def invalidate(namespace, *object_ids):
+    """
+    Invalidate everything cached under a namespace by bumping its generation,
+    and drop the per-id entries for the given objects.
+
+    Old generation keys are never deleted; they simply stop being read and
+    expire on their own timeout.
+    """
+    try:
+        get_generation(namespace)
+        cache.cache.inc(_generation_key(namespace))
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), namespace=namespace)
+    if object_ids:
+        invalidate_objects(namespace, *object_ids)
+    cache_invalidation_counter.labels(namespace=namespace).inc()
+
+
+def invalidate_objects(namespace, *object_ids):
+    """
+    Drop only the per-id entries for the given objects, leaving the
+    namespace's generation, and so its cached listings and their ETags, alone.
+    """
+    try:
+        cache.delete_many(*[object_key(namespace, object_id) for object_id in object_ids])
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), namespace=namespace)
+
+
+def _get(namespace, key, record=True):
+    try:
+        value = cache.get(key)
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), namespace=namespace)
+        value = None
+    if not record:
+        return value
+    if value is None:
+        cache_miss_counter.labels(namespace=namespace).inc()
+    else:
+        cache_hit_counter.labels(namespace=namespace).inc()
+    return value
+
+
+def _set(namespace, key, value, timeout):
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), namespace=namespace)
+
+
+def get_object(namespace, object_id, loader, timeout=None):
+    """
+    Return the cached value for a single object, calling loader() on a miss.
+    A None result from loader is not cached.
+    """
+    key = object_key(namespace, object_id)
+    value = _get(namespace, key)
+    if value is None:
+        value = loader()
+        if value is not None:
+            _set(namespace, key, value, timeout)
+    return value
+
+
+def prerender(rv):
+    """
+    Render a view's JSON response once into what a cache hit needs to send:
+    the gzipped body, a strong ETag and the uncompressed length.
+    """
+    response = make_response(rv)
+    body = response.get_data()
+    return {
+        'status': response.status_code,
+        'etag': '"%s"' % hashlib.sha1(body).hexdigest(),
+        'length': len(body),
+        'gzip': gzip.compress(body, compresslevel=6),
+    }
+
+
+def serve(entry):
+    """Build a response straight from a prerendered entry."""
+    headers = {'ETag': entry['etag'], 'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        body = entry['gzip']
+        headers['Content-Encoding'] = 'gzip'
+    else:
+        body = gzip.decompress(entry['gzip'])
+    headers['Content-Length'] = str(len(body))
+    return Response(body, status=entry['status'], mimetype='application/json', headers=headers)
+
+
+def _lock_key(key):
+    return f"lock:{key}"
+
+
+# Compare-and-delete / compare-and-expire, so a holder whose lease ran out
+# can't release or extend the lock another caller has taken since
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end
+return 0
+"""
+EXTEND_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('expire', KEYS[1], ARGV[2]) end
+return 0
+"""
+
+
+def redis_client():
+    """The Redis client behind the cache, or None for other cache backends."""
+    return getattr(cache.cache, '_write_client', None)
+
+
+def redis_key(key):
+    """A key as the cache backend stores it, for use with redis_client()."""
+    return f"{cache.cache._get_prefix()}{key}"
+
+
+def acquire_lock(key, lease):
+    """
+    Try to take a short-lived lock. Returns a random owner token for exactly
+    one caller until the lock is released or its lease expires, and None for
+    everyone else; the token is what release_lock and extend_lock check.
+    """
+    token = secrets.token_hex(16)
+    try:
+        client = redis_client()
+        if client is not None:
+            # SET NX EX in one round trip so a crashed holder can't leave the lock without a lease
+            return token if client.set(redis_key(_lock_key(key)), token, nx=True, ex=lease) else None
+        return token if cache.add(_lock_key(key), token, timeout=lease) else None
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), key=key)
+        return token
+
+
+def extend_lock(key, token, lease):
+    """Renew the lease if the lock is still ours; returns False once it has been lost."""
+    try:
+        client = redis_client()
+        if client is not None:
+            return bool(client.eval(EXTEND_LOCK_SCRIPT, 1, redis_key(_lock_key(key)), token, lease))
+        # Other backends have no atomic compare-and-set; this is best effort
+        return cache.get(_lock_key(key)) == token and bool(cache.set(_lock_key(key), token, timeout=lease))
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), key=key)
+        return False
+
+
+def release_lock(key, token):
+    """Release the lock only if it is still held with this token."""
+    try:
+        client = redis_client()
+        if client is not None:
+            return bool(client.eval(RELEASE_LOCK_SCRIPT, 1, redis_key(_lock_key(key)), token))
+        return cache.get(_lock_key(key)) == token and bool(cache.delete(_lock_key(key)))
+    except Exception as e:
+        log.error("Cache backend error", error=str(e), key=key)
+        return False
+
+
+def cached_view(namespace, timeout=60, stale_ttl=0, lock_lease=5, jitter=0.0, refresh_ahead=0):
+    """
+    Cache a view's successful responses under a namespace, keyed on the full
+    request path including the query string. Responses are stored prerendered
+    (see prerender) so a hit never touches marshmallow, jsonify or pickle of a
+    Response object.
+
+    Entries are fresh for timeout seconds (shortened by up to jitter * timeout
+    so workers don't expire together) and are then served stale for up to
+    stale_ttl more seconds. Recomputation is single-flight: only the caller
+    holding the Redis lock runs the view, in a background thread when a stale
+    value can be served meanwhile. With refresh_ahead, that refresh starts
+    refresh_ahead seconds before the entry goes stale. On a cold miss, callers
+    that lose the lock wait up to lock_lease seconds for the winner's result.
+    """
+    def decorator(f):
+        def compute_and_store(key, token, args, kwargs):
+            try:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                fresh_for = timeout * (1 - random.uniform(0, jitter))
+                entry = prerender(response)
+                entry['fresh_until'] = time.time() + fresh_for
+                _set(namespace, key, entry, int(fresh_for + stale_ttl) or 1)
+                return serve(entry)
+            finally:
+                release_lock(key, token)
+
+        def refresh_in_background(key, token, args, kwargs):
+            @copy_current_request_context
+            def refresh():
+                try:
+                    compute_and_store(key, token, args, kwargs)
+                except Exception as e:
+                    log.error("Background cache refresh failed", error=str(e), key=key)
+            threading.Thread(target=refresh, daemon=True).start()
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = namespaced_key(namespace, 'view', request.full_path)
+            entry = _get(namespace, key)
+
+            if entry is not None:
+                if time.time() >= entry['fresh_until'] - refresh_ahead:
+                    token = acquire_lock(key, lock_lease)
+                    if token:
+                        refresh_in_background(key, token, args, kwargs)
+                return serve(entry)
+
+            token = acquire_lock(key, lock_lease)
+            if token:
+                return compute_and_store(key, token, args, kwargs)
+
+            deadline = time.time() + lock_lease
+            while time.time() < deadline:
+                time.sleep(0.05)
+                entry = _get(namespace, key, record=False)
+                if entry is not None:
+                    return serve(entry)
+            return make_response(f(*args, **kwargs))
+        return decorated_function
+    return decorator
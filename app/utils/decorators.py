@@ -1,5 +1,7 @@
+import hashlib
+from datetime import datetime, timezone
 from functools import wraps
-from flask import current_app, abort, g
+from flask import current_app, abort, g, request, make_response, Response
 
 def rate_limit(limit_string):
     def decorator(f):
@@ -16,4 +18,46 @@ def admin_required(f):
         if not getattr(g, 'current_user', None) or g.current_user.role != 'admin':
             abort(403, description="Admin access required")
         return f(*args, **kwargs)
-    return decorated_function
\ No newline at end of file
+    return decorated_function
+
+def conditional_get(version_fn):
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before the view runs.
+
+    version_fn receives the view's arguments and returns a cheap version stamp
+    (a generation counter, an updated_at, ...) or None to skip straight to the
+    view, e.g. when the object does not exist. A datetime stamp also drives
+    Last-Modified. The strong ETag hashes the request path, the stamp and
+    whether gzip was accepted, since that selects a different representation.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            version = version_fn(*args, **kwargs)
+            if version is None:
+                return f(*args, **kwargs)
+
+            gzip_accepted = 'gzip' in request.headers.get('Accept-Encoding', '')
+            etag = hashlib.sha1(f"{request.full_path}|{version}|{gzip_accepted}".encode('utf-8')).hexdigest()
+            last_modified = None
+            if isinstance(version, datetime):
+                last_modified = version.replace(microsecond=0, tzinfo=version.tzinfo or timezone.utc)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                not_modified = bool(last_modified and request.if_modified_since
+                                    and last_modified <= request.if_modified_since)
+
+            if not_modified:
+                response = Response(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return decorated_function
+    return decorator
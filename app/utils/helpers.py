@@ -1,11 +1,24 @@
 
+from datetime import datetime, timezone
 from flask import jsonify
 
-def api_response(status_code, message, data=None):
+def api_response(status_code, message, data=None, meta=None):
     response = {
         "message": message,
         "data": data
     }
     if data is None:
         del response["data"]
+    if meta is not None:
+        response["meta"] = meta
     return jsonify(response), status_code
+
+def parse_datetime_arg(args, name):
+    """Parse an ISO 8601 query argument into a naive UTC datetime."""
+    try:
+        value = datetime.fromisoformat(args[name])
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 datetime")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+from flask import current_app
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    """Pack the sort key of the last row on a page into an opaque token."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Unpack a token produced by encode_cursor into its list of values."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_page_size(value):
+    """Return the requested page size clamped to the configured maximum."""
+    default = current_app.config['PAGINATION_DEFAULT_LIMIT']
+    maximum = current_app.config['PAGINATION_MAX_LIMIT']
+    if value is None:
+        return default
+    if value < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(value, maximum)
@@ -0,0 +1,74 @@
+"""
+Payload and fetch-time benchmark for GET /api/v1/jobs, view=full against
+view=summary.
+
+Reuses the synthetic dataset from benchmarks.job_search. For each view it walks
+--pages consecutive listing pages through JobService.get_jobs_page, timing the
+query plus ORM row fetch, and renders each page through the schema the resource
+uses to report response bytes (raw and gzipped).
+
+WARNING: seeding drops and recreates every table in DATABASE_URL. Point it at a
+scratch database, or pass --skip-seed to reuse an existing one.
+
+    DATABASE_URL=postgresql://.../recruitconnect_bench python -m benchmarks.job_listing --rows 200000
+"""
+import argparse
+import gzip
+import statistics
+import time
+
+from app import create_app, db
+from app.resources.job import jobs_schema, job_summaries_schema
+from app.services.job_service import JobService
+from app.utils.helpers import api_response
+from benchmarks.job_search import seed
+
+SCHEMAS = {'full': jobs_schema, 'summary': job_summaries_schema}
+
+
+def walk(view, pages, page_size):
+    fetch_ms, raw_bytes, gzip_bytes = [], [], []
+    cursor = None
+    for _ in range(pages):
+        started = time.perf_counter()
+        jobs, cursor = JobService.get_jobs_page(page_size, cursor, view=view)
+        fetch_ms.append((time.perf_counter() - started) * 1000)
+        body, _ = api_response(200, "Jobs retrieved", SCHEMAS[view].dump(jobs),
+                               meta={'limit': page_size, 'next_cursor': cursor})
+        payload = body.get_data()
+        raw_bytes.append(len(payload))
+        gzip_bytes.append(len(gzip.compress(payload, compresslevel=6)))
+        db.session.expunge_all()
+        if cursor is None:
+            break
+    db.session.rollback()
+    return fetch_ms, raw_bytes, gzip_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--skip-seed', action='store_true', help='Reuse the rows from a previous run')
+    args = parser.parse_args()
+
+    app = create_app('development')
+    with app.test_request_context():
+        if not args.skip_seed:
+            started = time.perf_counter()
+            seed(args.rows)
+            print(f"Seeded {args.rows} postings in {time.perf_counter() - started:.1f}s")
+
+        for view in ('full', 'summary'):  # warm the buffer cache
+            walk(view, args.pages, args.page_size)
+        print(f"pages={args.pages} page_size={args.page_size}")
+        print(f"{'view':8} {'p50 fetch (ms)':>15} {'mean fetch (ms)':>16} {'bytes/page':>11} {'gzip bytes/page':>16}")
+        for view in ('full', 'summary'):
+            fetch_ms, raw_bytes, gzip_bytes = walk(view, args.pages, args.page_size)
+            print(f"{view:8} {statistics.median(fetch_ms):15.2f} {statistics.mean(fetch_ms):16.2f} "
+                  f"{statistics.mean(raw_bytes):11.0f} {statistics.mean(gzip_bytes):16.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Latency benchmark for GET /api/v1/jobs/search.
+
+Seeds a synthetic job_postings table (1M rows by default) straight from SQL,
+then times JobService.search_jobs for a mix of one- and two-term queries and
+reports p50/p95/p99. Titles draw from a small role vocabulary; descriptions and
+requirements draw from VOCABULARY_SIZE skill tokens with a log-uniform
+distribution, so query terms range from very common to rare as in real data.
+
+WARNING: like seed.py this drops and recreates every table in DATABASE_URL.
+Point it at a scratch database.
+
+    DATABASE_URL=postgresql://.../recruitconnect_bench python -m benchmarks.job_search --rows 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app import create_app, db
+from app.models.user import User
+from app.services.job_service import JobService
+
+ROLES = [
+    'python', 'flask', 'django', 'postgres', 'redis', 'celery', 'react', 'golang',
+    'kubernetes', 'docker', 'aws', 'azure', 'terraform', 'java', 'kotlin', 'swift',
+    'accountant', 'auditor', 'nurse', 'teacher', 'designer', 'marketing', 'sales',
+    'analyst', 'engineer', 'developer', 'manager', 'intern', 'senior', 'junior',
+    'remote', 'hybrid', 'contract', 'fulltime', 'backend', 'frontend', 'mobile',
+    'data', 'machine', 'learning', 'security', 'network', 'support', 'finance',
+    'logistics', 'warehouse', 'driver', 'chef', 'writer', 'editor', 'legal',
+]
+VOCABULARY_SIZE = 50000
+LOCATIONS = ['Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Remote', 'Thika', 'Nyeri']
+
+
+def seed(rows):
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+    admin = User(email='bench-admin@example.com', first_name='Bench', last_name='Admin', role='admin')
+    admin.set_password('benchpass')
+    db.session.add(admin)
+    db.session.commit()
+
+    # The inner generate_series references g so Postgres re-evaluates it per row
+    db.session.execute(text("""
+        INSERT INTO job_postings (title, description, location, requirements, deadline, posted_at, admin_id)
+        SELECT
+            initcap(r[1 + floor(random() * array_length(r, 1))::int] || ' ' || r[1 + floor(random() * array_length(r, 1))::int]),
+            array_to_string(ARRAY(SELECT 'skill' || floor(exp(random() * ln(:vocab)))::int FROM generate_series(1, 40 + g % 20)), ' '),
+            l[1 + floor(random() * array_length(l, 1))::int],
+            array_to_string(ARRAY(SELECT 'skill' || floor(exp(random() * ln(:vocab)))::int FROM generate_series(1, 10 + g % 5)), ' '),
+            now() + (random() * 60 - 30) * interval '1 day',
+            now() - random() * interval '365 days',
+            :admin_id
+        FROM generate_series(1, :rows) AS g,
+             (SELECT CAST(:roles AS text[]) AS r, CAST(:locations AS text[]) AS l) AS words
+    """), {'rows': rows, 'admin_id': admin.id, 'roles': ROLES, 'locations': LOCATIONS, 'vocab': VOCABULARY_SIZE})
+    db.session.commit()
+    db.session.execute(text('ANALYZE job_postings'))
+    db.session.commit()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(queries, page_size):
+    timings = []
+    for _ in range(queries):
+        terms = [random.choice(ROLES)]
+        terms += ['skill%d' % int(VOCABULARY_SIZE ** random.random()) for _ in range(random.choice([0, 1]))]
+        started = time.perf_counter()
+        JobService.search_jobs(' '.join(terms), page_size)
+        timings.append((time.perf_counter() - started) * 1000)
+        db.session.rollback()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--skip-seed', action='store_true', help='Reuse the rows from a previous run')
+    args = parser.parse_args()
+
+    app = create_app('development')
+    with app.app_context():
+        if not args.skip_seed:
+            started = time.perf_counter()
+            seed(args.rows)
+            print(f"Seeded {args.rows} postings in {time.perf_counter() - started:.1f}s")
+
+        run(20, args.page_size)  # warm the buffer cache
+        timings = run(args.queries, args.page_size)
+        print(f"queries={len(timings)} page_size={args.page_size}")
+        print(f"p50={statistics.median(timings):.2f}ms p95={percentile(timings, 95):.2f}ms "
+              f"p99={percentile(timings, 99):.2f}ms max={max(timings):.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
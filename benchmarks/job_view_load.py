@@ -0,0 +1,90 @@
+"""
+Contention benchmark for GET /api/v1/jobs/<id> view counting.
+
+Runs --threads concurrent clients against the job detail view for one popular
+posting, first with views recorded synchronously (JobViewService.record_view:
+SELECT, UPDATE and COMMIT on the shared job/day row) and then buffered in Redis
+(JobViewService.buffer_view). Reports p50/p99 latency per mode. The detail view
+is called directly inside a request context so routing, auth and rate limiting
+are left out. Requires Redis at CACHE_REDIS_URL and at least one job posting in
+DATABASE_URL (e.g. from benchmarks.job_search).
+
+    DATABASE_URL=postgresql://... python -m benchmarks.job_view_load --threads 8 --requests 500
+"""
+import argparse
+import logging
+import statistics
+import threading
+import time
+from unittest.mock import patch
+
+from app import create_app, db
+from app.extensions import cache
+from app.models.job import JobPosting
+from app.resources.job import get_job
+from app.services.job_view_service import JobViewService
+from benchmarks.job_search import percentile
+
+
+def run(app, job_id, threads, requests):
+    timings, errors = [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def client():
+        samples, failed = [], 0
+        with app.test_request_context(f'/api/v1/jobs/{job_id}'):
+            barrier.wait()
+            for _ in range(requests):
+                started = time.perf_counter()
+                try:
+                    app.make_response(get_job(job_id))
+                except Exception:
+                    db.session.rollback()
+                    failed += 1
+                samples.append((time.perf_counter() - started) * 1000)
+            db.session.remove()
+        with lock:
+            timings.extend(samples)
+            errors.append(failed)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return timings, sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=500, help='Requests per thread')
+    args = parser.parse_args()
+
+    app = create_app('development')
+    logging.getLogger('flask_caching').setLevel(logging.WARNING)
+    with app.app_context():
+        cache.clear()
+        job_id = db.session.query(JobPosting.id).order_by(JobPosting.id).limit(1).scalar()
+        if job_id is None:
+            raise SystemExit('No job postings in DATABASE_URL; seed with benchmarks.job_search first')
+
+    print(f"threads={args.threads} requests/thread={args.requests} job_id={job_id}")
+    print(f"{'mode':10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'req/s':>8} {'errors':>7}")
+    for mode in ('sync', 'buffered'):
+        record = JobViewService.record_view if mode == 'sync' else JobViewService.buffer_view
+        with patch.object(JobViewService, 'buffer_view', record):
+            run(app, job_id, args.threads, 20)  # warm caches and the connection pool
+            started = time.perf_counter()
+            timings, errors = run(app, job_id, args.threads, args.requests)
+            elapsed = time.perf_counter() - started
+        print(f"{mode:10} {statistics.median(timings):9.2f} {percentile(timings, 99):9.2f} "
+              f"{max(timings):9.2f} {len(timings) / elapsed:8.0f} {errors:7d}")
+
+    with app.app_context():
+        JobViewService.flush_buffered_views()
+
+
+if __name__ == '__main__':
+    main()
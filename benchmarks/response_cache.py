@@ -0,0 +1,90 @@
+"""
+Cache-hit microbenchmark: flask-caching's @cache.cached (pickled Response
+objects) against app.utils.cache.cached_view (prerendered gzipped JSON).
+
+Both views render the same job listing payload through JobSchema and
+api_response. Only cache hits are timed, by calling the decorated views
+directly inside a request context so routing, auth and metrics hooks are left
+out. Requires Redis at CACHE_REDIS_URL; no job rows are read from the database.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.response_cache --jobs 500 --hits 2000
+"""
+import argparse
+import logging
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.extensions import cache
+from app.models.job import JobPosting
+from app.resources.job import jobs_schema
+from app.utils.cache import cached_view
+from app.utils.helpers import api_response
+
+
+def build_jobs(count):
+    now = datetime.utcnow()
+    return [
+        JobPosting(
+            id=i,
+            title=f"Backend Engineer {i}",
+            description="Build and operate the RecruitConnect API. " * 20,
+            location="Nairobi",
+            requirements="Python, Flask, PostgreSQL, Redis. " * 10,
+            deadline=now + timedelta(days=30),
+            posted_at=now - timedelta(minutes=i),
+            admin_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+def measure(app, view, path, hits, headers=None):
+    with app.test_request_context(path, headers=headers):
+        view()  # fill the cache
+        wall, cpu = [], []
+        for _ in range(hits):
+            started_wall, started_cpu = time.perf_counter(), time.process_time()
+            response = app.make_response(view())
+            wall.append((time.perf_counter() - started_wall) * 1e6)
+            cpu.append((time.process_time() - started_cpu) * 1e6)
+            assert response.status_code == 200
+    return statistics.median(wall), statistics.mean(cpu), len(response.get_data())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--hits', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_app('development')
+    logging.getLogger('flask_caching').setLevel(logging.WARNING)
+    jobs = build_jobs(args.jobs)
+
+    @cache.cached(timeout=600)
+    def legacy():
+        return api_response(200, "Jobs retrieved", jobs_schema.dump(jobs))
+
+    @cached_view('bench', timeout=600)
+    def prerendered():
+        return api_response(200, "Jobs retrieved", jobs_schema.dump(jobs))
+
+    with app.app_context():
+        cache.clear()
+
+    rows = [
+        ('cache.cached (pickled Response)', legacy, '/bench/legacy', None),
+        ('cached_view, identity', prerendered, '/bench/prerendered', None),
+        ('cached_view, gzip', prerendered, '/bench/prerendered', {'Accept-Encoding': 'gzip'}),
+    ]
+    print(f"jobs={args.jobs} hits={args.hits}")
+    print(f"{'path':34} {'p50 wall (us)':>14} {'mean cpu (us)':>14} {'bytes sent':>11}")
+    for label, view, path, headers in rows:
+        wall, cpu, size = measure(app, view, path, args.hits, headers)
+        print(f"{label:34} {wall:14.1f} {cpu:14.1f} {size:11d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Accuracy and cost benchmark for the per-day view dedupe filter
+(JobViewService.is_first_view).
+
+Adds --views distinct (job, visitor) pairs to a day's filter sized for
+--capacity at --error-rate, then looks up (without adding) --probes pairs that
+were never added and counts how many would be wrongly dropped as repeats. Runs against the Redis
+bitmap and the in-process fallback and reports the measured false-positive
+rate, memory per filter and test-and-set throughput. Requires Redis at
+CACHE_REDIS_URL; the database is not touched.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.view_dedupe --capacity 100000 --error-rate 0.001
+"""
+import argparse
+import logging
+import time
+from datetime import date
+from unittest.mock import patch
+
+from app import create_app
+from app.extensions import cache
+from app.services.job_view_service import JobViewService, _seen_views_key
+from app.utils.bloom import bloom_parameters, bloom_positions
+from app.utils.cache import redis_client, redis_key
+
+# A day no real traffic writes to
+BENCH_DAY = date(1999, 1, 1)
+
+
+def fill(views):
+    """Add distinct views through is_first_view; returns views per second."""
+    started = time.perf_counter()
+    for i in range(views):
+        JobViewService.is_first_view(i % 500, BENCH_DAY, f"ip:{i}")
+    return views / (time.perf_counter() - started)
+
+
+def false_positive_rate(contains, probes):
+    return sum(contains(f"{i % 500}:user:{i}") for i in range(probes)) / probes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--capacity', type=int, default=100000)
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--views', type=int, help='Distinct views added (default: --capacity)')
+    parser.add_argument('--probes', type=int, default=100000, help='Never-seen views probed for false positives')
+    args = parser.parse_args()
+    views = args.views or args.capacity
+
+    app = create_app('development')
+    app.config['VIEW_DEDUPE_CAPACITY'] = args.capacity
+    app.config['VIEW_DEDUPE_ERROR_RATE'] = args.error_rate
+    logging.getLogger('flask_caching').setLevel(logging.WARNING)
+
+    size, hashes = bloom_parameters(args.capacity, args.error_rate)
+    print(f"capacity={args.capacity} error_rate={args.error_rate} views={views} probes={args.probes} "
+          f"bits={size} ({size / 8 / 1024:.1f} KB) hashes={hashes}")
+    print(f"{'backend':10} {'fp rate':>9} {'memory (KB)':>12} {'views/s':>9}")
+    with app.app_context():
+        key = _seen_views_key(BENCH_DAY)
+        client = redis_client()
+        if client is None:
+            raise SystemExit('CACHE_REDIS_URL does not point at Redis')
+
+        cache.delete(key)
+        rate = fill(views)
+        bitmap = client.get(redis_key(key))
+
+        def in_bitmap(member):
+            return all(p >> 3 < len(bitmap) and bitmap[p >> 3] & (0x80 >> (p & 7))
+                       for p in bloom_positions(member, size, hashes))
+
+        fp_rate = false_positive_rate(in_bitmap, args.probes)
+        memory = client.memory_usage(redis_key(key)) or 0
+        cache.delete(key)
+        print(f"{'redis':10} {fp_rate:9.5f} {memory / 1024:12.1f} {rate:9.0f}")
+
+        with patch('app.services.job_view_service.redis_client', return_value=None):
+            rate = fill(views)
+        bloom = app.extensions['seen_job_views'][BENCH_DAY]
+        fp_rate = false_positive_rate(bloom.__contains__, args.probes)
+        print(f"{'local':10} {fp_rate:9.5f} {bloom.nbytes / 1024:12.1f} {rate:9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+import os
+from app import create_app
+from app.extensions import celery
+import app.tasks.email_tasks  # noqa: F401
+import app.tasks.archive_tasks  # noqa: F401
+import app.tasks.job_view_tasks  # noqa: F401
+import app.tasks.job_tasks  # noqa: F401
+
+flask_app = create_app(os.getenv('FLASK_CONFIG', 'production'))
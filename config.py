@@ -2,6 +2,8 @@
 from dotenv import load_dotenv 
 import os 
 from pathlib import Path
+from datetime import timedelta
+from celery.schedules import crontab
 
 load_dotenv() 
 
@@ -28,6 +30,49 @@ class Config:
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER')
     RATELIMIT_STORAGE_URL = os.getenv('RATELIMIT_STORAGE_URL', 'redis://localhost:6379/3')
+    # Proxies in front of the app whose X-Forwarded-For entry is trusted for the client IP
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', 20))
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', 100))
+    JOB_ARCHIVE_RETENTION_DAYS = int(os.getenv('JOB_ARCHIVE_RETENTION_DAYS', 90))
+    JOB_ARCHIVE_BATCH_SIZE = int(os.getenv('JOB_ARCHIVE_BATCH_SIZE', 500))
+    JOB_COUNTER_RECONCILE_BATCH_SIZE = int(os.getenv('JOB_COUNTER_RECONCILE_BATCH_SIZE', 1000))
+    JOB_VIEW_FLUSH_INTERVAL = int(os.getenv('JOB_VIEW_FLUSH_INTERVAL', 10))
+    JOB_VIEWS_PARTITIONS_AHEAD = int(os.getenv('JOB_VIEWS_PARTITIONS_AHEAD', 3))
+    JOB_VIEWS_RETENTION_MONTHS = int(os.getenv('JOB_VIEWS_RETENTION_MONTHS', 25))
+    VIEW_DEDUPE_CAPACITY = int(os.getenv('VIEW_DEDUPE_CAPACITY', 1000000))
+    VIEW_DEDUPE_ERROR_RATE = float(os.getenv('VIEW_DEDUPE_ERROR_RATE', 0.001))
+    VIEW_BOT_USER_AGENTS = [token.strip().lower() for token in os.getenv(
+        'VIEW_BOT_USER_AGENTS',
+        'bot,crawler,spider,slurp,curl,wget,python-requests,httpclient,scrapy,headlesschrome,facebookexternalhit'
+    ).split(',') if token.strip()]
+    JOB_CONVERSION_REFRESH_MINUTES = int(os.getenv('JOB_CONVERSION_REFRESH_MINUTES', 15))
+    CELERY_BEAT_SCHEDULE = {
+        'flush-job-views': {
+            'task': 'app.tasks.job_view_tasks.flush_job_views_task',
+            'schedule': timedelta(seconds=JOB_VIEW_FLUSH_INTERVAL),
+        },
+        'rollup-job-views': {
+            'task': 'app.tasks.job_view_tasks.rollup_job_views_task',
+            'schedule': crontab(hour=0, minute=30),
+        },
+        'maintain-job-view-partitions': {
+            'task': 'app.tasks.job_view_tasks.maintain_job_view_partitions_task',
+            'schedule': crontab(hour=0, minute=45),
+        },
+        'refresh-job-conversion': {
+            'task': 'app.tasks.job_view_tasks.refresh_job_conversion_task',
+            'schedule': timedelta(minutes=JOB_CONVERSION_REFRESH_MINUTES),
+        },
+        'reconcile-job-counters': {
+            'task': 'app.tasks.job_tasks.reconcile_job_counters_task',
+            'schedule': crontab(hour=4, minute=0),
+        },
+        'archive-expired-jobs': {
+            'task': 'app.tasks.archive_tasks.archive_expired_jobs_task',
+            'schedule': crontab(hour=3, minute=0),
+        },
+    }
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -45,6 +90,8 @@ class TestingConfig(Config):
         raise ValueError('No TEST_DATABASE_URL set for testing environment')
 
 class ProductionConfig(Config):
+    # Deployed behind the platform router (see Procfile)
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 1))
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     if not SQLALCHEMY_DATABASE_URI:
         raise ValueError('No DATABASE_URL set for production environment')
@@ -1,4 +1,5 @@
 import logging
+import re
 from logging.config import fileConfig
 
 from flask import current_app
@@ -51,6 +52,15 @@ def get_metadata():
     return target_db.metadata
 
 
+# job_views' monthly partitions are created and dropped at runtime by
+# JobViewPartitionService, so autogenerate must not try to drop them
+JOB_VIEW_PARTITION = re.compile(r'^job_views_(p\d{4}_\d{2}|default)$')
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == 'table' and reflected and JOB_VIEW_PARTITION.match(name))
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +75,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +104,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
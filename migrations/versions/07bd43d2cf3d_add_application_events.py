@@ -0,0 +1,74 @@
+"""Add application_events status history
+
+Revision ID: 07bd43d2cf3d
+Revises: e60457f9cd31
+Create Date: 2026-10-18 19:48:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '07bd43d2cf3d'
+down_revision = 'e60457f9cd31'
+branch_labels = None
+depends_on = None
+
+RECORD_APPLICATION_EVENTS_TRIGGERS = """
+    CREATE OR REPLACE FUNCTION applications_record_events() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO application_events (application_id, job_posting_id, from_status, to_status, occurred_at)
+            SELECT id, job_posting_id, NULL, status, applied_at FROM new_rows;
+        ELSE
+            INSERT INTO application_events (application_id, job_posting_id, from_status, to_status, occurred_at)
+            SELECT new_rows.id, new_rows.job_posting_id, old_rows.status, new_rows.status,
+                   statement_timestamp() AT TIME ZONE 'utc'
+            FROM new_rows JOIN old_rows USING (id)
+            WHERE new_rows.status IS DISTINCT FROM old_rows.status;
+        END IF;
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER applications_record_events_insert AFTER INSERT ON applications
+        REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION applications_record_events();
+    CREATE TRIGGER applications_record_events_update AFTER UPDATE ON applications
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION applications_record_events();
+"""
+
+
+def upgrade():
+    op.create_table('application_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('job_posting_id', sa.Integer(), nullable=False),
+    sa.Column('from_status', sa.String(length=32), nullable=True),
+    sa.Column('to_status', sa.String(length=32), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('application_events', schema=None) as batch_op:
+        batch_op.create_index('ix_application_events_application_id_occurred_at', ['application_id', 'occurred_at'], unique=False)
+        batch_op.create_index('ix_application_events_job_posting_id_occurred_at', ['job_posting_id', 'occurred_at'], unique=False)
+
+    # Earlier changes were never recorded: start each existing application's
+    # history with its current status as of when it was submitted
+    op.execute("""
+        INSERT INTO application_events (application_id, job_posting_id, from_status, to_status, occurred_at)
+        SELECT id, job_posting_id, NULL, status, applied_at FROM applications ORDER BY id
+    """)
+    op.execute(RECORD_APPLICATION_EVENTS_TRIGGERS)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER applications_record_events_update ON applications")
+    op.execute("DROP TRIGGER applications_record_events_insert ON applications")
+    op.execute("DROP FUNCTION applications_record_events()")
+
+    with op.batch_alter_table('application_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_application_events_job_posting_id_occurred_at')
+        batch_op.drop_index('ix_application_events_application_id_occurred_at')
+
+    op.drop_table('application_events')
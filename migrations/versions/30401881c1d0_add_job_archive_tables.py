@@ -0,0 +1,51 @@
+"""Add job_postings_archive and job_views_archive tables
+
+Revision ID: 30401881c1d0
+Revises: fcb25a6d4aca
+Create Date: 2026-10-18 12:48:09.553204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '30401881c1d0'
+down_revision = 'fcb25a6d4aca'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_postings_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('requirements', sa.Text(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('posted_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('admin_id', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+    sa.ForeignKeyConstraint(['admin_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('job_views_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('view_date', sa.Date(), nullable=False),
+    sa.Column('view_count', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['job_postings_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('job_views_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_job_views_archive_job_id'), ['job_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_views_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_views_archive_job_id'))
+
+    op.drop_table('job_views_archive')
+    op.drop_table('job_postings_archive')
@@ -0,0 +1,33 @@
+"""Add job_view_flushes to make buffered view flushes idempotent
+
+Revision ID: 438a6a033004
+Revises: 07bd43d2cf3d
+Create Date: 2026-10-18 21:05:44.310957
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '438a6a033004'
+down_revision = '07bd43d2cf3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_view_flushes',
+    sa.Column('batch_id', sa.String(length=32), nullable=False),
+    sa.Column('flushed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('batch_id')
+    )
+    with op.batch_alter_table('job_view_flushes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_job_view_flushes_flushed_at'), ['flushed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_view_flushes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_view_flushes_flushed_at'))
+
+    op.drop_table('job_view_flushes')
@@ -0,0 +1,122 @@
+"""Add applications_count, views_total and last_applied_at to job_postings
+
+Revision ID: 4d35e8bedc65
+Revises: b704dc6e88a9
+Create Date: 2026-10-18 18:02:51.227704
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d35e8bedc65'
+down_revision = 'b704dc6e88a9'
+branch_labels = None
+depends_on = None
+
+COUNT_APPLICATIONS_TRIGGERS = """
+    CREATE OR REPLACE FUNCTION job_postings_count_applications() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE job_postings
+            SET applications_count = applications_count + changed.n,
+                last_applied_at = GREATEST(job_postings.last_applied_at, changed.latest)
+            FROM (SELECT job_posting_id, count(*) AS n, max(applied_at) AS latest
+                  FROM new_rows GROUP BY job_posting_id) AS changed
+            WHERE job_postings.id = changed.job_posting_id;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE job_postings
+            SET applications_count = applications_count - changed.n,
+                last_applied_at = (SELECT max(applied_at) FROM applications WHERE job_posting_id = job_postings.id)
+            FROM (SELECT job_posting_id, count(*) AS n FROM old_rows GROUP BY job_posting_id) AS changed
+            WHERE job_postings.id = changed.job_posting_id;
+        ELSE
+            -- Only applications moved to another job change the counters
+            UPDATE job_postings
+            SET applications_count = applications_count + changed.n,
+                last_applied_at = (SELECT max(applied_at) FROM applications WHERE job_posting_id = job_postings.id)
+            FROM (SELECT job_posting_id, sum(n) AS n FROM (
+                      SELECT new_rows.job_posting_id, 1 AS n
+                      FROM new_rows JOIN old_rows USING (id) WHERE new_rows.job_posting_id <> old_rows.job_posting_id
+                      UNION ALL
+                      SELECT old_rows.job_posting_id, -1
+                      FROM new_rows JOIN old_rows USING (id) WHERE new_rows.job_posting_id <> old_rows.job_posting_id
+                  ) AS moves GROUP BY job_posting_id) AS changed
+            WHERE job_postings.id = changed.job_posting_id;
+        END IF;
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER applications_count_insert AFTER INSERT ON applications
+        REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_applications();
+    CREATE TRIGGER applications_count_update AFTER UPDATE ON applications
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_applications();
+    CREATE TRIGGER applications_count_delete AFTER DELETE ON applications
+        REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_applications();
+"""
+
+COUNT_VIEWS_TRIGGERS = """
+    CREATE OR REPLACE FUNCTION job_postings_count_views() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE job_postings SET views_total = views_total + changed.n
+            FROM (SELECT job_id, sum(coalesce(view_count, 0)) AS n FROM new_rows GROUP BY job_id) AS changed
+            WHERE job_postings.id = changed.job_id;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE job_postings SET views_total = views_total - changed.n
+            FROM (SELECT job_id, sum(coalesce(view_count, 0)) AS n FROM old_rows GROUP BY job_id) AS changed
+            WHERE job_postings.id = changed.job_id;
+        ELSE
+            UPDATE job_postings SET views_total = views_total + changed.n
+            FROM (SELECT new_rows.job_id, sum(coalesce(new_rows.view_count, 0) - coalesce(old_rows.view_count, 0)) AS n
+                  FROM new_rows JOIN old_rows USING (id, view_date) GROUP BY new_rows.job_id) AS changed
+            WHERE job_postings.id = changed.job_id AND changed.n <> 0;
+        END IF;
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER job_views_count_insert AFTER INSERT ON job_views
+        REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_views();
+    CREATE TRIGGER job_views_count_update AFTER UPDATE ON job_views
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_views();
+    CREATE TRIGGER job_views_count_delete AFTER DELETE ON job_views
+        REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION job_postings_count_views();
+"""
+
+
+def upgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('applications_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('views_total', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_applied_at', sa.DateTime(), nullable=True))
+
+    # Views of months whose partitions were already dropped only survive in the rollup
+    op.execute("""
+        UPDATE job_postings
+        SET applications_count = coalesce(a.n, 0),
+            last_applied_at = a.last_applied_at,
+            views_total = coalesce(v.n, 0) + coalesce(m.n, 0)
+        FROM job_postings j
+        LEFT JOIN (SELECT job_posting_id, count(*) AS n, max(applied_at) AS last_applied_at
+                   FROM applications GROUP BY job_posting_id) AS a ON a.job_posting_id = j.id
+        LEFT JOIN (SELECT job_id, sum(view_count) AS n FROM job_views GROUP BY job_id) AS v ON v.job_id = j.id
+        LEFT JOIN (SELECT job_id, sum(view_count) AS n FROM job_views_monthly
+                   WHERE month < coalesce((SELECT date_trunc('month', min(view_date))::date FROM job_views), 'infinity')
+                   GROUP BY job_id) AS m ON m.job_id = j.id
+        WHERE job_postings.id = j.id
+    """)
+    op.execute(COUNT_APPLICATIONS_TRIGGERS)
+    op.execute(COUNT_VIEWS_TRIGGERS)
+
+
+def downgrade():
+    for trigger in ('job_views_count_insert', 'job_views_count_update', 'job_views_count_delete'):
+        op.execute(f"DROP TRIGGER {trigger} ON job_views")
+    for trigger in ('applications_count_insert', 'applications_count_update', 'applications_count_delete'):
+        op.execute(f"DROP TRIGGER {trigger} ON applications")
+    op.execute("DROP FUNCTION job_postings_count_views()")
+    op.execute("DROP FUNCTION job_postings_count_applications()")
+
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_column('last_applied_at')
+        batch_op.drop_column('views_total')
+        batch_op.drop_column('applications_count')
@@ -0,0 +1,45 @@
+"""Add job_views view_date index and job_views_monthly rollup table
+
+Revision ID: 6fc82efa56a1
+Revises: 30401881c1d0
+Create Date: 2026-10-18 14:02:37.118640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6fc82efa56a1'
+down_revision = '30401881c1d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_views', schema=None) as batch_op:
+        batch_op.create_index('ix_job_views_view_date_job_id', ['view_date', 'job_id'], unique=False,
+                              postgresql_include=['view_count'])
+
+    op.create_table('job_views_monthly',
+    sa.Column('job_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('view_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('job_id', 'month')
+    )
+
+    # Backfill every closed month; the current one is read from job_views
+    op.execute("""
+        INSERT INTO job_views_monthly (job_id, month, view_count)
+        SELECT job_id, date_trunc('month', view_date)::date, sum(view_count)
+        FROM job_views
+        WHERE view_date < date_trunc('month', current_date)
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade():
+    op.drop_table('job_views_monthly')
+
+    with op.batch_alter_table('job_views', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_views_view_date_job_id')
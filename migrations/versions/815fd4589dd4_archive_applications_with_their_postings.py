@@ -0,0 +1,89 @@
+"""Archive applications, feedback and application_events with their postings
+
+Revision ID: 815fd4589dd4
+Revises: b5c4e8279bf3
+Create Date: 2026-10-18 22:05:41.318027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '815fd4589dd4'
+down_revision = 'b5c4e8279bf3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_postings_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('applications_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('views_total', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_applied_at', sa.DateTime(), nullable=True))
+
+    op.create_table('applications_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('applied_at', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('job_posting_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings_archive.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('applications_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_applications_archive_job_posting_id'), ['job_posting_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_applications_archive_user_id'), ['user_id'], unique=False)
+
+    op.create_table('feedback_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('job_application_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_application_id'], ['applications_archive.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('feedback_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_feedback_archive_job_application_id'), ['job_application_id'], unique=False)
+
+    op.create_table('application_events_archive',
+    sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('job_posting_id', sa.Integer(), nullable=False),
+    sa.Column('from_status', sa.String(length=32), nullable=True),
+    sa.Column('to_status', sa.String(length=32), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['applications_archive.id'], ),
+    sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('application_events_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_application_events_archive_application_id_occurred_at',
+                              ['application_id', 'occurred_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_application_events_archive_job_posting_id'), ['job_posting_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('application_events_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_application_events_archive_job_posting_id'))
+        batch_op.drop_index('ix_application_events_archive_application_id_occurred_at')
+
+    op.drop_table('application_events_archive')
+    with op.batch_alter_table('feedback_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_feedback_archive_job_application_id'))
+
+    op.drop_table('feedback_archive')
+    with op.batch_alter_table('applications_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_applications_archive_user_id'))
+        batch_op.drop_index(batch_op.f('ix_applications_archive_job_posting_id'))
+
+    op.drop_table('applications_archive')
+    with op.batch_alter_table('job_postings_archive', schema=None) as batch_op:
+        batch_op.drop_column('last_applied_at')
+        batch_op.drop_column('views_total')
+        batch_op.drop_column('applications_count')
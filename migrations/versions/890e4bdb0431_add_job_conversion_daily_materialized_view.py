@@ -0,0 +1,40 @@
+"""Add job_conversion_daily materialized view
+
+Revision ID: 890e4bdb0431
+Revises: 9620152243cc
+Create Date: 2026-10-18 16:08:12.402518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '890e4bdb0431'
+down_revision = '9620152243cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE MATERIALIZED VIEW job_conversion_daily AS
+        SELECT job_id,
+               day,
+               sum(views)::integer AS views,
+               sum(applications)::integer AS applications,
+               round(sum(applications)::numeric / nullif(sum(views), 0), 4) AS conversion_rate
+        FROM (
+            SELECT job_id, view_date AS day, view_count AS views, 0 AS applications FROM job_views
+            UNION ALL
+            SELECT job_posting_id, applied_at::date, 0, 1 FROM applications
+        ) AS events
+        GROUP BY job_id, day
+    """)
+    # The unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_job_conversion_daily_job_id_day ON job_conversion_daily (job_id, day)")
+    op.execute("CREATE INDEX ix_job_conversion_daily_day_job_id ON job_conversion_daily (day, job_id)")
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW job_conversion_daily")
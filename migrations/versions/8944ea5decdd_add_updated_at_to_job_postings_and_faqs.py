@@ -0,0 +1,36 @@
+"""Add updated_at to job_postings and faqs
+
+Revision ID: 8944ea5decdd
+Revises: 93124aaefa1a
+Create Date: 2026-10-18 11:26:52.640193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8944ea5decdd'
+down_revision = '93124aaefa1a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('faqs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows have not changed since they were created
+    op.execute("UPDATE job_postings SET updated_at = COALESCE(posted_at, now() AT TIME ZONE 'utc')")
+    op.execute("UPDATE faqs SET updated_at = COALESCE(created_at, now() AT TIME ZONE 'utc')")
+
+
+def downgrade():
+    with op.batch_alter_table('faqs', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,41 @@
+"""Add weighted search_vector column and GIN index to job_postings
+
+Revision ID: 93124aaefa1a
+Revises: b31fb285d327
+Create Date: 2026-10-18 10:03:17.284950
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '93124aaefa1a'
+down_revision = 'b31fb285d327'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(requirements, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+)
+
+
+def upgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True
+        ))
+        batch_op.create_index('ix_job_postings_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_search_vector', postgresql_using='gin')
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,94 @@
+"""Range-partition job_views by view_date into monthly partitions
+
+Revision ID: 9620152243cc
+Revises: 6fc82efa56a1
+Create Date: 2026-10-18 15:21:44.730915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9620152243cc'
+down_revision = '6fc82efa56a1'
+branch_labels = None
+depends_on = None
+
+# A partition for every month that has data, plus the current month and the
+# next three; afterwards the maintenance task keeps creating them
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month date;
+BEGIN
+    FOR month IN
+        SELECT DISTINCT date_trunc('month', view_date)::date FROM job_views_unpartitioned
+        UNION
+        SELECT generate_series(date_trunc('month', current_date), date_trunc('month', current_date) + interval '3 months', interval '1 month')::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF job_views FOR VALUES FROM (%L) TO (%L)',
+            'job_views_p' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+        );
+    END LOOP;
+END $$;
+"""
+
+
+def upgrade():
+    op.rename_table('job_views', 'job_views_unpartitioned')
+    op.execute("ALTER TABLE job_views_unpartitioned RENAME CONSTRAINT job_views_pkey TO job_views_unpartitioned_pkey")
+    op.execute("ALTER TABLE job_views_unpartitioned RENAME CONSTRAINT _job_view_uc TO _job_view_unpartitioned_uc")
+    op.execute("ALTER TABLE job_views_unpartitioned RENAME CONSTRAINT job_views_job_id_fkey TO job_views_unpartitioned_job_id_fkey")
+    op.execute("ALTER INDEX ix_job_views_view_date_job_id RENAME TO ix_job_views_unpartitioned_view_date_job_id")
+
+    # The primary key and unique constraint must include the partition key
+    op.execute("""
+        CREATE TABLE job_views (
+            id integer NOT NULL DEFAULT nextval('job_views_id_seq'),
+            job_id integer NOT NULL REFERENCES job_postings (id),
+            view_date date NOT NULL,
+            view_count integer,
+            CONSTRAINT job_views_pkey PRIMARY KEY (id, view_date),
+            CONSTRAINT _job_view_uc UNIQUE (job_id, view_date)
+        ) PARTITION BY RANGE (view_date)
+    """)
+    op.execute("ALTER SEQUENCE job_views_id_seq OWNED BY job_views.id")
+    op.execute("CREATE INDEX ix_job_views_view_date_job_id ON job_views (view_date, job_id) INCLUDE (view_count)")
+    op.execute("CREATE TABLE job_views_default PARTITION OF job_views DEFAULT")
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+    op.execute("""
+        INSERT INTO job_views (id, job_id, view_date, view_count)
+        SELECT id, job_id, view_date, view_count FROM job_views_unpartitioned
+    """)
+    op.drop_table('job_views_unpartitioned')
+
+
+def downgrade():
+    op.rename_table('job_views', 'job_views_partitioned')
+    op.execute("ALTER SEQUENCE job_views_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE job_views_partitioned RENAME CONSTRAINT job_views_pkey TO job_views_partitioned_pkey")
+    op.execute("ALTER TABLE job_views_partitioned RENAME CONSTRAINT _job_view_uc TO _job_view_partitioned_uc")
+    op.execute("ALTER INDEX ix_job_views_view_date_job_id RENAME TO ix_job_views_partitioned_view_date_job_id")
+
+    op.execute("""
+        CREATE TABLE job_views (
+            id integer NOT NULL DEFAULT nextval('job_views_id_seq'),
+            job_id integer NOT NULL,
+            view_date date NOT NULL,
+            view_count integer,
+            CONSTRAINT job_views_pkey PRIMARY KEY (id),
+            CONSTRAINT _job_view_uc UNIQUE (job_id, view_date),
+            CONSTRAINT job_views_job_id_fkey FOREIGN KEY (job_id) REFERENCES job_postings (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE job_views_id_seq OWNED BY job_views.id")
+    op.execute("CREATE INDEX ix_job_views_view_date_job_id ON job_views (view_date, job_id) INCLUDE (view_count)")
+    op.execute("""
+        INSERT INTO job_views (id, job_id, view_date, view_count)
+        SELECT id, job_id, view_date, view_count FROM job_views_partitioned
+    """)
+    # Drops every partition with it
+    op.drop_table('job_views_partitioned')
@@ -0,0 +1,41 @@
+"""Add unique constraint on applications (user_id, job_posting_id)
+
+Revision ID: 9c6de1e644fa
+Revises: 890e4bdb0431
+Create Date: 2026-10-18 16:52:09.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c6de1e644fa'
+down_revision = '890e4bdb0431'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest of any duplicate applications, moving their feedback to it
+    op.execute("""
+        WITH ranked AS (
+            SELECT id, min(id) OVER (PARTITION BY user_id, job_posting_id) AS keep_id FROM applications
+        )
+        UPDATE feedback SET job_application_id = ranked.keep_id
+        FROM ranked
+        WHERE feedback.job_application_id = ranked.id AND ranked.id <> ranked.keep_id
+    """)
+    op.execute("""
+        DELETE FROM applications a
+        USING applications b
+        WHERE a.user_id = b.user_id AND a.job_posting_id = b.job_posting_id AND a.id > b.id
+    """)
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_applications_user_id_job_posting_id', ['user_id', 'job_posting_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_applications_user_id_job_posting_id', type_='unique')
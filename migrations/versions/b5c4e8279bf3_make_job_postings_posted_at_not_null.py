@@ -0,0 +1,29 @@
+"""Make job_postings.posted_at NOT NULL
+
+Revision ID: b5c4e8279bf3
+Revises: 438a6a033004
+Create Date: 2026-10-18 21:32:18.604271
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5c4e8279bf3'
+down_revision = '438a6a033004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # posted_at is the listing's keyset column, and a NULL can't be encoded in a cursor
+    op.execute("UPDATE job_postings SET posted_at = COALESCE(updated_at, now() AT TIME ZONE 'utc') WHERE posted_at IS NULL")
+
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.alter_column('posted_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.alter_column('posted_at', existing_type=sa.DateTime(), nullable=True)
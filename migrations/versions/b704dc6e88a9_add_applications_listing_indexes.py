@@ -0,0 +1,36 @@
+"""Add applications listing indexes and make applied_at not null
+
+Revision ID: b704dc6e88a9
+Revises: 9c6de1e644fa
+Create Date: 2026-10-18 17:24:40.581962
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b704dc6e88a9'
+down_revision = '9c6de1e644fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination on (applied_at, id) can't step over NULLs
+    op.execute("UPDATE applications SET applied_at = now() AT TIME ZONE 'utc' WHERE applied_at IS NULL")
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.alter_column('applied_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_applications_applied_at_id', ['applied_at', 'id'], unique=False)
+        batch_op.create_index('ix_applications_job_posting_id_status_applied_at_id',
+                              ['job_posting_id', 'status', 'applied_at', 'id'], unique=False)
+        batch_op.create_index('ix_applications_user_id_applied_at_id', ['user_id', 'applied_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_user_id_applied_at_id')
+        batch_op.drop_index('ix_applications_job_posting_id_status_applied_at_id')
+        batch_op.drop_index('ix_applications_applied_at_id')
+        batch_op.alter_column('applied_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,26 @@
+"""Add version to applications for optimistic concurrency
+
+Revision ID: e60457f9cd31
+Revises: 4d35e8bedc65
+Create Date: 2026-10-18 19:14:06.518342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e60457f9cd31'
+down_revision = '4d35e8bedc65'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_column('version')
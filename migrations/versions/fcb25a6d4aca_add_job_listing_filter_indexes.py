@@ -0,0 +1,32 @@
+"""Add composite and partial indexes for job listing filters and sorts
+
+Revision ID: fcb25a6d4aca
+Revises: 8944ea5decdd
+Create Date: 2026-10-18 12:04:41.918372
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fcb25a6d4aca'
+down_revision = '8944ea5decdd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.create_index('ix_job_postings_location_posted_at_id', ['location', 'posted_at', 'id'], unique=False)
+        batch_op.create_index('ix_job_postings_admin_id_posted_at_id', ['admin_id', 'posted_at', 'id'], unique=False)
+        # Partial: sort=deadline never returns rows without a deadline
+        batch_op.create_index('ix_job_postings_deadline_id', ['deadline', 'id'], unique=False,
+                              postgresql_where=sa.text('deadline IS NOT NULL'))
+
+
+def downgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_deadline_id')
+        batch_op.drop_index('ix_job_postings_admin_id_posted_at_id')
+        batch_op.drop_index('ix_job_postings_location_posted_at_id')
@@ -2,6 +2,7 @@ import os
 import pytest
 import datetime
 from app import create_app, db
+from app.extensions import cache
 from sqlalchemy import create_engine
 from config import TestingConfig
 from app.models.application import Application
@@ -20,9 +21,10 @@ def app():
     # Enable rate limiting with higher limits for testing
     app.config['RATELIMIT_ENABLED'] = True
     
-    # Create all tables
+    # Create all tables and start from an empty cache
     with app.app_context():
         db.create_all()
+        cache.clear()
     
     yield app
     
@@ -2,12 +2,25 @@ import pytest
 from app.models.application import Application
 from app.models.user import User
 from app.models.job import JobPosting
+from app.services.auth_service import AuthService
 from tests.factories import create_user, create_job_posting, create_application
 
 @pytest.fixture
 def client(app):
     return app.test_client()
 
+@pytest.fixture
+def admin_auth_header(app, init_database):
+    with app.app_context():
+        access_token, _, _ = AuthService.login_user("recruiter@example.com", "password")
+        return {"Authorization": f"Bearer {access_token}"}
+
+@pytest.fixture
+def job_seeker_auth_header(app, init_database):
+    with app.app_context():
+        access_token, _, _ = AuthService.login_user("test1@example.com", "password")
+        return {"Authorization": f"Bearer {access_token}"}
+
 def test_create_application(app, client, init_database):
     with app.app_context():
         user = init_database.session.query(User).filter_by(email="test1@example.com").first()
@@ -60,6 +73,7 @@ def test_create_application_invalid_user_id(app, client, init_database):
         assert response.status_code == 400
         json_data = response.get_json()
         assert json_data['message'] == "Invalid data"
+        assert json_data['data'] == {'user_id': ['User not found']}
 
 def test_create_application_invalid_job_posting_id(app, client, init_database):
     with app.app_context():
@@ -73,6 +87,7 @@ def test_create_application_invalid_job_posting_id(app, client, init_database):
         assert response.status_code == 400
         json_data = response.get_json()
         assert json_data['message'] == "Invalid data"
+        assert json_data['data'] == {'job_posting_id': ['Job posting not found']}
 
 def test_create_duplicate_application(app, client, init_database):
     with app.app_context():
@@ -191,3 +206,157 @@ def test_list_applications(app, client, init_database):
         assert len(json_data['data']) == 2
         assert json_data['data'][0]['job_posting_id'] == job_posting.id
         assert json_data['data'][1]['job_posting_id'] == job_posting.id
+
+def test_list_applications_paginated_with_include(app, client, init_database, admin_auth_header,
+                                                  job_seeker_auth_header):
+    with app.app_context():
+        user1 = init_database.session.query(User).filter_by(email="test1@example.com").first()
+        user2 = init_database.session.query(User).filter_by(email="test2@example.com").first()
+        job_posting = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+        create_application(user1.id, job_posting.id)
+        create_application(user2.id, job_posting.id, status='accepted')
+
+        url = f'/api/v1/applications/?job_posting_id={job_posting.id}&limit=1&include=user,job_posting'
+        assert client.get(url).status_code == 403
+        assert client.get(url, headers=job_seeker_auth_header).status_code == 403
+        response = client.get(url, headers=admin_auth_header)
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert len(json_data['data']) == 1
+        assert json_data['data'][0]['user']['email'] == "test2@example.com"
+        assert 'password_hash' not in json_data['data'][0]['user']
+        assert json_data['data'][0]['job_posting']['title'] == "Test Job 1"
+        assert json_data['meta']['limit'] == 1
+
+        response = client.get(f"/api/v1/applications/?job_posting_id={job_posting.id}&limit=1&cursor={json_data['meta']['next_cursor']}")
+        json_data = response.get_json()
+        assert [a['user_id'] for a in json_data['data']] == [user1.id]
+        assert 'user' not in json_data['data'][0] and 'job_posting' not in json_data['data'][0]
+        assert json_data['meta']['next_cursor'] is None
+
+        response = client.get(f'/api/v1/applications/?status=accepted&user_id={user1.id}')
+        assert response.get_json()['data'] == []
+
+        assert client.get('/api/v1/applications/?include=feedback').status_code == 400
+        assert client.get('/api/v1/applications/?applied_after=yesterday').status_code == 400
+        assert client.get('/api/v1/applications/?user_id=abc').status_code == 400
+
+def test_bulk_update_application_status(app, client, init_database, admin_auth_header, job_seeker_auth_header):
+    with app.app_context():
+        user1 = init_database.session.query(User).filter_by(email="test1@example.com").first()
+        user2 = init_database.session.query(User).filter_by(email="test2@example.com").first()
+        job_posting = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+        app1 = create_application(user1.id, job_posting.id)
+        app2 = create_application(user2.id, job_posting.id)
+
+        def bulk(body, headers=admin_auth_header):
+            return client.patch('/api/v1/applications/bulk', headers=headers, json=body)
+
+        updates = {'updates': [{'id': app1.id, 'status': 'rejected'}]}
+        assert bulk(updates, headers={}).status_code == 403
+        assert bulk(updates, headers=job_seeker_auth_header).status_code == 403
+
+        response = bulk({'updates': [
+            {'id': app1.id, 'status': 'rejected'},
+            {'id': app2.id, 'status': 'accepted'},
+            {'id': 9999, 'status': 'rejected'},
+        ]})
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert json_data['data'] == [
+            {'id': app1.id, 'status': 'rejected', 'outcome': 'updated'},
+            {'id': app2.id, 'status': 'accepted', 'outcome': 'updated'},
+            {'id': 9999, 'status': 'rejected', 'outcome': 'not_found'},
+        ]
+        assert json_data['meta'] == {'updated': 2, 'locked': 0, 'not_found': 1}
+
+        assert bulk({'updates': [{'id': app1.id, 'status': 'hired'}]}).status_code == 400
+        assert bulk({'updates': [{'id': app1.id}]}).status_code == 400
+        assert bulk({'updates': [
+            {'id': app1.id, 'status': 'rejected'}, {'id': app1.id, 'status': 'accepted'}
+        ]}).status_code == 400
+        assert bulk({
+            'updates': [{'id': app1.id, 'status': 'rejected'}], 'retries': -1
+        }).status_code == 400
+
+def test_update_application_status_if_match(app, client, init_database):
+    with app.app_context():
+        user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+        job_posting = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+        app_obj = create_application(user.id, job_posting.id)
+        url = f'/api/v1/applications/{app_obj.id}'
+
+        etag = client.get(url).headers['ETag']
+        assert etag == '"1"'
+
+        response = client.patch(url, json={'status': 'under_review'}, headers={'If-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] == '"2"'
+        assert response.get_json()['data']['version'] == 2
+
+        response = client.patch(url, json={'status': 'accepted'}, headers={'If-Match': etag})
+        assert response.status_code == 409
+        assert response.get_json()['message'] == f"Application {app_obj.id} is at version 2, not 1"
+
+        assert client.patch(url, json={'status': 'accepted'}, headers={'If-Match': 'W/"2"'}).status_code == 400
+        assert client.patch(url, json={'status': 'accepted'}, headers={'If-Match': '*'}).status_code == 200
+
+def test_get_application_timeline(app, client, init_database):
+    with app.app_context():
+        user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+        job_posting = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+        app_obj = create_application(user.id, job_posting.id)
+        client.patch(f'/api/v1/applications/{app_obj.id}', json={'status': 'under_review'})
+
+        response = client.get(f'/api/v1/applications/{app_obj.id}/events')
+        assert response.status_code == 200
+        events = response.get_json()['data']
+        assert [(e['from_status'], e['to_status']) for e in events] == [(None, 'submitted'), ('submitted', 'under_review')]
+        assert events[0]['left_at'] == events[1]['occurred_at'] and events[0]['seconds_in_stage'] >= 0
+        assert events[1]['left_at'] is None and events[1]['seconds_in_stage'] is None
+
+        assert client.get('/api/v1/applications/99999/events').status_code == 404
+
+def test_create_applications_batch(app, client, init_database, mock_celery_task):
+    with app.app_context():
+        user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+        job1 = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+        job2 = init_database.session.query(JobPosting).filter_by(title="Test Job 2").first()
+        create_application(user.id, job2.id)
+
+        response = client.post('/api/v1/applications/batch',
+                               json={'user_id': user.id, 'job_posting_ids': [job1.id, job2.id, 99999]})
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert [(r['job_posting_id'], r['outcome']) for r in json_data['data']] == [
+            (job1.id, 'created'), (job2.id, 'duplicate'), (99999, 'not_found')
+        ]
+        assert json_data['data'][0]['application']['status'] == 'submitted'
+        assert json_data['data'][1]['application'] is None
+        assert json_data['meta'] == {'created': 1, 'duplicate': 1, 'expired': 0, 'not_found': 1}
+        mock_celery_task.assert_called_once()
+
+        response = client.post('/api/v1/applications/batch', json={'user_id': 99999, 'job_posting_ids': [job1.id]})
+        assert response.status_code == 400
+        assert response.get_json()['data'] == {'user_id': ['User not found']}
+        assert client.post('/api/v1/applications/batch', json={'user_id': user.id, 'job_posting_ids': 'x'}).status_code == 400
+        assert client.post('/api/v1/applications/batch', json={'user_id': user.id, 'job_posting_ids': []}).status_code == 400
+
+def test_applying_changes_the_job_etags(app, client, init_database):
+    with app.app_context():
+        user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+        job_posting = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+        job_id = job_posting.id
+        detail = client.get(f'/api/v1/jobs/{job_id}')
+        listing = client.get('/api/v1/jobs/')
+        assert detail.get_json()['data']['applications_count'] == 0
+
+        response = client.post('/api/v1/applications/', json={'user_id': user.id, 'job_posting_id': job_id})
+        assert response.status_code == 201
+
+        response = client.get(f'/api/v1/jobs/{job_id}', headers={'If-None-Match': detail.headers['ETag']})
+        assert response.status_code == 200
+        assert response.get_json()['data']['applications_count'] == 1
+        response = client.get('/api/v1/jobs/', headers={'If-None-Match': listing.headers['ETag']})
+        assert response.status_code == 200
+        assert next(job for job in response.get_json()['data'] if job['id'] == job_id)['applications_count'] == 1
@@ -180,3 +180,16 @@ def test_delete_faq(client):
     assert json_data['message'] == "FAQ not found", f"Unexpected message: {json_data.get('message')}"
     
     print("=== test_delete_faq passed ===\n")
+
+def test_get_faqs_conditional(client):
+    client.post("/api/v1/faqs/", json={"question": "Conditional?", "answer": "Yes."})
+
+    first = client.get("/api/v1/faqs/")
+    etag = first.headers['ETag']
+    assert client.get("/api/v1/faqs/", headers={"If-None-Match": etag}).status_code == 304
+
+    # A write bumps the faqs generation, so the old ETag no longer matches
+    client.post("/api/v1/faqs/", json={"question": "Another?", "answer": "Sure."})
+    response = client.get("/api/v1/faqs/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 2
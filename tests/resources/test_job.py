@@ -1,5 +1,6 @@
 import pytest
 import json
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 from app import create_app
 from app.extensions import cache
@@ -118,18 +119,113 @@ def test_create_job_posting_non_admin(app, client, mock_job_service, job_seeker_
 
 def test_get_jobs_success(app, client, mock_job_service):
     with app.app_context():
-        mock_job_service.get_all_jobs.return_value = [
+        mock_job_service.get_jobs_page.return_value = ([
         {"id": 1, "title": "Job 1", "description": "Desc 1", "requirements": "Req 1", "location": "Loc 1", "admin_id": 1},
         {"id": 2, "title": "Job 2", "description": "Desc 2", "requirements": "Req 2", "location": "Loc 2", "admin_id": 2}
-    ]
+    ], "next-page-token")
     
-    response = client.get('/api/v1/jobs/')
+    response = client.get('/api/v1/jobs/?limit=2')
     
     assert response.status_code == 200
     assert response.json['message'] == "Jobs retrieved"
     assert len(response.json['data']) == 2
     assert response.json['data'][0]['title'] == "Job 1"
-    mock_job_service.get_all_jobs.assert_called_once()
+    assert response.json['meta'] == {"limit": 2, "next_cursor": "next-page-token"}
+    mock_job_service.get_jobs_page.assert_called_once_with(2, None, filters={}, sort='posted_at', view='summary')
+
+def test_get_jobs_limit_is_capped(app, client, mock_job_service):
+    mock_job_service.get_jobs_page.return_value = ([], None)
+
+    response = client.get('/api/v1/jobs/?limit=100000')
+
+    assert response.status_code == 200
+    assert response.json['meta']['limit'] == app.config['PAGINATION_MAX_LIMIT']
+    mock_job_service.get_jobs_page.assert_called_once_with(
+        app.config['PAGINATION_MAX_LIMIT'], None, filters={}, sort='posted_at', view='summary')
+
+def test_get_jobs_filters_and_sort(app, client, mock_job_service):
+    mock_job_service.get_jobs_page.return_value = ([], None)
+
+    response = client.get('/api/v1/jobs/?location=Nairobi&admin_id=3&posted_after=2025-01-01T00:00:00Z'
+                          '&posted_before=2025-02-01&deadline_open=true&sort=deadline')
+
+    assert response.status_code == 200
+    mock_job_service.get_jobs_page.assert_called_once_with(
+        app.config['PAGINATION_DEFAULT_LIMIT'], None,
+        filters={
+            'location': 'Nairobi',
+            'admin_id': 3,
+            'posted_after': datetime(2025, 1, 1),
+            'posted_before': datetime(2025, 2, 1),
+            'deadline_open': True,
+        },
+        sort='deadline',
+        view='summary'
+    )
+
+def test_get_jobs_etag_expires_with_the_cache_ttl(app, client, mock_job_service):
+    mock_job_service.get_jobs_page.return_value = ([], None)
+
+    with patch('app.resources.job.time') as mock_time:
+        mock_time.time.return_value = 1_800_000_000
+        first = client.get('/api/v1/jobs/?deadline_open=true')
+        assert client.get('/api/v1/jobs/?deadline_open=true',
+                          headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+        mock_time.time.return_value += 60
+        # Jobs may have expired and gained views since, although nothing was written
+        assert client.get('/api/v1/jobs/?deadline_open=true',
+                          headers={'If-None-Match': first.headers['ETag']}).status_code == 200
+
+def test_get_jobs_summary_is_default(app, client, mock_job_service):
+    job = {"id": 1, "title": "Job 1", "description": "Desc 1", "requirements": "Req 1", "location": "Loc 1", "admin_id": 1}
+    mock_job_service.get_jobs_page.return_value = ([job], None)
+
+    summary = client.get('/api/v1/jobs/')
+    full = client.get('/api/v1/jobs/?view=full')
+
+    assert summary.status_code == 200
+    assert 'description' not in summary.json['data'][0]
+    assert 'requirements' not in summary.json['data'][0]
+    assert summary.json['data'][0]['title'] == "Job 1"
+    assert full.json['data'][0]['description'] == "Desc 1"
+    assert mock_job_service.get_jobs_page.call_args_list[1].kwargs['view'] == 'full'
+
+def test_get_jobs_invalid_filter(app, client, mock_job_service):
+    response = client.get('/api/v1/jobs/?posted_after=yesterday')
+
+    assert response.status_code == 400
+    assert response.json['message'] == "posted_after must be an ISO 8601 datetime"
+    mock_job_service.get_jobs_page.assert_not_called()
+
+def test_get_jobs_invalid_cursor(app, client, mock_job_service):
+    from app.utils.pagination import InvalidCursor
+    mock_job_service.get_jobs_page.side_effect = InvalidCursor("Invalid cursor")
+
+    response = client.get('/api/v1/jobs/?cursor=garbage')
+
+    assert response.status_code == 400
+    assert response.json['message'] == "Invalid cursor"
+
+def test_search_jobs_success(app, client, mock_job_service):
+    mock_job_service.search_jobs.return_value = ([
+        {"job": {"id": 1, "title": "Python Developer", "description": "Build APIs", "admin_id": 1},
+         "rank": 0.6, "snippet": "Build <mark>Python</mark> APIs"}
+    ], None)
+
+    response = client.get('/api/v1/jobs/search?q=python')
+
+    assert response.status_code == 200
+    assert response.json['data'][0]['job']['title'] == "Python Developer"
+    assert response.json['data'][0]['snippet'] == "Build <mark>Python</mark> APIs"
+    assert response.json['meta']['next_cursor'] is None
+    mock_job_service.search_jobs.assert_called_once_with("python", app.config['PAGINATION_DEFAULT_LIMIT'], None)
+
+def test_search_jobs_requires_query(app, client, mock_job_service):
+    response = client.get('/api/v1/jobs/search')
+
+    assert response.status_code == 400
+    assert response.json['message'] == "Query parameter 'q' is required"
+    mock_job_service.search_jobs.assert_not_called()
 
 def test_get_job_success(app, client, mock_job_service):
     with app.app_context():
@@ -142,14 +238,14 @@ def test_get_job_success(app, client, mock_job_service):
         "admin_id": 1
     }
     
-    with patch('app.resources.job.JobViewService.record_view') as mock_record_view:
+    with patch('app.resources.job.JobViewService.buffer_view') as mock_buffer_view:
         response = client.get('/api/v1/jobs/1')
         
         assert response.status_code == 200
         assert response.json['message'] == "Job found"
         assert response.json['data']['title'] == "Software Engineer"
         mock_job_service.get_job_by_id.assert_called_once_with(1)
-        mock_record_view.assert_called_once_with(1)
+        mock_buffer_view.assert_called_once_with(1, visitor='ip:127.0.0.1')
 
 def test_get_job_not_found(app, client, mock_job_service):
     with app.app_context():
@@ -161,6 +257,22 @@ def test_get_job_not_found(app, client, mock_job_service):
     assert response.json['message'] == "Job not found"
     mock_job_service.get_job_by_id.assert_called_once_with(999)
 
+def test_get_job_include_archived(app, client, mock_job_service):
+    mock_job_service.get_job_by_id.return_value = None
+    archived = {"id": 7, "title": "Old Job", "description": "Desc", "admin_id": 1}
+
+    with patch('app.resources.job.JobArchiveService.get_archived_job', return_value=archived) as mock_archived, \
+            patch('app.resources.job.JobViewService.buffer_view') as mock_buffer_view:
+        hidden = client.get('/api/v1/jobs/7')
+        response = client.get('/api/v1/jobs/7?include_archived=true')
+
+    assert hidden.status_code == 404
+    assert response.status_code == 200
+    assert response.json['data']['title'] == "Old Job"
+    assert response.json['meta'] == {"archived": True}
+    mock_archived.assert_called_once_with(7)
+    mock_buffer_view.assert_not_called()
+
 def test_update_job_success(app, client, mock_job_service):
     with app.app_context():
         mock_job_service.update_job.return_value = {
@@ -223,3 +335,100 @@ def test_delete_job_not_found(app, client, mock_job_service):
     assert response.status_code == 404
     assert response.json['message'] == "Job not found"
     mock_job_service.delete_job.assert_called_once_with(999)
+
+def test_job_writes_invalidate_only_jobs_namespace(app, client, mock_job_service):
+    mock_job_service.update_job.return_value = {"id": 1, "title": "Updated Title", "description": "Desc", "admin_id": 1}
+    mock_job_service.delete_job.return_value = True
+
+    with patch('app.resources.job.invalidate') as mock_invalidate:
+        client.patch('/api/v1/jobs/1', data=json.dumps({"title": "Updated Title"}), content_type='application/json')
+        mock_invalidate.assert_called_once_with('jobs', 1)
+
+        mock_invalidate.reset_mock()
+        client.delete('/api/v1/jobs/1')
+        mock_invalidate.assert_called_once_with('jobs', 1)
+
+def test_get_job_served_from_object_cache(app, client, mock_job_service):
+    mock_job_service.get_job_by_id.return_value = {"id": 5, "title": "Cached Job", "description": "Desc", "admin_id": 1}
+
+    with patch('app.resources.job.JobViewService.buffer_view') as mock_buffer_view:
+        assert client.get('/api/v1/jobs/5').status_code == 200
+        response = client.get('/api/v1/jobs/5')
+
+    assert response.json['data']['title'] == "Cached Job"
+    mock_job_service.get_job_by_id.assert_called_once_with(5)
+    assert mock_buffer_view.call_count == 2
+
+def test_get_job_does_not_count_crawler_views(app, client, mock_job_service):
+    mock_job_service.get_job_by_id.return_value = {"id": 5, "title": "Job", "description": "Desc", "admin_id": 1}
+
+    with patch('app.resources.job.JobViewService.buffer_view') as mock_buffer_view:
+        response = client.get('/api/v1/jobs/5', headers={'User-Agent': 'Mozilla/5.0 (compatible; Googlebot/2.1)'})
+        client.get('/api/v1/jobs/5', headers={'User-Agent': 'curl/8.5.0'})
+        client.get('/api/v1/jobs/5', headers={'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0'})
+
+    assert response.status_code == 200
+    mock_buffer_view.assert_called_once_with(5, visitor='ip:127.0.0.1')
+
+def test_get_job_pipeline(app, client, admin_auth_header, job_seeker_auth_header):
+    from app.models.application import Application
+    from app.models.user import User
+    from app.extensions import db
+    from tests.factories import create_job_posting
+    with app.app_context():
+        admin = User.query.filter_by(email="admin@example.com").first()
+        seeker = User.query.filter_by(email="jobseeker@example.com").first()
+        job = create_job_posting("Pipeline Job", "Desc", "Loc", "Req", admin.id)
+        db.session.add(Application(user_id=seeker.id, job_posting_id=job.id, status='under_review'))
+        db.session.commit()
+        job_id = job.id
+
+    response = client.get(f'/api/v1/jobs/{job_id}/pipeline?include=user', headers=admin_auth_header)
+    assert response.status_code == 200
+    data = response.json['data']
+    assert data['total'] == 1 and data['counts']['under_review'] == 1
+    card = data['columns']['under_review']['applications'][0]
+    assert card['user']['email'] == "jobseeker@example.com" and 'job_posting' not in card
+    assert data['columns']['submitted'] == {'applications': [], 'next_cursor': None}
+
+    assert client.get(f'/api/v1/jobs/{job_id}/pipeline?status=hired', headers=admin_auth_header).status_code == 400
+    assert client.get('/api/v1/jobs/99999/pipeline', headers=admin_auth_header).status_code == 404
+    assert client.get(f'/api/v1/jobs/{job_id}/pipeline', headers=job_seeker_auth_header).status_code == 403
+
+def test_get_job_stage_durations(app, client, admin_auth_header, job_seeker_auth_header):
+    from app.models.application import Application
+    from app.models.user import User
+    from app.extensions import db
+    from tests.factories import create_job_posting
+    with app.app_context():
+        admin = User.query.filter_by(email="admin@example.com").first()
+        seeker = User.query.filter_by(email="jobseeker@example.com").first()
+        job = create_job_posting("Durations Job", "Desc", "Loc", "Req", admin.id)
+        db.session.add(Application(user_id=seeker.id, job_posting_id=job.id))
+        db.session.commit()
+        job_id = job.id
+
+    response = client.get(f'/api/v1/jobs/{job_id}/stage_durations', headers=admin_auth_header)
+    assert response.status_code == 200
+    assert response.json['data'] == [{
+        'status': 'submitted', 'entered': 1, 'current': 1, 'avg_seconds': None,
+        'median_seconds': None, 'p90_seconds': None, 'median_seconds_to_reach': 0.0,
+    }]
+    assert client.get('/api/v1/jobs/99999/stage_durations', headers=admin_auth_header).status_code == 404
+    assert client.get(f'/api/v1/jobs/{job_id}/stage_durations', headers=job_seeker_auth_header).status_code == 403
+
+def test_get_job_counts_anonymous_viewers_by_forwarded_ip(mock_job_service):
+    from config import TestingConfig
+    with patch.object(TestingConfig, 'TRUSTED_PROXY_HOPS', 1):
+        app = create_app('testing')
+    client = app.test_client()
+    mock_job_service.get_job_by_id.return_value = {"id": 5, "title": "Job", "description": "Desc", "admin_id": 1}
+
+    with patch('app.resources.job.JobViewService.buffer_view') as mock_buffer_view:
+        for forwarded in ('203.0.113.7', '198.51.100.23', '10.0.0.9, 203.0.113.7'):
+            assert client.get('/api/v1/jobs/5', headers={'X-Forwarded-For': forwarded}).status_code == 200
+
+    # Only the entry the trusted proxy appended counts, so a client can't pick its own IP
+    assert [c.kwargs['visitor'] for c in mock_buffer_view.call_args_list] == [
+        'ip:203.0.113.7', 'ip:198.51.100.23', 'ip:203.0.113.7'
+    ]
@@ -1,10 +1,12 @@
 import json
-from datetime import date
+from datetime import date, datetime
 from app.models.job_view import JobView
 from app.models.job import JobPosting
 from app.models.user import User
+from app.models.application import Application
+from app.services.job_view_service import JobViewService
 from app.extensions import db
-from tests.factories import create_user, create_job_posting
+from tests.factories import create_user, create_job_posting, create_application
 
 def test_get_monthly_job_views_admin_required(client, init_database):
     response = client.get('/api/v1/job_views/monthly?year=2023&month=1')
@@ -57,3 +59,105 @@ def test_get_monthly_job_views_as_admin(client, init_database):
         views_dict = {item['job_id']: item['total_views'] for item in json_data}
         assert views_dict[job1.id] == 5
         assert views_dict[job2.id] == 3
+
+def test_get_monthly_job_views_includes_unique_viewers(client, init_database):
+    from app.services.job_view_service import JobViewService
+    with client.application.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id)
+        job_id = job.id
+        today = date.today()
+        db.session.add(JobView(job_id=job_id, view_date=today, view_count=5))
+        db.session.commit()
+        for visitor in ("user:1", "user:1", "ip:10.0.0.1"):
+            JobViewService.buffer_view(job_id, visitor=visitor)
+
+        login_response = client.post('/api/v1/auth/login', json={
+            "email": admin_user.email,
+            "password": "password123"
+        })
+        admin_token = login_response.get_json()['data']['access_token']
+
+        response = client.get(f'/api/v1/job_views/monthly?year={today.year}&month={today.month}', headers={
+            "Authorization": f"Bearer {admin_token}"
+        })
+        assert response.status_code == 200
+        assert response.get_json()['data'] == [{'job_id': job_id, 'total_views': 5, 'unique_viewers': 2}]
+
+def _admin_headers(client):
+    admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+    login_response = client.post('/api/v1/auth/login', json={
+        "email": admin_user.email,
+        "password": "password123"
+    })
+    return admin_user, {"Authorization": f"Bearer {login_response.get_json()['data']['access_token']}"}
+
+def test_get_job_view_series(client, init_database):
+    with client.application.app_context():
+        admin_user, headers = _admin_headers(client)
+        job = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id)
+        db.session.add(JobView(job_id=job.id, view_date=date(2025, 1, 2), view_count=3))
+        db.session.commit()
+
+        response = client.get(f'/api/v1/job_views/series?job_id={job.id}&from=2025-01-01&to=2025-01-03', headers=headers)
+
+        assert response.status_code == 200
+        assert response.get_json()['data'] == [
+            {'bucket': '2025-01-01', 'views': 0},
+            {'bucket': '2025-01-02', 'views': 3},
+            {'bucket': '2025-01-03', 'views': 0},
+        ]
+        assert response.get_json()['meta'] == {'job_id': job.id, 'from': '2025-01-01', 'to': '2025-01-03', 'bucket': 'day'}
+
+        assert client.get('/api/v1/job_views/series?from=yesterday', headers=headers).status_code == 400
+        assert client.get('/api/v1/job_views/series?bucket=hour', headers=headers).status_code == 400
+
+def test_get_top_viewed_jobs(client, init_database):
+    with client.application.app_context():
+        admin_user, headers = _admin_headers(client)
+        job1 = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id)
+        job2 = create_job_posting("Job 2", "Desc", "Loc", "Req", admin_user.id)
+        db.session.add(JobView(job_id=job1.id, view_date=date(2025, 1, 2), view_count=3))
+        db.session.add(JobView(job_id=job2.id, view_date=date(2025, 1, 3), view_count=5))
+        db.session.commit()
+
+        response = client.get('/api/v1/job_views/top?from=2025-01-01&to=2025-01-31&limit=1', headers=headers)
+
+        assert response.status_code == 200
+        assert response.get_json()['data'] == [{'job_id': job2.id, 'total_views': 5}]
+        assert response.get_json()['meta'] == {'from': '2025-01-01', 'to': '2025-01-31', 'limit': 1}
+        assert client.get('/api/v1/job_views/top?from=2025-02-01&to=2025-01-01', headers=headers).status_code == 400
+
+def test_job_view_analytics_admin_required(client, init_database):
+    assert client.get('/api/v1/job_views/series').status_code == 403
+    assert client.get('/api/v1/job_views/top').status_code == 403
+
+def test_get_job_conversion(client, init_database):
+    with client.application.app_context():
+        admin_user, headers = _admin_headers(client)
+        job = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id)
+        db.session.add(JobView(job_id=job.id, view_date=date(2025, 1, 2), view_count=4))
+        db.session.add(JobView(job_id=job.id, view_date=date(2025, 1, 3), view_count=2))
+        create_application(admin_user.id, job.id)
+        db.session.query(Application).update({'applied_at': datetime(2025, 1, 2, 10)})
+        db.session.commit()
+        JobViewService.refresh_conversion_funnel()
+
+        response = client.get(f'/api/v1/job_views/conversion?from=2025-01-01&to=2025-01-31&job_id={job.id}&limit=1',
+                              headers=headers)
+
+        assert response.status_code == 200
+        assert response.get_json()['data'] == [
+            {'job_id': job.id, 'day': '2025-01-03', 'views': 2, 'applications': 0, 'conversion_rate': 0.0}
+        ]
+        next_cursor = response.get_json()['meta']['next_cursor']
+        assert next_cursor
+
+        response = client.get(f'/api/v1/job_views/conversion?from=2025-01-01&to=2025-01-31&limit=1&cursor={next_cursor}',
+                              headers=headers)
+        assert response.get_json()['data'] == [
+            {'job_id': job.id, 'day': '2025-01-02', 'views': 4, 'applications': 1, 'conversion_rate': 0.25}
+        ]
+        assert response.get_json()['meta']['next_cursor'] is None
+        assert client.get('/api/v1/job_views/conversion?cursor=garbage', headers=headers).status_code == 400
+        assert client.get('/api/v1/job_views/conversion').status_code == 403
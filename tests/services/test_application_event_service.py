@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.application import Application
+from app.models.application_event import ApplicationEvent
+from app.models.job import JobPosting
+from app.models.user import User
+from app.services.application_event_service import ApplicationEventService
+from app.services.application_service import ApplicationService
+from werkzeug.exceptions import NotFound
+
+def _events(application_id):
+    return [(e.from_status, e.to_status) for e in
+            ApplicationEvent.query.filter_by(application_id=application_id).order_by(ApplicationEvent.id)]
+
+def test_status_changes_are_recorded(init_database):
+    user1 = User.query.filter_by(email="test1@example.com").first()
+    user2 = User.query.filter_by(email="test2@example.com").first()
+    job = JobPosting.query.filter_by(title="Test Job 1").first()
+    first = ApplicationService.create_application(user1.id, job.id)
+    second = ApplicationService.create_application(user2.id, job.id)
+    first_id, second_id = first.id, second.id
+
+    ApplicationService.update_application_status(first_id, 'under_review')
+    ApplicationService.bulk_update_status({first_id: 'accepted', second_id: 'submitted'})
+
+    # Rolled back with the change it belongs to
+    db.session.execute(db.update(Application).where(Application.id == second_id).values(status='rejected'))
+    db.session.rollback()
+
+    assert _events(first_id) == [(None, 'submitted'), ('submitted', 'under_review'), ('under_review', 'accepted')]
+    assert _events(second_id) == [(None, 'submitted')]
+    created = ApplicationEvent.query.filter_by(application_id=first_id, from_status=None).one()
+    assert created.occurred_at == first.applied_at and created.job_posting_id == job.id
+
+def _seed_history(job_id, user_ids):
+    t0 = datetime(2025, 1, 1, 9)
+    histories = [
+        [('submitted', t0), ('under_review', t0 + timedelta(hours=1)), ('accepted', t0 + timedelta(hours=3))],
+        [('submitted', t0), ('under_review', t0 + timedelta(hours=2))],
+    ]
+    application_ids = []
+    for user_id, history in zip(user_ids, histories):
+        application = Application(user_id=user_id, job_posting_id=job_id, status=history[-1][0], applied_at=t0)
+        db.session.add(application)
+        db.session.flush()
+        ApplicationEvent.query.filter_by(application_id=application.id).delete()
+        previous = None
+        for status, occurred_at in history:
+            db.session.add(ApplicationEvent(application_id=application.id, job_posting_id=job_id,
+                                            from_status=previous, to_status=status, occurred_at=occurred_at))
+            previous = status
+        application_ids.append(application.id)
+    db.session.commit()
+    return application_ids
+
+def test_get_timeline(init_database):
+    user1 = User.query.filter_by(email="test1@example.com").first()
+    user2 = User.query.filter_by(email="test2@example.com").first()
+    job = JobPosting.query.filter_by(title="Test Job 1").first()
+    hired_id, _ = _seed_history(job.id, [user1.id, user2.id])
+
+    timeline = ApplicationEventService.get_timeline(hired_id)
+    assert [(entry['event'].to_status, entry['seconds_in_stage']) for entry in timeline] == [
+        ('submitted', 3600.0), ('under_review', 7200.0), ('accepted', None)
+    ]
+    assert timeline[0]['left_at'] == timeline[1]['event'].occurred_at
+
+    with pytest.raises(NotFound):
+        ApplicationEventService.get_timeline(99999)
+
+def test_get_stage_durations(init_database):
+    user1 = User.query.filter_by(email="test1@example.com").first()
+    user2 = User.query.filter_by(email="test2@example.com").first()
+    job = JobPosting.query.filter_by(title="Test Job 1").first()
+    other_job = JobPosting.query.filter_by(title="Test Job 2").first()
+    _seed_history(job.id, [user1.id, user2.id])
+    ApplicationService.create_application(user1.id, other_job.id)
+
+    report = {row.status: row for row in ApplicationEventService.get_stage_durations(job.id)}
+    assert set(report) == {'submitted', 'under_review', 'accepted'}
+    submitted, under_review, accepted = report['submitted'], report['under_review'], report['accepted']
+    assert (submitted.entered, submitted.current) == (2, 0)
+    assert (submitted.avg_seconds, submitted.median_seconds, submitted.p90_seconds) == (5400, 5400, 6840)
+    assert (under_review.entered, under_review.current) == (2, 1)
+    assert (under_review.median_seconds, under_review.median_seconds_to_reach) == (7200, 5400)
+    assert (accepted.entered, accepted.current, accepted.avg_seconds) == (1, 1, None)
+    assert accepted.median_seconds_to_reach == 10800
+
+    assert ApplicationEventService.get_stage_durations(other_job.id)
+    with pytest.raises(NotFound):
+        ApplicationEventService.get_stage_durations(99999)
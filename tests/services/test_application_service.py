@@ -1,10 +1,16 @@
 import pytest
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
 from app.services.application_service import ApplicationService
 from app.models.application import Application
 from app.models.user import User
 from app.models.job import JobPosting
 from app import db
 from werkzeug.exceptions import NotFound
+from app.utils.pagination import InvalidCursor
 
 def test_create_application(init_database):
     user = init_database.session.query(User).filter_by(email="test1@example.com").first()
@@ -169,3 +175,336 @@ def test_get_applications_for_job(init_database):
 def test_get_applications_for_nonexistent_job(init_database):
     applications = ApplicationService.get_applications_for_job(99999)  # Non-existent job ID
     assert len(applications) == 0
+
+def test_create_application_is_a_single_statement(init_database):
+    user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+    job = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    user_id, job_id = user.id, job.id
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        application = ApplicationService.create_application(user_id, job_id)
+        # The returned row is usable without reloading it
+        assert (application.user_id, application.job_posting_id, application.status) == (user_id, job_id, "submitted")
+        assert application.applied_at is not None
+        duplicate = ApplicationService.create_application(user_id, job_id)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert duplicate is None
+    assert len(statements) == 2
+    assert all('ON CONFLICT (user_id, job_posting_id) DO NOTHING' in statement for statement in statements)
+
+def test_create_application_expired_job(init_database):
+    user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+    job = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    job.deadline = datetime.utcnow() - timedelta(days=1)
+    init_database.session.commit()
+
+    with pytest.raises(ValueError, match="expired"):
+        ApplicationService.create_application(user.id, job.id)
+    assert Application.query.count() == 0
+
+def test_concurrent_duplicate_applications(app, init_database):
+    user_id = init_database.session.query(User).filter_by(email="test1@example.com").first().id
+    job_id = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first().id
+    barrier = threading.Barrier(8)
+    results = []
+
+    def apply():
+        with app.app_context():
+            barrier.wait()
+            results.append(ApplicationService.create_application(user_id, job_id) is not None)
+            db.session.remove()
+
+    threads = [threading.Thread(target=apply) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False] * 7 + [True]
+    assert Application.query.filter_by(user_id=user_id, job_posting_id=job_id).count() == 1
+
+def test_applications_are_unique_per_user_and_job(init_database):
+    user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+    job = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    init_database.session.add(Application(user_id=user.id, job_posting_id=job.id))
+    init_database.session.add(Application(user_id=user.id, job_posting_id=job.id))
+    with pytest.raises(IntegrityError):
+        init_database.session.commit()
+    init_database.session.rollback()
+
+def _seed_applications(init_database):
+    user1 = init_database.session.query(User).filter_by(email="test1@example.com").first()
+    user2 = init_database.session.query(User).filter_by(email="test2@example.com").first()
+    job1 = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    job2 = init_database.session.query(JobPosting).filter_by(title="Test Job 2").first()
+    base = datetime(2025, 1, 1)
+    rows = [
+        (user1.id, job1.id, 'submitted', base),
+        (user2.id, job1.id, 'accepted', base + timedelta(days=1)),
+        (user1.id, job2.id, 'submitted', base + timedelta(days=2)),
+        (user2.id, job2.id, 'submitted', base + timedelta(days=2)),
+    ]
+    init_database.session.add_all([
+        Application(user_id=user_id, job_posting_id=job_id, status=status, applied_at=applied_at)
+        for user_id, job_id, status, applied_at in rows
+    ])
+    init_database.session.commit()
+    return user1.id, user2.id, job1.id, job2.id
+
+def test_get_applications_page_filters_combine(init_database):
+    user1_id, user2_id, job1_id, job2_id = _seed_applications(init_database)
+
+    def page(**filters):
+        applications, _ = ApplicationService.get_applications_page(10, filters=filters)
+        return [(a.user_id, a.job_posting_id) for a in applications]
+
+    assert page() == [(user2_id, job2_id), (user1_id, job2_id), (user2_id, job1_id), (user1_id, job1_id)]
+    assert page(user_id=user1_id) == [(user1_id, job2_id), (user1_id, job1_id)]
+    assert page(job_posting_id=job1_id, status='accepted') == [(user2_id, job1_id)]
+    assert page(user_id=user1_id, applied_after=datetime(2025, 1, 2)) == [(user1_id, job2_id)]
+    with pytest.raises(ValueError):
+        page(status='hired')
+
+def test_get_applications_page_cursor(init_database):
+    _seed_applications(init_database)
+
+    seen, cursor = [], None
+    while True:
+        applications, cursor = ApplicationService.get_applications_page(3, cursor)
+        seen.extend(a.id for a in applications)
+        if cursor is None:
+            break
+    assert len(seen) == 4 and len(set(seen)) == 4
+    with pytest.raises(InvalidCursor):
+        ApplicationService.get_applications_page(3, 'garbage')
+    with pytest.raises(ValueError):
+        ApplicationService.get_applications_page(3, include=['feedback'])
+
+def test_get_applications_page_include_avoids_lazy_loads(init_database):
+    _seed_applications(init_database)
+    init_database.session.expunge_all()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        applications, _ = ApplicationService.get_applications_page(10, include=['user', 'job_posting'])
+        loaded = [(a.user.email, a.job_posting.title) for a in applications]
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(loaded) == 4
+    # The page with its users joined, then the distinct jobs in one IN query
+    assert len(statements) == 2
+
+def test_applications_listing_uses_indexes(init_database):
+    job_id = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first().id
+    user_id = init_database.session.query(User).filter_by(email="test1@example.com").first().id
+    init_database.session.execute(text("""
+        INSERT INTO users (email, password_hash, first_name, last_name, role)
+        SELECT 'seeker' || g || '@test.com', 'x', 'Job', 'Seeker', 'job_seeker' FROM generate_series(1, 5000) AS g
+    """))
+    init_database.session.execute(text("""
+        INSERT INTO applications (user_id, job_posting_id, status, applied_at)
+        SELECT u.id, j.id, (ARRAY['submitted', 'under_review', 'accepted', 'rejected'])[1 + u.id % 4],
+               now() - (u.id % 365) * interval '1 day'
+        FROM users u CROSS JOIN job_postings j WHERE u.email LIKE 'seeker%'
+    """))
+    init_database.session.commit()
+    init_database.session.execute(text('ANALYZE applications'))
+    init_database.session.commit()
+
+    def plan_nodes(node):
+        yield node
+        for child in node.get('Plans', []):
+            yield from plan_nodes(child)
+
+    connection = db.session.connection().connection
+    expected = [
+        ({}, 'ix_applications_applied_at_id'),
+        ({'user_id': user_id}, 'ix_applications_user_id_applied_at_id'),
+        ({'job_posting_id': job_id, 'status': 'accepted'}, 'ix_applications_job_posting_id_status_applied_at_id'),
+    ]
+    for filters, index in expected:
+        compiled = ApplicationService.build_applications_query(filters).limit(21).statement.compile(dialect=db.engine.dialect)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            plan = cursor.fetchone()[0][0]['Plan']
+        scans = [(n['Node Type'], n.get('Index Name')) for n in plan_nodes(plan)]
+        assert ('Seq Scan', None) not in scans, (filters, scans)
+        assert index in [name for _, name in scans], (filters, scans)
+
+def test_bulk_update_status(init_database):
+    user1_id, user2_id, job1_id, job2_id = _seed_applications(init_database)
+    ids = [a.id for a in Application.query.order_by(Application.id)]
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        outcomes = ApplicationService.bulk_update_status({ids[0]: 'rejected', ids[1]: 'under_review', 99999: 'rejected'})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert outcomes == {ids[0]: 'updated', ids[1]: 'updated', 99999: 'not_found'}
+    assert len(statements) == 1
+    assert {a.id: a.status for a in Application.query} == {
+        ids[0]: 'rejected', ids[1]: 'under_review', ids[2]: 'submitted', ids[3]: 'submitted'
+    }
+    with pytest.raises(ValueError):
+        ApplicationService.bulk_update_status({ids[0]: 'hired'})
+    with pytest.raises(ValueError):
+        ApplicationService.bulk_update_status({})
+
+def test_bulk_update_status_skips_locked_rows(app, init_database):
+    _seed_applications(init_database)
+    ids = [a.id for a in Application.query.order_by(Application.id)]
+
+    holder = db.engine.connect()
+    transaction = holder.begin()
+    holder.execute(text("SELECT id FROM applications WHERE id = :id FOR UPDATE"), {'id': ids[0]})
+    try:
+        outcomes = ApplicationService.bulk_update_status({ids[0]: 'rejected', ids[1]: 'rejected'})
+        assert outcomes == {ids[0]: 'locked', ids[1]: 'updated'}
+
+        # Released while the retries are waiting
+        threading.Timer(0.15, transaction.rollback).start()
+        outcomes = ApplicationService.bulk_update_status({ids[0]: 'rejected'}, retries=5, retry_delay=0.1)
+        assert outcomes == {ids[0]: 'updated'}
+    finally:
+        if transaction.is_active:
+            transaction.rollback()
+        holder.close()
+    assert db.session.get(Application, ids[0]).status == 'rejected'
+
+def test_get_pipeline(init_database):
+    from tests.factories import create_user
+    job = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    empty_job = init_database.session.query(JobPosting).filter_by(title="Test Job 2").first()
+    job_id, empty_job_id = job.id, empty_job.id
+    base = datetime(2025, 1, 1)
+    statuses = ['submitted', 'submitted', 'submitted', 'accepted', 'rejected', 'under_review']
+    for i, status in enumerate(statuses):
+        user = create_user(f"pipeline{i}@example.com", "password", "Pipe", f"Line{i}")
+        init_database.session.add(Application(user_id=user.id, job_posting_id=job_id, status=status,
+                                              applied_at=base + timedelta(days=i)))
+    init_database.session.commit()
+    init_database.session.expunge_all()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        counts, columns = ApplicationService.get_pipeline(job_id, 2, include=['user'])
+        emails = [a.user.email for a in columns['submitted'][0]]
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(statements) == 2
+    assert counts == {'submitted': 3, 'under_review': 1, 'accepted': 1, 'rejected': 1, 'withdrawn': 0}
+    assert emails == ["pipeline2@example.com", "pipeline1@example.com"]
+    assert [len(columns[s][0]) for s in ('submitted', 'under_review', 'accepted', 'rejected', 'withdrawn')] == [2, 1, 1, 1, 0]
+    assert columns['accepted'][1] is None
+    cursor = columns['submitted'][1]
+    assert cursor is not None
+
+    counts, columns = ApplicationService.get_pipeline(job_id, 2, status='submitted', cursor=cursor)
+    assert list(columns) == ['submitted']
+    applications, next_cursor = columns['submitted']
+    assert [a.applied_at for a in applications] == [base] and next_cursor is None
+
+    counts, columns = ApplicationService.get_pipeline(empty_job_id, 2)
+    assert set(counts.values()) == {0} and all(page == ([], None) for page in columns.values())
+
+    with pytest.raises(NotFound):
+        ApplicationService.get_pipeline(99999, 2)
+    with pytest.raises(ValueError):
+        ApplicationService.get_pipeline(job_id, 2, cursor=cursor)
+    with pytest.raises(ValueError):
+        ApplicationService.get_pipeline(job_id, 2, status='hired')
+
+def test_update_application_status_is_optimistic(app, init_database):
+    from werkzeug.exceptions import Conflict
+    user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+    job = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    application = ApplicationService.create_application(user.id, job.id)
+    application_id = application.id
+    assert application.version == 1
+
+    assert ApplicationService.update_application_status(application_id, 'under_review', expected_version=1).version == 2
+    with pytest.raises(Conflict):
+        ApplicationService.update_application_status(application_id, 'accepted', expected_version=1)
+
+    # A bulk update is a write too, so it invalidates versions read before it
+    ApplicationService.bulk_update_status({application_id: 'accepted'})
+    with pytest.raises(Conflict):
+        ApplicationService.update_application_status(application_id, 'rejected', expected_version=2)
+
+    # A write that commits while this one is in flight wins; this one fails instead of waiting on a lock
+    results = []
+    def slow_update():
+        with app.app_context():
+            try:
+                results.append(ApplicationService.update_application_status(
+                    application_id, 'rejected', simulate_delay=True).status)
+            except Conflict:
+                results.append('conflict')
+    thread = threading.Thread(target=slow_update)
+    thread.start()
+    time.sleep(0.2)
+    assert ApplicationService.update_application_status(application_id, 'withdrawn').version == 4
+    thread.join()
+    assert results == ['conflict']
+    db.session.expire_all()
+    assert db.session.get(Application, application_id).status == 'withdrawn'
+
+def test_create_applications_batch(init_database, mock_celery_task):
+    user = init_database.session.query(User).filter_by(email="test1@example.com").first()
+    job1 = init_database.session.query(JobPosting).filter_by(title="Test Job 1").first()
+    job2 = init_database.session.query(JobPosting).filter_by(title="Test Job 2").first()
+    expired = JobPosting(title="Closed Job", description="Closed", admin_id=job1.admin_id,
+                         deadline=datetime.utcnow() - timedelta(days=1))
+    init_database.session.add(expired)
+    init_database.session.commit()
+    user_id, job1_id, job2_id, expired_id = user.id, job1.id, job2.id, expired.id
+    ApplicationService.create_application(user_id, job2_id)
+    mock_celery_task.reset_mock()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        results = ApplicationService.create_applications(user_id, [job1_id, job2_id, expired_id, 99999, job1_id])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(statements) == 2
+    assert 'ANY' in statements[0]
+    assert {job_id: outcome for job_id, (outcome, _) in results.items()} == {
+        job1_id: 'created', job2_id: 'duplicate', expired_id: 'expired', 99999: 'not_found'
+    }
+    created = results[job1_id][1]
+    assert created.id is not None and created.user_id == user_id and created.version == 1
+    assert init_database.session.query(Application).filter_by(user_id=user_id).count() == 2
+
+    mock_celery_task.assert_called_once()
+    assert mock_celery_task.call_args.kwargs['recipients'] == ["test1@example.com"]
+    assert "- Test Job 1" in mock_celery_task.call_args.kwargs['body']
+
+    # Nothing new to confirm, nothing sent
+    mock_celery_task.reset_mock()
+    results = ApplicationService.create_applications(user_id, [job1_id])
+    assert results == {job1_id: ('duplicate', None)}
+    mock_celery_task.assert_not_called()
+
+    with pytest.raises(NotFound):
+        ApplicationService.create_applications(99999, [job1_id])
+    with pytest.raises(ValueError):
+        ApplicationService.create_applications(user_id, [])
+    with pytest.raises(ValueError):
+        ApplicationService.create_applications(user_id, list(range(1, 102)))
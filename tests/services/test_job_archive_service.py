@@ -0,0 +1,92 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from app.services.job_archive_service import JobArchiveService
+from app.models.job import JobPosting
+from app.models.job_view import JobView
+from app.models.job_archive import (
+    ArchivedJobPosting, ArchivedJobView, ArchivedApplication, ArchivedFeedback, ArchivedApplicationEvent
+)
+from app.models.application import Application
+from app.models.application_event import ApplicationEvent
+from app.models.feedback import Feedback
+from app.extensions import db
+from tests.factories import create_user, create_job_posting, create_application
+
+def test_archive_expired_jobs_moves_postings_and_views(app):
+    with app.app_context():
+        admin = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        now = datetime.utcnow()
+        expired = [
+            create_job_posting(f"Expired {i}", "Desc", "Loc", "Req", admin.id, deadline=now - timedelta(days=100 + i))
+            for i in range(3)
+        ]
+        recent = create_job_posting("Recently closed", "Desc", "Loc", "Req", admin.id, deadline=now - timedelta(days=10))
+        db.session.add(JobView(job_id=expired[0].id, view_date=date(2025, 1, 1), view_count=4))
+        db.session.add(JobView(job_id=expired[0].id, view_date=date(2025, 1, 2), view_count=2))
+        db.session.add(JobView(job_id=recent.id, view_date=date(2025, 1, 1), view_count=1))
+        db.session.commit()
+        expired_ids = sorted(job.id for job in expired)
+        first_id, recent_id = expired[0].id, recent.id
+
+        with patch('app.services.job_archive_service.invalidate') as mock_invalidate:
+            archived = JobArchiveService.archive_expired_jobs(90, batch_size=2)
+
+        assert archived == 3
+        # Two batches: one full, one short
+        assert [c.args for c in mock_invalidate.call_args_list] == [
+            ('jobs', *expired_ids[:2]), ('jobs', *expired_ids[2:])
+        ]
+        db.session.expire_all()
+        remaining = {job.id for job in JobPosting.query.all()}
+        assert remaining == {recent_id}
+        assert JobView.query.count() == 1
+
+        cold = ArchivedJobPosting.query.order_by(ArchivedJobPosting.id).all()
+        assert [job.id for job in cold] == expired_ids
+        assert all(job.archived_at is not None for job in cold)
+        assert JobArchiveService.get_archived_job(first_id).title == "Expired 0"
+        views = ArchivedJobView.query.filter_by(job_id=first_id).all()
+        assert sorted(view.view_count for view in views) == [2, 4]
+
+        assert JobArchiveService.archive_expired_jobs(90) == 0
+
+def test_archive_expired_jobs_moves_applications(app):
+    with app.app_context():
+        admin = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        seeker = create_user("seeker@example.com", "password123", "Job", "Seeker", "job_seeker")
+        other = create_user("other@example.com", "password123", "Other", "Seeker", "job_seeker")
+        now = datetime.utcnow()
+        applied = create_job_posting("Has applications", "Desc", "Loc", "Req", admin.id, deadline=now - timedelta(days=200))
+        open_job = create_job_posting("Still open", "Desc", "Loc", "Req", admin.id)
+        application = create_application(seeker.id, applied.id)
+        create_application(other.id, applied.id)
+        kept = create_application(seeker.id, open_job.id)
+        application.status = 'rejected'
+        db.session.add(Feedback(user_id=admin.id, job_application_id=application.id, rating=2, comment="Not a fit"))
+        db.session.commit()
+        applied_id, application_id, kept_id, seeker_id = applied.id, application.id, kept.id, seeker.id
+
+        with patch('app.services.job_archive_service.invalidate'):
+            assert JobArchiveService.archive_expired_jobs(90) == 1
+
+        db.session.expire_all()
+        assert [a.id for a in Application.query.all()] == [kept_id]
+        assert Feedback.query.count() == 0
+        assert {event.application_id for event in ApplicationEvent.query.all()} == {kept_id}
+
+        job = JobArchiveService.get_archived_job(applied_id)
+        assert job.applications_count == 2
+        assert len(job.applications) == 2
+        cold = db.session.get(ArchivedApplication, application_id)
+        assert (cold.user_id, cold.status, cold.version) == (seeker_id, 'rejected', 2)
+        assert [(f.rating, f.comment) for f in cold.feedback] == [(2, "Not a fit")]
+        assert ArchivedFeedback.query.count() == 1
+        events = ArchivedApplicationEvent.query.filter_by(application_id=application_id).order_by(
+            ArchivedApplicationEvent.occurred_at, ArchivedApplicationEvent.id
+        ).all()
+        assert [(e.from_status, e.to_status) for e in events] == [(None, 'submitted'), ('submitted', 'rejected')]
+        assert {e.job_posting_id for e in events} == {applied_id}
+
+def test_get_archived_job_missing(app):
+    with app.app_context():
+        assert JobArchiveService.get_archived_job(12345) is None
@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import text
 from app.services.job_service import JobService
 from app.models.job import JobPosting
 from app.models.user import User
@@ -173,4 +174,314 @@ class TestJobService:
             # Assertions
             assert len(jobs) == 2
             assert any(job.title == "Job 1" for job in jobs)
-            assert any(job.title == "Job 2" for job in jobs)
\ No newline at end of file
+            assert any(job.title == "Job 2" for job in jobs)
+    def test_get_jobs_page_walks_all_jobs_newest_first(self, init_database):
+        """Test keyset pagination returns every job exactly once, newest first"""
+        with self.app.app_context():
+            JobPosting.query.delete()
+
+            admin = User(email="admin6@test.com", first_name="Admin6")
+            admin.set_password("adminpass")
+            db.session.add(admin)
+            db.session.commit()
+
+            # Two jobs share a posted_at so the id tie-breaker is exercised
+            base = datetime(2025, 1, 1, 12, 0, 0)
+            posted = [base, base, base + timedelta(hours=1), base + timedelta(hours=2), base + timedelta(hours=3)]
+            for i, posted_at in enumerate(posted):
+                db.session.add(JobPosting(
+                    title=f"Job {i}",
+                    description="Description",
+                    admin_id=admin.id,
+                    posted_at=posted_at
+                ))
+            db.session.commit()
+
+            seen = []
+            cursor = None
+            pages = 0
+            while True:
+                jobs, cursor = JobService.get_jobs_page(2, cursor)
+                seen.extend(jobs)
+                pages += 1
+                if cursor is None:
+                    break
+
+            assert pages == 3
+            assert len({job.id for job in seen}) == 5
+            keys = [(job.posted_at, job.id) for job in seen]
+            assert keys == sorted(keys, reverse=True)
+
+    def test_get_jobs_page_invalid_cursor(self, init_database):
+        """Test that a garbage cursor is rejected"""
+        from app.utils.pagination import InvalidCursor
+        with self.app.app_context():
+            with pytest.raises(InvalidCursor):
+                JobService.get_jobs_page(10, "not-a-cursor")
+
+    def test_search_jobs_ranks_title_matches_first(self, init_database):
+        """Test full-text search ranking, snippets and paging"""
+        with self.app.app_context():
+            JobPosting.query.delete()
+
+            admin = User(email="admin7@test.com", first_name="Admin7")
+            admin.set_password("adminpass")
+            db.session.add(admin)
+            db.session.commit()
+
+            title_match = JobPosting(title="Python Developer", description="Build APIs", admin_id=admin.id)
+            body_match = JobPosting(title="Backend Engineer", description="Work with Python and Flask", admin_id=admin.id)
+            no_match = JobPosting(title="Accountant", description="Ledgers and audits", admin_id=admin.id)
+            db.session.add_all([title_match, body_match, no_match])
+            db.session.commit()
+
+            results, cursor = JobService.search_jobs("python", 1)
+            assert [r['job'].id for r in results] == [title_match.id]
+            assert cursor is not None
+
+            results, cursor = JobService.search_jobs("python", 1, cursor)
+            assert [r['job'].id for r in results] == [body_match.id]
+            assert "<mark>Python</mark>" in results[0]['snippet']
+            assert cursor is None
+
+    def test_get_jobs_page_filters_and_deadline_sort(self, init_database):
+        """Test filters are applied in SQL and sort=deadline pages soonest first"""
+        with self.app.app_context():
+            JobPosting.query.delete()
+
+            admin = User(email="admin8@test.com", first_name="Admin8")
+            admin.set_password("adminpass")
+            db.session.add(admin)
+            db.session.commit()
+
+            now = datetime.utcnow()
+            base = datetime(2025, 1, 1)
+            for i in range(6):
+                db.session.add(JobPosting(
+                    title=f"Nairobi {i}", description="Description", location="Nairobi", admin_id=admin.id,
+                    posted_at=base + timedelta(days=i),
+                    deadline=now + timedelta(days=10 - i) if i != 5 else None
+                ))
+            db.session.add(JobPosting(title="Closed", description="Description", location="Nairobi",
+                                      admin_id=admin.id, posted_at=base, deadline=now - timedelta(days=1)))
+            db.session.add(JobPosting(title="Mombasa", description="Description", location="Mombasa",
+                                      admin_id=admin.id, posted_at=base, deadline=now + timedelta(days=1)))
+            db.session.commit()
+
+            filters = {'location': 'Nairobi', 'deadline_open': True, 'posted_after': base + timedelta(days=1)}
+            seen, cursor = [], None
+            while True:
+                jobs, cursor = JobService.get_jobs_page(2, cursor, filters=filters, sort='deadline')
+                seen.extend(jobs)
+                if cursor is None:
+                    break
+
+            # Nairobi 1-4: open deadline, posted after the cut; Nairobi 5 has no deadline
+            assert [job.title for job in seen] == ["Nairobi 4", "Nairobi 3", "Nairobi 2", "Nairobi 1"]
+
+            jobs, _ = JobService.get_jobs_page(10, filters={'location': 'Nairobi', 'deadline_open': True})
+            assert [job.title for job in jobs] == [f"Nairobi {i}" for i in range(5, -1, -1)]
+
+    def test_posted_at_is_required(self, init_database):
+        """Test that posted_at, the listing's keyset column, can't be NULL"""
+        from sqlalchemy.exc import IntegrityError
+        with self.app.app_context():
+            admin_id = User.query.filter_by(email="test1@example.com").first().id
+            with pytest.raises(IntegrityError):
+                db.session.execute(text(
+                    "INSERT INTO job_postings (title, description, posted_at, admin_id) VALUES ('Job', 'Desc', NULL, :admin)"
+                ), {'admin': admin_id})
+            db.session.rollback()
+
+            job = JobPosting(title="Defaulted", description="Desc", admin_id=admin_id)
+            db.session.add(job)
+            db.session.commit()
+            assert job.posted_at is not None
+
+    def test_get_jobs_page_cursor_is_bound_to_sort(self, init_database):
+        """Test that a cursor from one sort is rejected by another"""
+        from app.utils.pagination import InvalidCursor, encode_cursor
+        with self.app.app_context():
+            cursor = encode_cursor('posted_at', datetime(2025, 1, 1), 1)
+            with pytest.raises(InvalidCursor):
+                JobService.get_jobs_page(10, cursor, sort='deadline')
+            with pytest.raises(ValueError):
+                JobService.get_jobs_page(10, sort='title')
+
+    def test_job_listing_queries_use_indexes(self, init_database):
+        """Test that every filter/sort combination is planned on an index, not a sequential scan"""
+        with self.app.app_context():
+            admin_ids = [row[0] for row in db.session.execute(text("""
+                INSERT INTO users (email, password_hash, first_name, last_name, role)
+                SELECT 'plan' || g || '@test.com', 'x', 'Plan', 'Admin', 'admin' FROM generate_series(1, 20) AS g
+                RETURNING id
+            """))]
+            db.session.execute(text("""
+                INSERT INTO job_postings (title, description, location, deadline, posted_at, admin_id)
+                SELECT 'Job ' || g, 'Description', 'City ' || (g % 25),
+                       CASE WHEN g % 4 = 0 THEN NULL ELSE now() + (g % 90 - 30) * interval '1 day' END,
+                       now() - (g % 730) * interval '1 day' - g * interval '1 second',
+                       (CAST(:admin_ids AS int[]))[1 + g % 20]
+                FROM generate_series(1, 20000) AS g
+            """), {'admin_ids': admin_ids})
+            db.session.commit()
+            db.session.execute(text('ANALYZE job_postings'))
+            db.session.commit()
+
+            now = datetime.utcnow()
+            filter_sets = [
+                {},
+                {'location': 'City 7'},
+                {'admin_id': admin_ids[3]},
+                {'posted_after': now - timedelta(days=7)},
+                {'posted_after': now - timedelta(days=60), 'posted_before': now - timedelta(days=30)},
+                {'deadline_open': True},
+                {'location': 'City 7', 'deadline_open': True},
+                {'admin_id': admin_ids[3], 'posted_after': now - timedelta(days=30)},
+            ]
+
+            def plan_nodes(node):
+                yield node
+                for child in node.get('Plans', []):
+                    yield from plan_nodes(child)
+
+            connection = db.session.connection().connection
+            for filters in filter_sets:
+                for sort in ('posted_at', 'deadline'):
+                    stmt = JobService.build_jobs_query(filters, sort).limit(21).statement
+                    compiled = stmt.compile(dialect=db.engine.dialect)
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+                        plan = cursor.fetchone()[0][0]['Plan']
+                    nodes = list(plan_nodes(plan))
+                    scans = [(n['Node Type'], n.get('Relation Name')) for n in nodes]
+                    assert ('Seq Scan', 'job_postings') not in scans, (filters, sort, scans)
+                    assert any(n['Node Type'] in ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+                               for n in nodes), (filters, sort, scans)
+
+    def test_get_jobs_page_summary_view_skips_text_columns(self, init_database):
+        """Test that the summary view leaves description and requirements unloaded"""
+        from sqlalchemy import inspect
+        with self.app.app_context():
+            jobs, _ = JobService.get_jobs_page(10, view='summary')
+            assert jobs
+            unloaded = inspect(jobs[0]).unloaded
+            assert {'description', 'requirements'} <= unloaded
+            assert 'title' not in unloaded
+
+            db.session.expunge_all()
+            jobs, _ = JobService.get_jobs_page(10, view='full')
+            assert 'description' not in inspect(jobs[0]).unloaded
+
+            with pytest.raises(ValueError):
+                JobService.get_jobs_page(10, view='compact')
+
+    def test_job_counters_follow_applications_and_views(self, init_database):
+        """Test that the triggers keep applications_count, last_applied_at and views_total current"""
+        from datetime import date
+        from app.models.application import Application
+        from app.models.job_view import JobView
+        from app.services.application_service import ApplicationService
+        from app.services.job_view_service import JobViewService
+        with self.app.app_context():
+            user1 = User.query.filter_by(email="test1@example.com").first()
+            user2 = User.query.filter_by(email="test2@example.com").first()
+            job1 = JobPosting.query.filter_by(title="Test Job 1").first()
+            job2 = JobPosting.query.filter_by(title="Test Job 2").first()
+            job1_id, job2_id = job1.id, job2.id
+
+            def counters(job_id):
+                return db.session.execute(text(
+                    "SELECT applications_count, last_applied_at, views_total FROM job_postings WHERE id = :id"
+                ), {'id': job_id}).one()
+
+            first = ApplicationService.create_application(user1.id, job1_id)
+            second = ApplicationService.create_application(user2.id, job1_id)
+            db.session.commit()
+            count, last_applied_at, _ = counters(job1_id)
+            assert count == 2
+            assert last_applied_at == second.applied_at
+
+            ApplicationService.bulk_update_status({first.id: 'under_review'})
+            assert counters(job1_id)[0] == 2
+
+            db.session.execute(text("UPDATE applications SET job_posting_id = :job WHERE id = :id"),
+                               {'job': job2_id, 'id': second.id})
+            db.session.commit()
+            assert counters(job1_id)[:2] == (1, first.applied_at)
+            assert counters(job2_id)[:2] == (1, second.applied_at)
+
+            db.session.execute(text("DELETE FROM applications WHERE id = :id"), {'id': first.id})
+            db.session.commit()
+            assert counters(job1_id)[:2] == (0, None)
+
+            JobViewService.record_views({(job1_id, date(2026, 1, 1)): 3, (job1_id, date(2026, 1, 2)): 2,
+                                         (job2_id, date(2026, 1, 1)): 1})
+            JobViewService.record_views({(job1_id, date(2026, 1, 1)): 4})
+            assert counters(job1_id)[2] == 9
+            assert counters(job2_id)[2] == 1
+
+            JobView.query.filter_by(job_id=job1_id, view_date=date(2026, 1, 2)).delete()
+            db.session.commit()
+            assert counters(job1_id)[2] == 7
+            assert Application.query.count() == 1
+
+    def test_reconcile_job_counters_repairs_drift(self, init_database):
+        """Test that reconciliation rewrites drifted counters batch by batch and leaves correct ones alone"""
+        from datetime import date
+        from app.models.job_view import JobViewMonthly
+        from app.services.application_service import ApplicationService
+        from app.services.job_view_service import JobViewService
+        with self.app.app_context():
+            user1 = User.query.filter_by(email="test1@example.com").first()
+            job1 = JobPosting.query.filter_by(title="Test Job 1").first()
+            job2 = JobPosting.query.filter_by(title="Test Job 2").first()
+            job1_id, job2_id = job1.id, job2.id
+            application = ApplicationService.create_application(user1.id, job1_id)
+            db.session.commit()
+            JobViewService.record_views({(job1_id, date(2026, 3, 1)): 5})
+            # A month whose partition is gone only survives in the rollup
+            db.session.add(JobViewMonthly(job_id=job1_id, month=date(2025, 1, 1), view_count=10))
+            # A rolled-up month that is still raw must not be counted twice
+            db.session.add(JobViewMonthly(job_id=job1_id, month=date(2026, 3, 1), view_count=5))
+            db.session.commit()
+            assert JobService.reconcile_job_counters() == 1
+
+            db.session.execute(text("UPDATE job_postings SET applications_count = 42, last_applied_at = NULL"))
+            db.session.execute(text("UPDATE job_postings SET views_total = -3 WHERE id = :id"), {'id': job2_id})
+            db.session.commit()
+
+            assert JobService.reconcile_job_counters(batch_size=1) == 2
+            rows = db.session.execute(text(
+                "SELECT id, applications_count, last_applied_at, views_total FROM job_postings ORDER BY id"
+            )).all()
+            assert rows == [(job1_id, 1, application.applied_at, 15), (job2_id, 0, None, 0)]
+            assert JobService.reconcile_job_counters(batch_size=1) == 0
+
+    def test_job_listing_serializes_counters_without_extra_queries(self, init_database):
+        """Test that both listing views carry the counters from the one page query"""
+        from sqlalchemy import event
+        from app.schemas.job import JobSchema, JobSummarySchema
+        from app.services.application_service import ApplicationService
+        with self.app.app_context():
+            user1 = User.query.filter_by(email="test1@example.com").first()
+            job1 = JobPosting.query.filter_by(title="Test Job 1").first()
+            ApplicationService.create_application(user1.id, job1.id)
+            db.session.commit()
+            db.session.expunge_all()
+
+            for view, schema in (('summary', JobSummarySchema(many=True)), ('full', JobSchema(many=True))):
+                statements = []
+                listener = lambda conn, cursor, statement, *args: statements.append(statement)
+                event.listen(db.engine, 'before_cursor_execute', listener)
+                try:
+                    jobs, _ = JobService.get_jobs_page(10, view=view)
+                    dumped = {job['title']: job for job in schema.dump(jobs)}
+                finally:
+                    event.remove(db.engine, 'before_cursor_execute', listener)
+                assert len(statements) == 1
+                assert dumped["Test Job 1"]['applications_count'] == 1
+                assert dumped["Test Job 1"]['last_applied_at'] is not None
+                assert dumped["Test Job 2"]['applications_count'] == 0
+                assert dumped["Test Job 2"]['views_total'] == 0
+                db.session.expunge_all()
@@ -0,0 +1,74 @@
+from datetime import date
+import pytest
+from sqlalchemy import text
+from app.services.job_view_partition_service import JobViewPartitionService
+from app.services.job_view_service import JobViewService
+from app.models.job_view import JobView
+from app.extensions import db
+from tests.factories import create_user, create_job_posting
+
+def _partition_rows(name):
+    return db.session.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+
+def test_ensure_partitions_moves_rows_out_of_default(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        # Lands in the default partition: no monthly partitions exist yet
+        JobViewService.record_views({(job_id, date(2025, 2, 14)): 3})
+        assert _partition_rows('job_views_default') == 1
+
+        created = JobViewPartitionService.ensure_partitions(2, today=date(2025, 1, 20))
+
+        assert created == ['job_views_p2025_01', 'job_views_p2025_02', 'job_views_p2025_03']
+        assert JobViewPartitionService.ensure_partitions(2, today=date(2025, 1, 20)) == []
+        assert [(p[1], p[2]) for p in JobViewPartitionService.list_partitions()] == [
+            (date(2025, 1, 1), date(2025, 2, 1)), (date(2025, 2, 1), date(2025, 3, 1)), (date(2025, 3, 1), date(2025, 4, 1)),
+        ]
+        assert _partition_rows('job_views_default') == 0
+        assert _partition_rows('job_views_p2025_02') == 1
+
+        # Upserts still resolve conflicts on _job_view_uc inside a partition
+        assert JobViewService.record_view(job_id, date(2025, 2, 14)) == 4
+        assert JobViewService.record_views({(job_id, date(2025, 2, 14)): 2}) == {(job_id, date(2025, 2, 14)): 6}
+        assert JobView.query.count() == 1
+
+def test_drop_expired_partitions(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        JobViewPartitionService.ensure_partitions(4, today=date(2024, 11, 1))
+        JobViewService.record_views({
+            (job_id, date(2024, 11, 5)): 1,
+            (job_id, date(2024, 12, 5)): 2,
+            (job_id, date(2025, 1, 5)): 4,
+            (job_id, date(2020, 6, 1)): 8,  # default partition
+        })
+        JobViewService.rollup_month(2024, 11)
+
+        dropped = JobViewPartitionService.drop_expired_partitions(2, today=date(2025, 2, 10))
+
+        assert dropped == ['job_views_p2024_11']
+        assert {row.view_date for row in JobView.query.all()} == {date(2024, 12, 5), date(2025, 1, 5)}
+        assert [p[0] for p in JobViewPartitionService.list_partitions()][0] == 'job_views_p2024_12'
+        assert db.session.execute(text("SELECT to_regclass('job_views_p2024_11')")).scalar() is None
+        # Rolled-up totals outlive the raw rows
+        assert dict(JobViewService.get_monthly_views(2024, 11)) == {job_id: 1}
+
+        with pytest.raises(ValueError):
+            JobViewPartitionService.drop_expired_partitions(1)
+
+def test_monthly_query_prunes_partitions(app, init_database):
+    with app.app_context():
+        JobViewPartitionService.ensure_partitions(3, today=date(2025, 1, 1))
+        query = db.session.query(JobView.job_id).filter(
+            JobView.view_date >= date(2025, 2, 1), JobView.view_date < date(2025, 3, 1)
+        ).statement
+        compiled = query.compile(dialect=db.engine.dialect)
+        with db.session.connection().connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            plan = str(cursor.fetchone()[0])
+
+        assert 'job_views_p2025_02' in plan
+        for other in ('job_views_p2025_01', 'job_views_p2025_03', 'job_views_p2025_04', 'job_views_default'):
+            assert other not in plan
@@ -1,9 +1,18 @@
-from datetime import date, timedelta
+import pytest
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+from sqlalchemy import event
+from app.services.job_service import JobService
 from app.services.job_view_service import JobViewService
-from app.models.job_view import JobView
+from app.models.job_view import JobView, JobViewMonthly, JobViewFlush
 from app.models.job import JobPosting
 from app.models.user import User
+from app.models.application import Application
 from app.extensions import db
+from app.utils.cache import get_generation, get_object
+from app.utils.pagination import InvalidCursor
 from tests.factories import create_user, create_job_posting
 
 def test_record_view_new_entry(app, init_database):
@@ -17,8 +26,8 @@ def test_record_view_new_entry(app, init_database):
         admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
         job = create_job_posting("Test Job", "Desc", "Loc", "Req", admin_user.id)
 
-        job_view = JobViewService.record_view(job.id)
-        assert job_view.job_id == job.id
+        assert JobViewService.record_view(job.id) == 1
+        job_view = JobView.query.filter_by(job_id=job.id).one()
         assert job_view.view_date == date.today()
         assert job_view.view_count == 1
 
@@ -38,8 +47,9 @@ def test_record_view_existing_entry(app, init_database):
         db.session.add(initial_view)
         db.session.commit()
 
-        job_view = JobViewService.record_view(job.id)
-        assert job_view.job_id == job.id
+        assert JobViewService.record_view(job.id) == 6
+        db.session.expire_all()
+        job_view = JobView.query.filter_by(job_id=job.id).one()
         assert job_view.view_date == date.today()
         assert job_view.view_count == 6
 
@@ -90,4 +100,402 @@ def test_job_view_repr(app, init_database):
         db.session.add(job_view)
         db.session.commit()
 
-        assert repr(job_view) == f"<JobView {job.id} on 2023-01-15: 100 views>"
\ No newline at end of file
+        assert repr(job_view) == f"<JobView {job.id} on 2023-01-15: 100 views>"
+
+def test_buffer_view_is_flushed_in_one_upsert(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job1 = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id)
+        job2 = create_job_posting("Job 2", "Desc", "Loc", "Req", admin_user.id)
+        job1_id, job2_id = job1.id, job2.id
+        today = date.today()
+        db.session.add(JobView(job_id=job1_id, view_date=today, view_count=5))
+        db.session.commit()
+
+        for _ in range(3):
+            JobViewService.buffer_view(job1_id)
+        JobViewService.buffer_view(job2_id)
+        JobViewService.buffer_view(job2_id, today - timedelta(days=1))
+        # Views of a job deleted before the flush are dropped
+        JobViewService.buffer_view(999999)
+        assert JobView.query.filter_by(job_id=job2_id).count() == 0
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            assert JobViewService.flush_buffered_views() == 5
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert len([s for s in statements if s.startswith('INSERT INTO job_views')]) == 1
+        db.session.expire_all()
+        counts = {(v.job_id, v.view_date): v.view_count for v in JobView.query.all()}
+        assert counts == {
+            (job1_id, today): 8,
+            (job2_id, today): 1,
+            (job2_id, today - timedelta(days=1)): 1,
+        }
+        assert JobViewService.flush_buffered_views() == 0
+
+def test_flush_retries_a_failed_batch(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+
+        JobViewService.buffer_view(job_id)
+        with patch.object(JobViewService, 'record_views', side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                JobViewService.flush_buffered_views()
+        # Counted while the failed batch was parked
+        JobViewService.buffer_view(job_id)
+
+        assert JobViewService.flush_buffered_views() == 1
+        assert JobViewService.flush_buffered_views() == 1
+        assert JobView.query.filter_by(job_id=job_id).one().view_count == 2
+
+def test_flush_does_not_count_a_batch_twice(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+
+        for _ in range(3):
+            JobViewService.buffer_view(job_id)
+        # The lease runs out during the upsert, so the parked batch is left behind
+        with patch('app.services.job_view_service.extend_lock', return_value=False):
+            assert JobViewService.flush_buffered_views() == 3
+        JobViewService.buffer_view(job_id)
+
+        # The next run finds the batch already written and only drops it
+        assert JobViewService.flush_buffered_views() == 0
+        assert JobViewService.flush_buffered_views() == 1
+        assert JobView.query.filter_by(job_id=job_id).one().view_count == 4
+        assert JobViewFlush.query.count() == 2
+
+def test_flush_invalidates_only_the_viewed_jobs(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        generation = get_generation('jobs')
+        version = JobService.get_job_version(job_id)
+        assert get_object('jobs', job_id, lambda: 'cached') == 'cached'
+
+        JobViewService.buffer_view(job_id)
+        assert JobViewService.flush_buffered_views() == 1
+        # Cached listings stay; the job's detail entry is dropped
+        assert get_generation('jobs') == generation
+        assert get_object('jobs', job_id, lambda: None) is None
+        assert JobService.get_job_version(job_id) != version
+
+def test_buffer_view_without_redis_records_directly(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+
+        with patch('app.services.job_view_service.redis_client', return_value=None):
+            JobViewService.buffer_view(job_id)
+            assert JobViewService.flush_buffered_views() == 0
+
+        assert JobView.query.filter_by(job_id=job_id).one().view_count == 1
+
+def test_record_view_concurrent_first_views(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+
+    # All threads race on the first view of a day that has no row yet
+    threads, errors, counts = 50, [], []
+    barrier = threading.Barrier(threads)
+
+    def view():
+        with app.app_context():
+            try:
+                barrier.wait()
+                counts.append(JobViewService.record_view(job_id))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    workers = [threading.Thread(target=view) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    assert sorted(counts) == list(range(1, threads + 1))
+    with app.app_context():
+        assert JobView.query.filter_by(job_id=job_id).one().view_count == threads
+
+def test_record_views_batch(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        today = date.today()
+        JobViewService.record_view(job_id)
+
+        totals = JobViewService.record_views({
+            (job_id, today): 4,
+            (job_id, today - timedelta(days=1)): 2,
+            (999999, today): 1,
+        })
+
+        assert totals == {(job_id, today): 5, (job_id, today - timedelta(days=1)): 2}
+        assert JobViewService.record_views({}) == {}
+
+def test_unique_viewers_merge_across_days(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        first = date(2025, 3, 1)
+
+        for visitor in ("user:1", "user:1", "user:2", "ip:10.0.0.1"):
+            JobViewService.buffer_view(job_id, first, visitor=visitor)
+        for visitor in ("user:1", "user:3"):
+            JobViewService.buffer_view(job_id, first + timedelta(days=30), visitor=visitor)
+        JobViewService.buffer_view(job_id, date(2025, 4, 1), visitor="user:4")
+
+        assert JobViewService.get_unique_viewers([job_id], first, first) == {job_id: 3}
+        assert JobViewService.get_monthly_unique_viewers(2025, 3, [job_id]) == {job_id: 4}
+        assert JobViewService.get_monthly_unique_viewers(2025, 4, [job_id]) == {job_id: 1}
+        assert JobViewService.get_monthly_unique_viewers(2025, 5, [job_id]) == {job_id: 0}
+        # user:1's second view on the first day is dropped as a repeat
+        assert JobViewService.flush_buffered_views() == 6
+
+def test_unique_viewers_without_redis(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        first = date(2025, 3, 1)
+
+        with patch('app.services.job_view_service.redis_client', return_value=None):
+            for visitor in ("user:1", "user:1", "user:2"):
+                JobViewService.buffer_view(job_id, first, visitor=visitor)
+            JobViewService.buffer_view(job_id, first + timedelta(days=1), visitor="user:3")
+
+            assert JobViewService.get_monthly_unique_viewers(2025, 3, [job_id]) == {job_id: 3}
+
+        assert JobView.query.filter_by(job_id=job_id, view_date=first).one().view_count == 2
+
+def test_get_monthly_views_uses_a_date_range(app, init_database):
+    with app.app_context():
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            JobViewService.get_monthly_views(date.today().year, date.today().month)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert len(statements) == 1
+        assert 'EXTRACT' not in statements[0].upper()
+        assert 'job_views.view_date >= ' in statements[0] and 'job_views.view_date < ' in statements[0]
+
+def test_closed_months_are_read_from_the_rollup(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job1_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        job2_id = create_job_posting("Job 2", "Desc", "Loc", "Req", admin_user.id).id
+        JobViewService.record_views({
+            (job1_id, date(2025, 1, 1)): 3,
+            (job1_id, date(2025, 1, 31)): 4,
+            (job2_id, date(2025, 1, 15)): 1,
+            (job1_id, date(2025, 2, 1)): 9,
+            (job1_id, date(2024, 12, 31)): 9,
+        })
+
+        # Not rolled up yet: aggregated from job_views
+        assert dict(JobViewService.get_monthly_views(2025, 1)) == {job1_id: 7, job2_id: 1}
+
+        assert JobViewService.rollup_month(2025, 1) == 2
+        assert JobViewService.rollup_month(2025, 1) == 2
+        assert {(r.job_id, r.month, r.view_count) for r in JobViewMonthly.query.all()} == {
+            (job1_id, date(2025, 1, 1), 7), (job2_id, date(2025, 1, 1), 1)
+        }
+
+        # Rolled up months are served from job_views_monthly
+        db.session.query(JobView).delete()
+        db.session.commit()
+        assert dict(JobViewService.get_monthly_views(2025, 1)) == {job1_id: 7, job2_id: 1}
+        assert JobViewService.get_monthly_views(2025, 2) == []
+
+def test_rollup_month_december(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        JobViewService.record_views({(job_id, date(2024, 12, 31)): 2, (job_id, date(2025, 1, 1)): 5})
+
+        assert JobViewService.rollup_month(2024, 12) == 1
+        assert dict(JobViewService.get_monthly_views(2024, 12)) == {job_id: 2}
+
+def _seed_series(admin_email="admin@example.com"):
+    admin_user = create_user(admin_email, "password123", "Admin", "User", "admin")
+    job1_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+    job2_id = create_job_posting("Job 2", "Desc", "Loc", "Req", admin_user.id).id
+    JobViewService.record_views({
+        (job1_id, date(2025, 1, 6)): 1,   # Monday
+        (job1_id, date(2025, 1, 8)): 2,
+        (job1_id, date(2025, 1, 13)): 4,  # next week
+        (job2_id, date(2025, 1, 8)): 10,
+        (job1_id, date(2025, 2, 3)): 8,
+        (job2_id, date(2025, 3, 1)): 1,
+    })
+    return job1_id, job2_id
+
+def test_get_view_series_buckets(app, init_database):
+    with app.app_context():
+        job1_id, job2_id = _seed_series()
+
+        assert JobViewService.get_view_series(date(2025, 1, 5), date(2025, 1, 9), 'day', job1_id) == [
+            (date(2025, 1, 5), 0), (date(2025, 1, 6), 1), (date(2025, 1, 7), 0),
+            (date(2025, 1, 8), 2), (date(2025, 1, 9), 0),
+        ]
+        assert JobViewService.get_view_series(date(2025, 1, 6), date(2025, 1, 19), 'week') == [
+            (date(2025, 1, 6), 13), (date(2025, 1, 13), 4),
+        ]
+        JobViewService.rollup_month(2025, 1)
+        assert JobViewService.get_view_series(date(2025, 1, 1), date(2025, 3, 31), 'month') == [
+            (date(2025, 1, 1), 17), (date(2025, 2, 1), 8), (date(2025, 3, 1), 1),
+        ]
+        # Ranges cut through a month only count the days inside them
+        assert JobViewService.get_view_series(date(2025, 1, 7), date(2025, 2, 2), 'month', job1_id) == [
+            (date(2025, 1, 1), 6), (date(2025, 2, 1), 0),
+        ]
+
+def test_get_view_series_caches_closed_buckets(app, init_database):
+    with app.app_context():
+        job1_id, _ = _seed_series()
+        today = date.today()
+        JobViewService.record_view(job1_id, today)
+
+        first = JobViewService.get_view_series(date(2025, 1, 6), today, 'week', job1_id)
+        assert first[0] == (date(2025, 1, 6), 3)
+        assert first[-1][1] == 1
+
+        db.session.query(JobView).delete()
+        db.session.commit()
+        JobViewService.record_view(job1_id, today)
+        JobViewService.record_view(job1_id, today)
+
+        second = JobViewService.get_view_series(date(2025, 1, 6), today, 'week', job1_id)
+        # Closed weeks come from the cache, the current week is recomputed
+        assert second[:-1] == first[:-1]
+        assert second[-1][1] == 2
+        # A range starting mid-week doesn't reuse the whole-week total
+        assert JobViewService.get_view_series(date(2025, 1, 7), date(2025, 1, 12), 'week', job1_id) == [
+            (date(2025, 1, 6), 0)
+        ]
+
+def test_get_view_series_validation(app, init_database):
+    with app.app_context():
+        with pytest.raises(ValueError):
+            JobViewService.get_view_series(date(2025, 1, 1), date(2025, 1, 2), 'hour')
+        with pytest.raises(ValueError):
+            JobViewService.get_view_series(date(2025, 1, 2), date(2025, 1, 1))
+        with pytest.raises(ValueError):
+            JobViewService.get_view_series(date(2000, 1, 1), date(2025, 1, 1), 'day')
+
+def test_get_top_jobs(app, init_database):
+    with app.app_context():
+        job1_id, job2_id = _seed_series()
+        JobViewService.rollup_month(2025, 1)
+
+        assert JobViewService.get_top_jobs(date(2025, 1, 1), date(2025, 3, 31), 10) == [(job1_id, 15), (job2_id, 11)]
+        assert JobViewService.get_top_jobs(date(2025, 1, 1), date(2025, 1, 31), 1) == [(job2_id, 10)]
+        assert JobViewService.get_top_jobs(date(2025, 1, 7), date(2025, 2, 28), 10) == [(job1_id, 14), (job2_id, 10)]
+
+        # Closed ranges are cached
+        db.session.query(JobViewMonthly).delete()
+        db.session.query(JobView).delete()
+        db.session.commit()
+        assert JobViewService.get_top_jobs(date(2025, 1, 1), date(2025, 1, 31), 1) == [(job2_id, 10)]
+        assert JobViewService.get_top_jobs(date(2025, 1, 1), date(2025, 1, 31), 2) == []
+
+def _seed_conversion():
+    admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+    seeker = create_user("seeker@example.com", "password123", "Job", "Seeker", "job_seeker")
+    job1 = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id)
+    job2 = create_job_posting("Job 2", "Desc", "Loc", "Req", admin_user.id)
+    db.session.add_all([
+        JobView(job_id=job1.id, view_date=date(2025, 1, 1), view_count=8),
+        JobView(job_id=job1.id, view_date=date(2025, 1, 2), view_count=4),
+        JobView(job_id=job2.id, view_date=date(2025, 1, 2), view_count=3),
+        Application(user_id=seeker.id, job_posting_id=job1.id, status='submitted', applied_at=datetime(2025, 1, 1, 9)),
+        Application(user_id=admin_user.id, job_posting_id=job1.id, status='submitted', applied_at=datetime(2025, 1, 1, 17)),
+        Application(user_id=seeker.id, job_posting_id=job2.id, status='submitted', applied_at=datetime(2025, 1, 3, 12)),
+    ])
+    db.session.commit()
+    return job1.id, job2.id
+
+def test_conversion_funnel_is_refreshed(app, init_database):
+    with app.app_context():
+        job1_id, job2_id = _seed_conversion()
+        assert JobViewService.get_conversion_funnel(date(2025, 1, 1), date(2025, 1, 31), 10) == ([], None)
+
+        JobViewService.refresh_conversion_funnel()
+        rows, next_cursor = JobViewService.get_conversion_funnel(date(2025, 1, 1), date(2025, 1, 31), 10)
+
+        assert next_cursor is None
+        assert [(r.job_id, r.day, r.views, r.applications, r.conversion_rate) for r in rows] == [
+            (job2_id, date(2025, 1, 3), 0, 1, None),
+            (job2_id, date(2025, 1, 2), 3, 0, Decimal('0')),
+            (job1_id, date(2025, 1, 2), 4, 0, Decimal('0')),
+            (job1_id, date(2025, 1, 1), 8, 2, Decimal('0.25')),
+        ]
+
+def test_conversion_funnel_pagination(app, init_database):
+    with app.app_context():
+        job1_id, job2_id = _seed_conversion()
+        JobViewService.refresh_conversion_funnel()
+
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = JobViewService.get_conversion_funnel(date(2025, 1, 1), date(2025, 1, 31), 3, cursor)
+            seen.extend((r.job_id, r.day) for r in rows)
+            if cursor is None:
+                break
+        assert len(seen) == 4 and len(set(seen)) == 4
+
+        rows, _ = JobViewService.get_conversion_funnel(date(2025, 1, 1), date(2025, 1, 31), 10, job_id=job1_id)
+        assert [r.day for r in rows] == [date(2025, 1, 2), date(2025, 1, 1)]
+        with pytest.raises(InvalidCursor):
+            JobViewService.get_conversion_funnel(date(2025, 1, 1), date(2025, 1, 31), 10, 'garbage')
+        with pytest.raises(ValueError):
+            JobViewService.get_conversion_funnel(date(2025, 2, 1), date(2025, 1, 31), 10)
+
+def test_repeat_views_are_dropped_per_day(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job1_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        job2_id = create_job_posting("Job 2", "Desc", "Loc", "Req", admin_user.id).id
+        first = date(2025, 3, 1)
+
+        assert JobViewService.buffer_view(job1_id, first, visitor="ip:10.0.0.1") is True
+        assert JobViewService.buffer_view(job1_id, first, visitor="ip:10.0.0.1") is False
+        assert JobViewService.buffer_view(job2_id, first, visitor="ip:10.0.0.1") is True
+        assert JobViewService.buffer_view(job1_id, first + timedelta(days=1), visitor="ip:10.0.0.1") is True
+        # Anonymous counting is unaffected
+        assert JobViewService.buffer_view(job1_id, first) is True
+        assert JobViewService.buffer_view(job1_id, first) is True
+
+        assert JobViewService.flush_buffered_views() == 5
+        assert JobView.query.filter_by(job_id=job1_id, view_date=first).one().view_count == 3
+
+def test_repeat_views_without_redis_never_reach_the_database(app, init_database):
+    with app.app_context():
+        admin_user = create_user("admin@example.com", "password123", "Admin", "User", "admin")
+        job_id = create_job_posting("Job 1", "Desc", "Loc", "Req", admin_user.id).id
+        today = date.today()
+
+        with patch('app.services.job_view_service.redis_client', return_value=None), \
+                patch.object(JobViewService, 'record_view', wraps=JobViewService.record_view) as mock_record:
+            for _ in range(3):
+                JobViewService.buffer_view(job_id, today, visitor="user:1")
+            JobViewService.buffer_view(job_id, today, visitor="user:2")
+            # Old days are rotated out of the in-process filters
+            JobViewService.is_first_view(job_id, today + timedelta(days=5), "user:1")
+
+        assert mock_record.call_count == 2
+        assert list(app.extensions['seen_job_views']) == [today + timedelta(days=5)]
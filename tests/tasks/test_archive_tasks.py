@@ -0,0 +1,12 @@
+from unittest.mock import patch
+from app.tasks.archive_tasks import archive_expired_jobs_task
+from app import create_app
+
+def test_archive_expired_jobs_task():
+    app = create_app('testing')
+    app.config['JOB_ARCHIVE_RETENTION_DAYS'] = 30
+    app.config['JOB_ARCHIVE_BATCH_SIZE'] = 10
+    with app.app_context():
+        with patch('app.tasks.archive_tasks.JobArchiveService.archive_expired_jobs', return_value=3) as mock_archive:
+            assert archive_expired_jobs_task() == 3
+            mock_archive.assert_called_once_with(30, 10)
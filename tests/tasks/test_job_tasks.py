@@ -0,0 +1,11 @@
+from unittest.mock import patch
+from app.tasks.job_tasks import reconcile_job_counters_task
+from app import create_app
+
+def test_reconcile_job_counters_task():
+    app = create_app('testing')
+    app.config['JOB_COUNTER_RECONCILE_BATCH_SIZE'] = 50
+    with app.app_context():
+        with patch('app.tasks.job_tasks.JobService.reconcile_job_counters', return_value=2) as mock_reconcile:
+            assert reconcile_job_counters_task() == 2
+            mock_reconcile.assert_called_once_with(50)
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+from datetime import date
+from app.tasks.job_view_tasks import (
+    flush_job_views_task, drain_job_views, rollup_job_views_task, maintain_job_view_partitions_task,
+    refresh_job_conversion_task
+)
+from app import create_app
+
+def test_flush_job_views_task():
+    app = create_app('testing')
+    with app.app_context():
+        with patch('app.tasks.job_view_tasks.JobViewService.flush_buffered_views', return_value=4) as mock_flush:
+            assert flush_job_views_task() == 4
+            mock_flush.assert_called_once_with()
+
+def test_worker_shutdown_drains_buffer():
+    app = create_app('testing')
+    with app.app_context():
+        with patch('app.tasks.job_view_tasks.JobViewService.flush_buffered_views', return_value=2) as mock_flush:
+            drain_job_views(sender=None)
+            mock_flush.assert_called_once_with()
+
+def test_rollup_job_views_task_rolls_up_last_month():
+    app = create_app('testing')
+    with app.app_context():
+        with patch('app.tasks.job_view_tasks.date') as mock_date, \
+                patch('app.tasks.job_view_tasks.JobViewService.rollup_month', return_value=7) as mock_rollup:
+            mock_date.today.return_value = date(2025, 1, 1)
+            assert rollup_job_views_task() == 7
+            mock_rollup.assert_called_once_with(2024, 12)
+
+def test_maintain_job_view_partitions_task():
+    app = create_app('testing')
+    app.config['JOB_VIEWS_PARTITIONS_AHEAD'] = 2
+    app.config['JOB_VIEWS_RETENTION_MONTHS'] = 12
+    with app.app_context():
+        with patch('app.tasks.job_view_tasks.JobViewPartitionService') as mock_service:
+            mock_service.ensure_partitions.return_value = ['job_views_p2025_03']
+            mock_service.drop_expired_partitions.return_value = ['job_views_p2024_01']
+            assert maintain_job_view_partitions_task() == {
+                'created': ['job_views_p2025_03'], 'dropped': ['job_views_p2024_01']
+            }
+            mock_service.ensure_partitions.assert_called_once_with(2)
+            mock_service.drop_expired_partitions.assert_called_once_with(12)
+
+            app.config['JOB_VIEWS_RETENTION_MONTHS'] = 0
+            assert maintain_job_view_partitions_task()['dropped'] == []
+            mock_service.drop_expired_partitions.assert_called_once()
+
+def test_refresh_job_conversion_task():
+    app = create_app('testing')
+    with app.app_context():
+        with patch('app.tasks.job_view_tasks.JobViewService.refresh_conversion_funnel') as mock_refresh:
+            refresh_job_conversion_task()
+            mock_refresh.assert_called_once_with()
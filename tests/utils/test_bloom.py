@@ -0,0 +1,29 @@
+import pytest
+from app.utils.bloom import BloomFilter, bloom_parameters
+
+
+def test_bloom_parameters():
+    size, hashes = bloom_parameters(1000000, 0.001)
+    # ~14.4 bits and 10 hash functions per value for a 0.1% false-positive rate
+    assert 14300000 < size < 14500000
+    assert hashes == 10
+    with pytest.raises(ValueError):
+        bloom_parameters(0, 0.01)
+    with pytest.raises(ValueError):
+        bloom_parameters(1000, 1.5)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    assert all(bloom.add(f"user:{i}") for i in range(200))
+    assert not any(bloom.add(f"user:{i}") for i in range(200))
+    assert "user:5" in bloom
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(5000, 0.01)
+    for i in range(5000):
+        bloom.add(f"seen:{i}")
+    false_positives = sum(f"unseen:{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert bloom.nbytes == (bloom.size + 7) // 8
@@ -0,0 +1,206 @@
+from flask import jsonify
+from prometheus_client import REGISTRY
+from app.extensions import cache
+from app.utils.cache import (cached_view, get_object, get_generation, invalidate, namespaced_key, object_key,
+                             acquire_lock, extend_lock, release_lock, redis_client, redis_key)
+
+
+def _sample(name, namespace):
+    return REGISTRY.get_sample_value(name, {'namespace': namespace}) or 0
+
+
+def test_invalidate_bumps_only_its_namespace(app):
+    with app.app_context():
+        jobs_key = namespaced_key('jobs', 'list')
+        faqs_key = namespaced_key('faqs', 'list')
+        cache.set(jobs_key, 'jobs-payload')
+        cache.set(faqs_key, 'faqs-payload')
+
+        generation = get_generation('jobs')
+        invalidate('jobs')
+
+        assert get_generation('jobs') == generation + 1
+        assert namespaced_key('jobs', 'list') != jobs_key
+        assert namespaced_key('faqs', 'list') == faqs_key
+        assert cache.get(faqs_key) == 'faqs-payload'
+
+
+def test_generation_survives_cache_flush(app):
+    with app.app_context():
+        invalidate('jobs')
+        before_flush = get_generation('jobs')
+        cache.clear()
+
+        assert get_generation('jobs') > before_flush
+
+
+def test_get_object_caches_loader_result_and_counts(app):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {'id': 7}
+
+    with app.app_context():
+        hits = _sample('app_cache_hits_total', 'widgets')
+        misses = _sample('app_cache_misses_total', 'widgets')
+
+        assert get_object('widgets', 7, loader) == {'id': 7}
+        assert get_object('widgets', 7, loader) == {'id': 7}
+
+        assert len(calls) == 1
+        assert _sample('app_cache_misses_total', 'widgets') == misses + 1
+        assert _sample('app_cache_hits_total', 'widgets') == hits + 1
+
+
+def test_get_object_does_not_cache_missing_objects(app):
+    with app.app_context():
+        assert get_object('widgets', 404, lambda: None) is None
+        assert cache.get(object_key('widgets', 404)) is None
+
+
+def test_invalidate_drops_object_keys(app):
+    with app.app_context():
+        invalidations = _sample('app_cache_invalidations_total', 'widgets')
+        get_object('widgets', 1, lambda: {'id': 1})
+        get_object('widgets', 2, lambda: {'id': 2})
+
+        invalidate('widgets', 1)
+
+        assert cache.get(object_key('widgets', 1)) is None
+        assert cache.get(object_key('widgets', 2)) == {'id': 2}
+        assert _sample('app_cache_invalidations_total', 'widgets') == invalidations + 1
+
+
+def test_cached_view_is_keyed_on_query_string_and_generation(app):
+    calls = []
+
+    @app.route('/test-cached-view')
+    @cached_view('widgets', timeout=60)
+    def widgets():
+        calls.append(1)
+        return jsonify(count=len(calls))
+
+    client = app.test_client()
+    assert client.get('/test-cached-view?page=1').json == {'count': 1}
+    assert client.get('/test-cached-view?page=1').json == {'count': 1}
+    assert client.get('/test-cached-view?page=2').json == {'count': 2}
+
+    with app.app_context():
+        invalidate('widgets')
+    assert client.get('/test-cached-view?page=1').json == {'count': 3}
+
+
+def test_concurrent_cold_misses_run_one_query(app):
+    import threading
+    from sqlalchemy import event
+    from app.extensions import db
+    from tests.factories import create_faq
+
+    with app.app_context():
+        create_faq("Question?", "Answer.")
+        engine = db.engine
+
+    statements = []
+
+    def count_faq_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM faqs' in statement:
+            statements.append(statement)
+            # Hold the leader inside the query so every other request arrives during the miss
+            import time
+            time.sleep(0.3)
+
+    event.listen(engine, 'before_cursor_execute', count_faq_selects)
+    try:
+        barrier = threading.Barrier(10)
+        responses = []
+
+        def fetch():
+            client = app.test_client()
+            barrier.wait()
+            responses.append(client.get('/api/v1/faqs/'))
+
+        threads = [threading.Thread(target=fetch) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_faq_selects)
+
+    assert len(statements) == 1
+    assert [r.status_code for r in responses] == [200] * 10
+    assert len({r.data for r in responses}) == 1
+
+
+def test_stale_entry_served_while_one_refresh_runs(app):
+    import threading
+    import time
+
+    calls = []
+    release = threading.Event()
+
+    @app.route('/test-stale-view')
+    @cached_view('stale-widgets', timeout=1, stale_ttl=30)
+    def stale_widgets():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return jsonify(count=len(calls))
+
+    client = app.test_client()
+    assert client.get('/test-stale-view').json == {'count': 1}
+    time.sleep(1.1)
+
+    # The entry is stale: every caller gets the old body, one refresh starts in the background
+    for _ in range(5):
+        assert client.get('/test-stale-view').json == {'count': 1}
+    release.set()
+
+    deadline = time.time() + 5
+    while time.time() < deadline and client.get('/test-stale-view').json != {'count': 2}:
+        time.sleep(0.05)
+    assert client.get('/test-stale-view').json == {'count': 2}
+    assert len(calls) == 2
+
+
+def test_cached_view_serves_prerendered_bytes(app):
+    import gzip
+
+    @app.route('/test-prerendered-view')
+    @cached_view('prerendered-widgets', timeout=60)
+    def prerendered_widgets():
+        return jsonify(items=list(range(100)))
+
+    client = app.test_client()
+    miss = client.get('/test-prerendered-view')
+    plain = client.get('/test-prerendered-view')
+    compressed = client.get('/test-prerendered-view', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert miss.json == plain.json == {'items': list(range(100))}
+    assert miss.headers['ETag'] == plain.headers['ETag'] == compressed.headers['ETag']
+    assert plain.headers['Content-Length'] == str(len(plain.data))
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['Content-Length'] == str(len(compressed.data))
+    assert gzip.decompress(compressed.data) == plain.data
+
+
+def test_lock_is_released_only_by_its_owner(app):
+    with app.app_context():
+        first = acquire_lock('owned', 5)
+        assert first and acquire_lock('owned', 5) is None
+
+        # The first holder's lease runs out and someone else takes the lock
+        redis_client().delete(redis_key('lock:owned'))
+        second = acquire_lock('owned', 5)
+        assert second and second != first
+
+        assert not release_lock('owned', first)
+        assert not extend_lock('owned', first, 60)
+        assert acquire_lock('owned', 5) is None
+
+        assert extend_lock('owned', second, 60)
+        assert redis_client().ttl(redis_key('lock:owned')) > 5
+        assert release_lock('owned', second)
+        assert acquire_lock('owned', 5)
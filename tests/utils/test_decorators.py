@@ -0,0 +1,76 @@
+from datetime import datetime
+from flask import Flask, jsonify
+import pytest
+from app.utils.decorators import conditional_get
+
+
+@pytest.fixture
+def conditional_app():
+    app = Flask(__name__)
+    state = {'version': 1, 'calls': 0, 'updated_at': datetime(2025, 1, 1, 12, 0, 0)}
+
+    @app.route('/items')
+    @conditional_get(lambda: state['version'])
+    def items():
+        state['calls'] += 1
+        return jsonify(version=state['version'])
+
+    @app.route('/items/<int:item_id>')
+    @conditional_get(lambda item_id: state['updated_at'] if item_id == 1 else None)
+    def item(item_id):
+        state['calls'] += 1
+        if item_id != 1:
+            return jsonify(message="Not found"), 404
+        return jsonify(id=item_id)
+
+    app.state = state
+    return app
+
+
+def test_if_none_match_returns_304_without_running_view(conditional_app):
+    client = conditional_app.test_client()
+    first = client.get('/items')
+    etag = first.headers['ETag']
+
+    second = client.get('/items', headers={'If-None-Match': etag})
+
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert conditional_app.state['calls'] == 1
+
+
+def test_etag_changes_with_version_and_query_string(conditional_app):
+    client = conditional_app.test_client()
+    etag = client.get('/items').headers['ETag']
+
+    assert client.get('/items?page=2').headers['ETag'] != etag
+    conditional_app.state['version'] = 2
+    response = client.get('/items', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json == {'version': 2}
+
+
+def test_etag_differs_for_gzip_representation(conditional_app):
+    client = conditional_app.test_client()
+    plain = client.get('/items').headers['ETag']
+    gzipped = client.get('/items', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    assert plain != gzipped
+
+
+def test_if_modified_since_uses_datetime_versions(conditional_app):
+    client = conditional_app.test_client()
+    first = client.get('/items/1')
+    assert first.headers['Last-Modified'] == 'Wed, 01 Jan 2025 12:00:00 GMT'
+
+    response = client.get('/items/1', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 304
+
+    conditional_app.state['updated_at'] = datetime(2025, 1, 2)
+    response = client.get('/items/1', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 200
+
+
+def test_missing_version_falls_through_to_view(conditional_app):
+    response = conditional_app.test_client().get('/items/2', headers={'If-None-Match': '*'})
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
@@ -0,0 +1,40 @@
+import pytest
+from app.utils.hyperloglog import HyperLogLog
+
+
+def test_count_is_within_error_bound():
+    sketch = HyperLogLog()
+    for i in range(20000):
+        sketch.add(f"user:{i}")
+        sketch.add(f"user:{i}")  # repeats don't change the estimate
+
+    assert abs(sketch.count() - 20000) / 20000 < 0.03
+
+
+def test_small_counts_are_exact_enough():
+    sketch = HyperLogLog()
+    assert sketch.count() == 0
+    assert sketch.add("ip:10.0.0.1") is True
+    assert sketch.add("ip:10.0.0.1") is False
+    sketch.add("ip:10.0.0.2")
+    assert sketch.count() == 2
+
+
+def test_merge_counts_the_union():
+    monday, tuesday = HyperLogLog(), HyperLogLog()
+    for i in range(3000):
+        monday.add(i)
+    for i in range(2000, 5000):
+        tuesday.add(i)
+
+    merged = HyperLogLog.from_bytes(monday.to_bytes()).merge(tuesday)
+
+    assert abs(merged.count() - 5000) / 5000 < 0.03
+    assert abs(monday.count() - 3000) / 3000 < 0.03
+
+
+def test_rejects_mismatched_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(14))
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(b'\x00' * 10)